@@ -1,9 +1,15 @@
+import argparse
 import json
-from transformers import AutoTokenizer, AutoModelForSequenceClassification
-import torch
-from tqdm import tqdm
+import multiprocessing
+import os
+
+from sentiment_backends import BACKENDS, load_backend
+from sentiment_cache import SentimentCache, text_key
 
 MODEL_NAME = "distilbert-base-uncased-finetuned-sst-2-english"
+BATCH_SIZE = 32
+MAX_LENGTH = 512
+PARALLEL_MODES = ("threads", "processes")
 
 def load_reviews(path="clean_reviews.json"):
     with open(path, "r") as f:
@@ -13,36 +19,129 @@ def save_reviews(data, path="reviews_with_sentiment.json"):
     with open(path, "w") as f:
         json.dump(data, f, indent=2)
 
-def analyze_sentiment(reviews):
-    tokenizer = AutoTokenizer.from_pretrained(MODEL_NAME)
-    model = AutoModelForSequenceClassification.from_pretrained(MODEL_NAME)
+def load_model(model_name=MODEL_NAME, backend="pytorch"):
+    """The model wrapped in one of sentiment_backends.BACKENDS"""
+    return load_backend(backend, model_name)
+
+def sentiment_label(positive_score, negative_score):
+    return "positive" if positive_score >= 0.6 else \
+           "negative" if negative_score >= 0.6 else "neutral"
+
+def score_texts(texts, backend, batch_size=BATCH_SIZE, progress=True):
+    """
+    (positive_score, negative_score) for every text, in input order.
+
+    Everything is tokenized once up front, then sorted by token length and
+    run in batches, so each batch only pads up to its own longest review
+    instead of every review going through the model on its own.
+    """
+    from tqdm import tqdm
+
+    encoded = backend.tokenizer(texts, truncation=True, max_length=MAX_LENGTH)["input_ids"]
+    order = sorted(range(len(texts)), key=lambda i: len(encoded[i]))
+    scores = [None] * len(texts)
+
+    batches = range(0, len(order), batch_size)
+    for start in tqdm(batches, desc="Analyzing reviews", disable=not progress):
+        batch = order[start:start + batch_size]
+        probs = backend.probabilities([encoded[i] for i in batch])
+        for i, (negative_score, positive_score) in zip(batch, probs):
+            scores[i] = (positive_score, negative_score)
+
+    return scores
+
+# Set in the parent right before forking the pool, so workers inherit the
+# already-loaded model instead of each loading (and copying) their own
+_worker_backend = None
+
+def _init_worker():
+    _worker_backend.set_threads(1)  # one process per core, not cores x threads
+
+def _score_shard(shard):
+    texts, batch_size = shard
+    return score_texts(texts, _worker_backend, batch_size, progress=False)
+
+def score_texts_parallel(texts, backend, batch_size=BATCH_SIZE, workers=None):
+    """
+    Same as score_texts, but shards the texts across a pool of processes.
+
+    The pool is forked after the model is loaded, so the weights are shared
+    copy-on-write with the parent rather than loaded once per worker (the
+    model is read-only during inference, so the pages never get copied).
+    Shards come back through imap, i.e. streamed in input order.
+    """
+    from tqdm import tqdm
+
+    global _worker_backend
+    _worker_backend = backend
+    os.environ["TOKENIZERS_PARALLELISM"] = "false"  # tokenizer threads don't survive fork
+
+    shard_size = batch_size * 4
+    shards = [(texts[i:i + shard_size], batch_size) for i in range(0, len(texts), shard_size)]
+
+    scores = []
+    with multiprocessing.get_context("fork").Pool(workers, initializer=_init_worker) as pool:
+        for shard_scores in tqdm(pool.imap(_score_shard, shards), total=len(shards),
+                                 desc="Analyzing reviews"):
+            scores.extend(shard_scores)
+    return scores
+
+def cached_scores(texts, model_name, cache, batch_size, parallel="threads", workers=None,
+                  backend="pytorch"):
+    """
+    Scores for every text, running the model only on texts the cache hasn't
+    seen (each distinct text once). New scores are written back to the cache.
+    """
+    # quantized/ONNX scores drift a bit from fp32, so they're cached separately
+    cache_model = model_name if backend == "pytorch" else f"{model_name}@{backend}"
+    keys = [text_key(t) for t in texts]
+    known = cache.get_many(cache_model, keys) if cache else {}
+
+    missing = {}
+    for key, text in zip(keys, texts):
+        if key not in known and key not in missing:
+            missing[key] = text
+    print(f"Sentiment cache: {len(texts) - sum(k in missing for k in keys)} hits, "
+          f"{len(missing)} texts to score")
+
+    if missing:
+        scorer = load_model(model_name, backend)
+        if parallel == "processes":
+            scored = score_texts_parallel(list(missing.values()), scorer, batch_size, workers)
+        else:
+            if workers:
+                scorer.set_threads(workers)
+            scored = score_texts(list(missing.values()), scorer, batch_size)
+        new_scores = dict(zip(missing, scored))
+        if cache:
+            cache.put_many(cache_model, new_scores)
+        known.update(new_scores)
+
+    return [known[key] for key in keys]
+
+def analyze_sentiment(reviews, batch_size=BATCH_SIZE, parallel="threads", workers=None,
+                      model_name=MODEL_NAME, cache=None, backend="pytorch"):
+    """
+    Add a sentiment dict to every review. `cache` is an optional SentimentCache.
+
+    parallel="threads" runs one model using `workers` intra-op threads,
+    parallel="processes" shards the reviews across `workers` forked processes
+    (default: one per core) with one thread each. `backend` is one of
+    sentiment_backends.BACKENDS (pytorch, pytorch-int8, onnx).
+    """
+    texts = [r["text"] for r in reviews if r["text"]]
+    scores = iter(cached_scores(texts, model_name, cache, batch_size, parallel, workers, backend))
 
     results = []
-    for r in tqdm(reviews, desc="Analyzing reviews"):
-        text = r["text"]
-        if not text:
+    for r in reviews:
+        if not r["text"]:
             r["sentiment"] = {"label": "neutral", "score": 0.0}
             results.append(r)
             continue
 
-        inputs = tokenizer(
-            text,
-            truncation=True,
-            max_length=512,
-            return_tensors="pt"
-        )
-
-        with torch.no_grad():
-            logits = model(**inputs).logits
-            probs = torch.softmax(logits, dim=1)[0]
-
-        positive_score = float(probs[1])
-        negative_score = float(probs[0])
-        label = "positive" if positive_score >= 0.6 else \
-                "negative" if negative_score >= 0.6 else "neutral"
-
+        positive_score, negative_score = next(scores)
         r["sentiment"] = {
-            "label": label,
+            "label": sentiment_label(positive_score, negative_score),
             "positive_score": positive_score,
             "negative_score": negative_score,
         }
@@ -57,10 +156,26 @@ def summarize(reviews):
     return summary
 
 def main():
+    parser = argparse.ArgumentParser(description="Score review sentiment with DistilBERT")
+    parser.add_argument("--batch-size", type=int, default=BATCH_SIZE)
+    parser.add_argument("--backend", choices=sorted(BACKENDS), default="pytorch",
+                        help="fp32 PyTorch, dynamic int8 PyTorch, or ONNX Runtime")
+    parser.add_argument("--parallel", choices=PARALLEL_MODES, default="threads",
+                        help="one model with intra-op threads, or a pool of single-threaded processes")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="threads or processes to use (default: torch decides / one per core)")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="rescore everything instead of reusing sentiment_cache.sqlite")
+    args = parser.parse_args()
+
     reviews = load_reviews("clean_reviews.json")
     print(f"Loaded {len(reviews)} reviews.")
 
-    annotated = analyze_sentiment(reviews)
+    cache = None if args.no_cache else SentimentCache()
+    annotated = analyze_sentiment(reviews, batch_size=args.batch_size, parallel=args.parallel,
+                                  workers=args.workers, cache=cache, backend=args.backend)
+    if cache:
+        cache.close()
     save_reviews(annotated)
 
     stats = summarize(annotated)
@@ -0,0 +1,276 @@
+'''
+Concurrent version of the review crawler.
+
+scrape_professors.py used to fetch one professor at a time with a blocking
+requests.get and a fixed time.sleep between every page and every professor,
+so the whole COMS department took tens of minutes. Most of that time was
+just waiting on the network.
+
+Here each professor (or course) is its own asyncio task. Pages for a single
+entity are still fetched in order since we don't know how many there are,
+but many entities are crawled at once. Two knobs keep us polite:
+- concurrency: how many entities can be in flight at the same time
+- rate: a global token bucket shared by every request, so the total
+  requests/second never goes above this no matter how many tasks are running
+
+The token bucket replaces the old fixed sleeps. Retries and backoff follow
+the same policy as culpa_client.py and count into culpa_client.stats.
+
+crawl_entities() can also be handed an existing session, limiter and
+semaphore, so several crawls (e.g. one per department, crawl_departments.py)
+share one connection pool, one concurrency bound and one rate per host.
+'''
+
+import asyncio
+import json
+import time
+from urllib.parse import urlsplit
+
+import aiohttp
+
+import culpa_client
+import http_cache
+from incremental import take_until_mark
+
+DEFAULT_CONCURRENCY = 8
+DEFAULT_RATE = 5.0  # requests per second across all tasks
+
+
+class TokenBucket:
+    """Global rate limiter: `rate` tokens per second, bursts up to `capacity`"""
+
+    def __init__(self, rate=DEFAULT_RATE, capacity=None):
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(1.0, rate)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.lock = asyncio.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    async def acquire(self):
+        """Wait until a token is available, then take it"""
+        async with self.lock:
+            self._refill()
+            if self.tokens < 1:
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+                self._refill()
+            self.tokens -= 1
+
+    def for_url(self, url):
+        return self
+
+
+class HostBuckets:
+    """A TokenBucket per host, so `rate` is a per-host limit (politeness per server)"""
+
+    def __init__(self, rate=DEFAULT_RATE):
+        self.rate = rate
+        self.buckets = {}
+
+    def for_url(self, url):
+        host = urlsplit(url).netloc
+        if host not in self.buckets:
+            self.buckets[host] = TokenBucket(self.rate)
+        return self.buckets[host]
+
+
+def _connection_trace():
+    """Counts aiohttp's new vs reused pool connections into culpa_client.stats"""
+    async def created(session, context, params):
+        culpa_client.stats['new_connections'] += 1
+
+    async def reused(session, context, params):
+        culpa_client.stats['reused_connections'] += 1
+
+    trace = aiohttp.TraceConfig()
+    trace.on_connection_create_end.append(created)
+    trace.on_connection_reuseconn.append(reused)
+    return trace
+
+
+def client_session(concurrency=DEFAULT_CONCURRENCY):
+    """
+    An aiohttp session pooling up to `concurrency` connections, which count
+    into culpa_client.stats like the requests session's do (print_stats())
+    """
+    return aiohttp.ClientSession(connector=aiohttp.TCPConnector(limit=concurrency),
+                                 trace_configs=[_connection_trace()])
+
+
+async def fetch_json(session, bucket, url, params=None):
+    """
+    GET a URL once the rate limiter (a TokenBucket or HostBuckets) allows it.
+    Returns (status, json or None).
+
+    429/5xx and connection errors are retried with the same backoff policy as
+    culpa_client.get, and raise once retries run out. The on-disk cache from
+    culpa_client.get_cache() is used the same way too (including raising
+    http_cache.CacheMiss for an uncached page in cache-only mode).
+    """
+    cache = culpa_client.get_cache()
+    headers = {}
+    if cache:
+        key = cache.key(url, params)
+        entry = cache.lookup(key)
+        if entry and (cache.offline or cache.is_fresh(entry)):
+            cache.stats['hits'] += 1
+            return 200, json.loads(entry['body'])
+        if cache.offline:
+            cache.stats['misses'] += 1
+            raise http_cache.CacheMiss(url, params)
+        headers = cache.conditional_headers(entry)
+
+    limiter = bucket.for_url(url)
+    for attempt in range(culpa_client.MAX_RETRIES + 1):
+        await limiter.acquire()
+        try:
+            async with session.get(url, params=params, headers=headers) as response:
+                culpa_client.stats['requests'] += 1
+                if response.status == 200:
+                    body = await response.read()
+                    if cache:
+                        cache.stats['misses'] += 1
+                        cache.store(key, url, body, response.headers)
+                    return response.status, json.loads(body)
+                if cache and response.status == 304 and entry:
+                    cache.stats['revalidated'] += 1
+                    cache.touch(key)
+                    return 200, json.loads(entry['body'])
+                if response.status not in culpa_client.RETRY_STATUSES:
+                    return response.status, None
+                if attempt == culpa_client.MAX_RETRIES:
+                    response.raise_for_status()
+                retry_after = culpa_client.retry_after_seconds(response.headers.get('Retry-After'))
+        except (aiohttp.ClientConnectionError, asyncio.TimeoutError):
+            if attempt == culpa_client.MAX_RETRIES:
+                raise
+            retry_after = None
+
+        culpa_client.stats['retries'] += 1
+        await asyncio.sleep(culpa_client.backoff_delay(attempt, retry_after))
+
+
+async def crawl_entity_reviews(session, bucket, base_url, kind, entity_id,
+                               journal=None, mark=None):
+    """
+    Fetch every page of reviews for one professor or course. With a
+    high-water `mark` (see incremental.py) stop at the first known review.
+    """
+    filter_param = 'course_filter' if kind == 'professor' else 'professor_filter'
+    page, all_reviews = journal.resume_point(entity_id) if journal else (1, [])
+    seen_ids = {review.get('review_id') for review in all_reviews}
+
+    while True:
+        status, data = await fetch_json(
+            session, bucket,
+            f"{base_url}/review/{kind}/{entity_id}",
+            params={'page': page, 'sort_key': 'null', filter_param: 'null'}
+        )
+
+        if status != 200:
+            break
+
+        reviews = data.get('reviews', [])
+
+        if not reviews:
+            break
+
+        reviews, caught_up = take_until_mark(reviews, mark)
+
+        # Add unique reviews
+        new_reviews = []
+        for review in reviews:
+            review_id = review.get('review_id')
+            if review_id and review_id not in seen_ids:
+                new_reviews.append(review)
+                seen_ids.add(review_id)
+        all_reviews.extend(new_reviews)
+
+        if journal:
+            journal.record_page(entity_id, page, new_reviews)
+
+        if caught_up:
+            break
+
+        page += 1
+
+    if journal:
+        journal.record_done(entity_id)
+
+    return all_reviews
+
+
+async def crawl_entities(entities, kind, id_key, label, base_url,
+                         concurrency=DEFAULT_CONCURRENCY, rate=DEFAULT_RATE,
+                         journal=None, marks=None, session=None, bucket=None, semaphore=None):
+    """
+    Crawl reviews for a list of professors or courses concurrently.
+
+    Returns entries shaped like cs_reviews.json ({kind, reviews, review_count}),
+    in the same order as `entities`, skipping entities without reviews.
+    If a CrawlJournal is given, finished entities are taken from it instead of
+    re-fetched and every page is checkpointed to it. With `marks` (entity id ->
+    high-water mark) only reviews newer than the mark are fetched and returned.
+    session/bucket/semaphore are shared with other crawls if given, otherwise
+    made here from concurrency and rate.
+    """
+    if session is None:
+        async with client_session(concurrency) as session:
+            return await crawl_entities(
+                entities, kind, id_key, label, base_url, concurrency, rate, journal, marks,
+                session, bucket, semaphore
+            )
+
+    bucket = bucket or TokenBucket(rate)
+    semaphore = semaphore or asyncio.Semaphore(concurrency)
+    results = [None] * len(entities)
+    done = 0
+    total_reviews = 0
+
+    async def worker(i, entity):
+        nonlocal done, total_reviews
+        entity_id = entity.get(id_key)
+        if journal and journal.is_done(entity_id):
+            reviews = journal.resume_point(entity_id)[1]
+        else:
+            async with semaphore:
+                reviews = await crawl_entity_reviews(
+                    session, bucket, base_url, kind, entity_id, journal,
+                    mark=marks.get(entity_id) if marks else None
+                )
+        results[i] = reviews
+        done += 1
+        total_reviews += len(reviews)
+        status = f"✓ {len(reviews)} reviews" if reviews else "✗ No reviews"
+        print(f"[{done}/{len(entities)}] {label(entity)} - ID: {entity_id}  {status}")
+
+    tasks = [asyncio.ensure_future(worker(i, e)) for i, e in enumerate(entities)]
+    try:
+        await asyncio.gather(*tasks)
+    except BaseException:
+        # don't leave the other entities crawling (and writing to the journal) after a failure
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        raise
+
+    print(f"  Crawled {len(entities)} {kind}s, {total_reviews} reviews")
+
+    return [
+        {kind: entity, 'reviews': reviews, 'review_count': len(reviews)}
+        for entity, reviews in zip(entities, results)
+        if reviews
+    ]
+
+
+def crawl(entities, kind, id_key, label, base_url,
+          concurrency=DEFAULT_CONCURRENCY, rate=DEFAULT_RATE, journal=None, marks=None):
+    """Blocking wrapper around crawl_entities for use from the scripts"""
+    return asyncio.run(crawl_entities(
+        entities, kind, id_key, label, base_url,
+        concurrency=concurrency, rate=rate, journal=journal, marks=marks
+    ))
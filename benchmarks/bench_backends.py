@@ -0,0 +1,82 @@
+'''
+Compare the sentiment backends in sentiment_backends.py on the same reviews:
+load time, single-review latency, batched throughput, and how far each one
+drifts from the fp32 PyTorch scores.
+
+    python benchmarks/bench_backends.py --threads 4
+    python benchmarks/bench_backends.py --backends pytorch,onnx --max-drift 0.01
+
+Exits non-zero if any backend's max |Δ positive_score| vs fp32 is above
+--max-drift, so a quantized/ONNX backend can be checked before switching
+analyze.py over to it. Label agreement is reported too (reviews sitting right
+at the 0.6 threshold can flip with tiny drift).
+'''
+
+import argparse
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import analyze
+from sentiment_backends import BACKENDS
+
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return result, time.perf_counter() - start
+
+
+def single_latency_ms(backend, texts, samples=50):
+    """Median time to score one review by itself"""
+    times = []
+    for text in texts[:samples]:
+        _, seconds = timed(lambda: analyze.score_texts([text], backend, progress=False))
+        times.append(seconds * 1000)
+    return statistics.median(times)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--model", default=analyze.MODEL_NAME)
+    parser.add_argument("--reviews", default=os.path.join(os.path.dirname(analyze.__file__), "clean_reviews.json"))
+    parser.add_argument("--repeat", type=int, default=4)
+    parser.add_argument("--backends", default=",".join(BACKENDS))
+    parser.add_argument("--batch-size", type=int, default=analyze.BATCH_SIZE)
+    parser.add_argument("--threads", type=int, default=None)
+    parser.add_argument("--max-drift", type=float, default=0.05,
+                        help="fail if a backend's positive_score moves more than this vs fp32")
+    args = parser.parse_args()
+
+    texts = [r["text"] for r in analyze.load_reviews(args.reviews) if r["text"]] * args.repeat
+    names = ["pytorch"] + [n for n in args.backends.split(",") if n != "pytorch"]
+    print(f"{len(texts)} reviews, batch size {args.batch_size}\n")
+
+    reference = None
+    failed = []
+    for name in names:
+        backend, load_seconds = timed(lambda: analyze.load_model(args.model, name))
+        if args.threads:
+            backend.set_threads(args.threads)
+        latency = single_latency_ms(backend, texts)
+        scores, seconds = timed(lambda: analyze.score_texts(texts, backend, args.batch_size, progress=False))
+
+        line = (f"  {name:<14} load {load_seconds:6.2f}s   1 review {latency:7.1f} ms   "
+                f"{len(texts) / seconds:8.1f} reviews/sec")
+        if reference is None:
+            reference = scores
+        else:
+            drift = max(abs(a[0] - b[0]) for a, b in zip(scores, reference))
+            same = sum(analyze.sentiment_label(*a) == analyze.sentiment_label(*b)
+                       for a, b in zip(scores, reference))
+            line += f"   max |Δ positive_score| {drift:.1e}   labels agree {same}/{len(texts)}"
+            if drift > args.max_drift:
+                failed.append(name)
+        print(line)
+
+    if failed:
+        print(f"\n❌ Drift above {args.max_drift}: {', '.join(failed)}")
+        sys.exit(1)
@@ -0,0 +1,114 @@
+'''
+Wall-clock comparison of the old sequential professor crawl against the
+asyncio crawler, both hitting fake_culpa_server.py so it runs offline.
+
+    python benchmarks/bench_crawl.py --limit 40 --latency 0.05 --concurrency 8 --rate 50
+
+The sequential run is the old scrape_professors.py page loop, kept here as
+it was (bare requests.get, no journal or marks) along with its original
+time.sleep calls, since those are part of what the old crawl actually cost.
+'''
+
+import argparse
+import os
+import sys
+import time
+
+import requests
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ['CULPA_CACHE'] = '0'  # keep fake 127.0.0.1 pages out of .culpa_cache.sqlite (and out of the timings)
+
+import async_crawler
+import fake_culpa_server
+import scrape_professors
+
+
+def scrape_professor_reviews(base_url, professor_id):
+    """The old one-professor page loop from scrape_professors.py"""
+    all_reviews = []
+    seen_ids = set()
+    page = 1
+
+    while True:
+        response = requests.get(
+            f"{base_url}/review/professor/{professor_id}",
+            params={'page': page, 'sort_key': 'null', 'course_filter': 'null'}
+        )
+
+        if response.status_code != 200:
+            break
+
+        data = response.json()
+        reviews = data.get('reviews', [])
+
+        if not reviews:
+            break
+
+        # Add unique reviews
+        for review in reviews:
+            review_id = review.get('review_id')
+            if review_id and review_id not in seen_ids:
+                all_reviews.append(review)
+                seen_ids.add(review_id)
+
+        page += 1
+        time.sleep(0.3)
+
+    return all_reviews
+
+
+def run_sequential(professors, base_url):
+    all_data = []
+    for prof in professors:
+        reviews = scrape_professor_reviews(base_url, prof['professor_id'])
+        if reviews:
+            all_data.append({'professor': prof, 'reviews': reviews, 'review_count': len(reviews)})
+        time.sleep(0.5)
+    return all_data
+
+
+def run_async(professors, base_url, concurrency, rate):
+    return async_crawler.crawl(
+        professors, 'professor', 'professor_id',
+        label=lambda p: f"{p['first_name']} {p['last_name']}",
+        base_url=base_url, concurrency=concurrency, rate=rate
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--limit", type=int, default=40, help="number of professors to crawl")
+    parser.add_argument("--latency", type=float, default=0.05)
+    parser.add_argument("--concurrency", type=int, default=async_crawler.DEFAULT_CONCURRENCY)
+    parser.add_argument("--rate", type=float, default=50.0)
+    parser.add_argument("--skip-sequential", action="store_true")
+    args = parser.parse_args()
+
+    server, base_url = fake_culpa_server.start_server(latency=args.latency)
+    scrape_professors.BASE_URL = base_url
+    professors = scrape_professors.get_cs_professors()[:args.limit]
+
+    timings = {}
+    if not args.skip_sequential:
+        start = time.perf_counter()
+        sequential = run_sequential(professors, base_url)
+        timings['sequential'] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    concurrent = run_async(professors, base_url, args.concurrency, args.rate)
+    timings['async'] = time.perf_counter() - start
+
+    server.shutdown()
+
+    if not args.skip_sequential:
+        assert sequential == concurrent, "async crawl returned different data"
+
+    print(f"\n{'='*60}")
+    print(f"Professors: {len(professors)}, latency {args.latency}s, "
+          f"concurrency {args.concurrency}, rate {args.rate}/s")
+    for name, seconds in timings.items():
+        print(f"  {name:<12} {seconds:7.2f}s")
+    if 'sequential' in timings:
+        print(f"  speedup      {timings['sequential'] / timings['async']:7.1f}x")
+    print(f"{'='*60}")
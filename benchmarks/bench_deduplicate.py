@@ -0,0 +1,82 @@
+'''
+Duplicate-professor detection at university scale: blocked candidate pairs
+(data/deduplicate.py) vs scoring every pair of professors.
+
+    python benchmarks/bench_deduplicate.py --professors 30000
+
+Professors are synthetic: the real cs_reviews.json profiles with their names
+shuffled into new combinations, plus --duplicates copies listed under a new
+ID with a subset of the courses. All-pairs is timed on a --sample and scaled
+up (it's quadratic, the full run would take hours).
+'''
+
+import argparse
+import os
+import random
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, "data"))
+
+import deduplicate
+
+
+def synthetic_profiles(base, professors, duplicates, seed=0):
+    rng = random.Random(seed)
+    firsts = sorted({p['first'] for p in base if p['first']})
+    lasts = sorted({p['last'] for p in base if p['last']})
+    courses = sorted({c for p in base for c in p['courses']})
+
+    profiles = []
+    for i in range(professors):
+        profiles.append({
+            'id': 100_000 + i,
+            'first': rng.choice(firsts),
+            'last': f"{rng.choice(lasts)}{i % 500}",  # keep name blocks realistically small
+            'uni': '',
+            'review_count': rng.randint(1, 30),
+            'courses': set(rng.sample(courses, rng.randint(1, 5))),
+        })
+    for i, original in enumerate(rng.sample(profiles, duplicates)):
+        copy = dict(original, id=900_000 + i, review_count=1)
+        copy['courses'] = set(rng.sample(sorted(original['courses']), 1))
+        profiles.append(copy)
+    return profiles, duplicates
+
+
+def all_pairs(profiles):
+    bitsets = deduplicate.course_bitsets(profiles)
+    n = len(profiles)
+    return [(deduplicate.score_pair(profiles[i], profiles[j], bitsets[i], bitsets[j]), i, j)
+            for i in range(n) for j in range(i + 1, n)]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--reviews", default=os.path.join(ROOT, "cs_reviews.json"))
+    parser.add_argument("--professors", type=int, default=30000)
+    parser.add_argument("--duplicates", type=int, default=500)
+    parser.add_argument("--sample", type=int, default=500)
+    args = parser.parse_args()
+
+    base = deduplicate.professor_profiles(deduplicate.review_store.stream_entries(args.reviews, 'professor'))
+    profiles, planted = synthetic_profiles(base, args.professors, args.duplicates)
+    n = len(profiles)
+
+    start = time.perf_counter()
+    scored = deduplicate.score_candidates(profiles)
+    merge_map = deduplicate.build_merge_map(profiles, scored)
+    blocked = time.perf_counter() - start
+    found = sum(1 for old_id in merge_map if old_id >= 900_000 or merge_map[old_id][0] >= 900_000)
+
+    start = time.perf_counter()
+    all_pairs(profiles[:args.sample])
+    sample_time = time.perf_counter() - start
+    estimate = sample_time * (n * (n - 1)) / (args.sample * (args.sample - 1))
+
+    print(f"{n} professors ({planted} planted duplicates)\n")
+    print(f"  blocked:   {len(scored):>12,} pairs  {blocked:8.2f} s  "
+          f"-> {len(merge_map)} merges, {found} of the planted duplicates")
+    print(f"  all pairs: {n * (n - 1) // 2:>12,} pairs  {estimate:8.0f} s  "
+          f"(estimated from {args.sample} professors in {sample_time:.2f} s)")
@@ -0,0 +1,104 @@
+'''
+Wall-clock of crawling several departments one after another (what running
+the COMS scrapers once per department would do) vs crawl_departments.py's
+shared pool, both against fake_culpa_server.py with --departments copies of
+the CS department.
+
+    python benchmarks/bench_departments.py --departments 6 --latency 0.05 --rate 50
+    python benchmarks/bench_departments.py --departments 3 --latency 0.05 --rate 1000
+
+Both sides share one session, one HostBuckets limiter and one --concurrency
+bound, and the HTTP cache is off, so the only difference is whether
+departments overlap. Measured here (0.05 s latency, concurrency 16):
+
+    6 departments, --rate 50:    87.7 s one at a time, 87.8 s shared pool
+    3 departments, --rate 1000:  15.2 s one at a time, 14.1 s shared pool
+
+At a real --rate both are rate-bound and take the same time, which is the
+point: crawling the whole university is no harder on the host than one
+department. With the rate out of the way the shared pool only wins the
+tail of each department, where a few long-paginated entities leave most
+of the concurrency idle (~1.1x).
+
+Also merges the shards and checks every review came through exactly once.
+'''
+
+import argparse
+import asyncio
+import contextlib
+import io
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ['CULPA_CACHE'] = '0'  # keep fake 127.0.0.1 pages out of .culpa_cache.sqlite (and out of the timings)
+
+import async_crawler
+import crawl_departments
+import fake_culpa_server
+
+
+async def crawl_one_at_a_time(departments, base_url, concurrency, rate):
+    # same session, limiter and concurrency bound as the shared pool, so the
+    # only difference is that departments (and kinds) don't overlap
+    limiter = async_crawler.HostBuckets(rate)
+    semaphore = asyncio.Semaphore(concurrency)
+    total = 0
+    async with async_crawler.client_session(concurrency) as session:
+        for department in departments:
+            for kind in ('professor', 'course'):
+                _, entities = await async_crawler.fetch_json(
+                    session, limiter, f"{base_url}/departments/{department['department_id']}/{kind}s")
+                entries = await async_crawler.crawl_entities(
+                    entities, kind, f"{kind}_id", crawl_departments.LABELS[kind], base_url,
+                    session=session, bucket=limiter, semaphore=semaphore)
+                total += sum(e['review_count'] for e in entries)
+    return total
+
+
+def run_one_at_a_time(departments, base_url, concurrency, rate):
+    return asyncio.run(crawl_one_at_a_time(departments, base_url, concurrency, rate))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--departments", type=int, default=6)
+    parser.add_argument("--latency", type=float, default=0.05)
+    parser.add_argument("--concurrency", type=int, default=crawl_departments.DEFAULT_CONCURRENCY)
+    parser.add_argument("--department-workers", type=int, default=crawl_departments.DEFAULT_DEPARTMENT_WORKERS)
+    parser.add_argument("--rate", type=float, default=50.0)
+    parser.add_argument("--skip-sequential", action="store_true")
+    args = parser.parse_args()
+
+    fixture = fake_culpa_server.replicate_departments(fake_culpa_server.load_fixture(), args.departments)
+    server, base_url = fake_culpa_server.start_server(latency=args.latency, fixture=fixture)
+    expected = {r['review_id'] for reviews in fixture['professor_reviews'].values() for r in reviews}
+    expected |= {r['review_id'] for reviews in fixture['course_reviews'].values() for r in reviews}
+
+    timings = {}
+    with contextlib.redirect_stdout(io.StringIO()):
+        departments = crawl_departments.get_departments(base_url)
+        if not args.skip_sequential:
+            start = time.perf_counter()
+            run_one_at_a_time(departments, base_url, args.concurrency, args.rate)
+            timings['one department at a time'] = time.perf_counter() - start
+
+        with tempfile.TemporaryDirectory() as tmp:
+            start = time.perf_counter()
+            crawl_departments.crawl_departments(
+                base_url=base_url, shard_dir=tmp, concurrency=args.concurrency, rate=args.rate,
+                department_workers=args.department_workers)
+            timings['shared pool'] = time.perf_counter() - start
+            index = crawl_departments.merge_shards(tmp, os.path.join(tmp, "p.json"), os.path.join(tmp, "c.json"))
+
+    server.shutdown()
+    print("=" * 60)
+    print(f"Departments: {len(departments)}, latency {args.latency}s, "
+          f"rate {args.rate}/s per host, concurrency {args.concurrency}")
+    for name, seconds in timings.items():
+        print(f"  {name:<26} {seconds:6.2f}s")
+    print(f"  merged shards: {len(index)} unique reviews "
+          f"({'all' if set(index.reviews) == expected else 'NOT all'} of the {len(expected)} served)")
+    print("=" * 60)
@@ -0,0 +1,87 @@
+'''
+Import time and --help startup of the analysis scripts, measured with
+`python -X importtime` in a fresh interpreter per case.
+
+    python benchmarks/bench_import_time.py
+    python benchmarks/bench_import_time.py --max-ms 150 --repeat 5
+
+torch/transformers/sklearn are only imported once a script actually scores
+or trains something, so importing a helper (or running --help) should stay
+cheap. Exits non-zero if a module takes longer than --max-ms to import, or
+if importing it drags in one of HEAVY_MODULES.
+'''
+
+import argparse
+import os
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# module name -> directory it's imported from
+MODULES = {
+    'analyze': ROOT,
+    'sentiment_backends': ROOT,
+    'ranking_engine': ROOT,
+    'analyze_courses': os.path.join(ROOT, 'course_data'),
+}
+
+HEAVY_MODULES = {'torch', 'transformers', 'sklearn', 'onnxruntime', 'pyarrow'}
+
+
+def import_profile(module, directory):
+    """(cumulative import time in ms, top-level packages imported) for `module`"""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=directory, capture_output=True, text=True, check=True
+    )
+    total_us = None
+    imported = set()
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line.split("|")
+        if not cumulative.strip().isdigit():
+            continue  # header line
+        imported.add(name.strip().split(".")[0])
+        if name.strip() == module:
+            total_us = int(cumulative)
+    return total_us / 1000, imported
+
+
+def help_seconds(module, directory):
+    start = time.perf_counter()
+    subprocess.run([sys.executable, f"{module}.py", "--help"], cwd=directory,
+                   capture_output=True, check=True)
+    return time.perf_counter() - start
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--repeat", type=int, default=3,
+                        help="take the best of this many runs per module")
+    parser.add_argument("--max-ms", type=float, default=200.0,
+                        help="fail if importing a module takes longer than this")
+    args = parser.parse_args()
+
+    failed = []
+    for module, directory in MODULES.items():
+        runs = [import_profile(module, directory) for _ in range(args.repeat)]
+        best_ms = min(ms for ms, _ in runs)
+        heavy = sorted(HEAVY_MODULES & runs[0][1])
+        line = f"  {module:<20} import {best_ms:7.1f} ms"
+        with open(os.path.join(directory, f"{module}.py")) as f:
+            has_cli = '__main__' in f.read()
+        if has_cli:
+            line += f"   --help {help_seconds(module, directory) * 1000:7.1f} ms"
+        if heavy:
+            line += f"   imports {', '.join(heavy)}"
+        print(line)
+        if best_ms > args.max_ms or heavy:
+            failed.append(module)
+
+    if failed:
+        print(f"\n❌ Slow or heavy imports: {', '.join(failed)} (limit {args.max_ms:.0f} ms, no {', '.join(sorted(HEAVY_MODULES))})")
+        sys.exit(1)
+    print(f"\n✅ All imports under {args.max_ms:.0f} ms without heavy dependencies")
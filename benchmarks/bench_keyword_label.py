@@ -0,0 +1,73 @@
+'''
+Keyword labeling speed: the old per-keyword `w in text` loop vs the
+single-scan KeywordMatcher, over every review text in cs_course_reviews.json.
+
+    python benchmarks/bench_keyword_label.py --repeat 5
+
+Also checks the matcher gives the same labels as the old loop, and shows
+how many labels change with --word-boundary matching.
+'''
+
+import argparse
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, "course_data"))
+
+import analyze_courses
+import json_stream
+
+
+def keyword_label_loop(text):
+    """What keyword_label used to do"""
+    text = text.lower()
+    hard = sum(1 for w in analyze_courses.HARD if w in text)
+    easy = sum(1 for w in analyze_courses.EASY if w in text)
+    if hard > easy:
+        return 'hard'
+    elif easy > hard:
+        return 'easy'
+    return 'medium'
+
+
+def best_time(fn, texts, repeat):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        labels = [fn(t) for t in texts]
+        seconds = time.perf_counter() - start
+        best = seconds if best is None else min(best, seconds)
+    return labels, best
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--reviews", default=os.path.join(ROOT, "course_data", "cs_course_reviews.json"))
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    texts = [analyze_courses.get_review_text(review)
+             for entry in json_stream.iter_entries(args.reviews)
+             for review in entry.get('reviews', [])]
+    texts = [t for t in texts if t]
+    print(f"{len(texts)} review texts, {sum(map(len, texts)) / 1e6:.1f}M characters\n")
+
+    baseline, loop_seconds = best_time(keyword_label_loop, texts, args.repeat)
+    print(f"  {'per-keyword loop':<22} {loop_seconds * 1000:8.1f} ms")
+
+    labels, seconds = best_time(analyze_courses.keyword_label, texts, args.repeat)
+    mismatches = sum(a != b for a, b in zip(labels, baseline))
+    implementation = analyze_courses.keyword_matcher().implementation
+    print(f"  {'KeywordMatcher':<22} {seconds * 1000:8.1f} ms   [{implementation}] "
+          f"({loop_seconds / seconds:.1f}x, {mismatches} labels differ)")
+
+    labels, seconds = best_time(lambda t: analyze_courses.keyword_label(t, word_boundary=True),
+                                texts, args.repeat)
+    changed = sum(a != b for a, b in zip(labels, baseline))
+    implementation = analyze_courses.keyword_matcher(word_boundary=True).implementation
+    print(f"  {'  word boundaries':<22} {seconds * 1000:8.1f} ms   [{implementation}] ({changed} labels change)")
+
+    if mismatches:
+        sys.exit(1)
@@ -0,0 +1,62 @@
+'''
+Per-query latency of "top N by X" over a ranking table: a full sort (what
+analyze_courses.py used to do), heap top_k, and a RankingIndex query.
+
+    python benchmarks/bench_ranking_query.py --copies 1000
+
+--copies repeats course_data/course_rankings.json to get a university-sized
+table. Checks all three give the same rows.
+'''
+
+import argparse
+import json
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import ranking_query
+
+
+def per_query_ms(fn, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = fn()
+    return result, (time.perf_counter() - start) / repeat * 1000
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rankings", default=os.path.join(ROOT, "course_data", "course_rankings.json"))
+    parser.add_argument("--copies", type=int, default=1000)
+    parser.add_argument("--top", type=int, default=15)
+    parser.add_argument("--min-reviews", type=int, default=10)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    with open(args.rankings) as f:
+        base = json.load(f)
+    rows = [dict(row, course_id=row.get('course_id', 0) + copy * 1_000_000)
+            for copy in range(args.copies) for row in base]
+    metric = 'bayesian_rating'
+    print(f"{len(rows)} rows, top {args.top} by {metric}, min {args.min_reviews} reviews\n")
+
+    def full_sort():
+        reliable = [r for r in rows if r[metric] is not None and r['review_count'] >= args.min_reviews]
+        return sorted(reliable, key=lambda r: r[metric], reverse=True)[:args.top]
+
+    expected, sort_ms = per_query_ms(full_sort, args.repeat)
+    print(f"  {'full sort':<22} {sort_ms:9.3f} ms/query")
+
+    result, heap_ms = per_query_ms(lambda: ranking_query.top_k(rows, metric, args.top, 'desc', args.min_reviews),
+                                   args.repeat)
+    print(f"  {'heap top_k':<22} {heap_ms:9.3f} ms/query   {'same rows' if result == expected else 'DIFFERENT'}")
+
+    index = ranking_query.RankingIndex(rows)
+    _, build_ms = per_query_ms(lambda: index.order(metric), 1)
+    result, index_ms = per_query_ms(lambda: index.top(metric, args.top, 'desc', args.min_reviews),
+                                    args.repeat)
+    print(f"  {'RankingIndex':<22} {index_ms:9.3f} ms/query   {'same rows' if result == expected else 'DIFFERENT'}"
+          f"   (one-time sort {build_ms:.1f} ms)")
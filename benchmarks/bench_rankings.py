@@ -0,0 +1,135 @@
+'''
+Ranking stage of analyze_courses.py: the old course-by-course Python loop vs
+the columnar rank_courses (dates parsed once, bincount reductions).
+
+    python benchmarks/bench_rankings.py --copies 20
+
+--copies repeats cs_course_reviews.json (course IDs shifted) to look like a
+university-wide crawl. Both versions use the same trained model; the script
+checks they produce identical rankings. The last row is the columnar version
+reusing the training TF-IDF matrix, as analyze_courses.main() does.
+'''
+
+import argparse
+import contextlib
+import io
+import os
+import sys
+import time
+from datetime import datetime
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, "course_data"))
+
+import analyze_courses as ac
+import json_stream
+
+
+def get_time_weight(date_str, decay_years=5):
+    if not date_str:
+        return 0.5
+    try:
+        review_date = datetime.fromisoformat(date_str.replace('Z', '+00:00'))
+        days_ago = (datetime.now() - review_date.replace(tzinfo=None)).days
+        years_ago = days_ago / 365
+        if years_ago <= 0:
+            return 1.0
+        elif years_ago >= decay_years:
+            return 0.3
+        else:
+            return 1.0 - (years_ago / decay_years) * 0.7
+    except:
+        return 0.5
+
+
+def rank_courses_loop(data, vectorizer, model, global_mean_rating):
+    """What rank_courses used to do, one course at a time"""
+    course_rankings = []
+    for course_entry in data:
+        reviews = course_entry.get('reviews', [])
+        text_count = len([r for r in reviews if len(ac.get_review_text(r)) > 20])
+
+        texts, weights = [], []
+        for review in reviews:
+            full_text = ac.get_review_text(review)
+            if full_text and len(full_text) > 20:
+                texts.append(full_text)
+                weights.append(get_time_weight(review.get('submission_date')))
+        weighted_difficulty, hard_pct, scores = None, None, []
+        if texts:
+            scores = [ac.LABEL_TO_SCORE[p] for p in model.predict(vectorizer.transform(texts))]
+            total_weight = sum(weights)
+            weighted_difficulty = sum(s * w for s, w in zip(scores, weights)) / total_weight
+            hard_pct = sum(w for s, w in zip(scores, weights) if s == 2) / total_weight * 100
+        bayesian_difficulty = ac.bayesian_average(weighted_difficulty, text_count,
+                                                  ac.C_DIFFICULTY, ac.GLOBAL_MEAN_DIFFICULTY)
+
+        ratings, weights = [], []
+        for review in reviews:
+            r = review.get('rating')
+            if r:
+                ratings.append(r)
+                weights.append(get_time_weight(review.get('submission_date')))
+        weighted_rating, raw_rating = None, None
+        if ratings:
+            weighted_rating = sum(r * w for r, w in zip(ratings, weights)) / sum(weights)
+            raw_rating = sum(ratings) / len(ratings)
+        bayesian_rating = ac.bayesian_average(weighted_rating, len(reviews),
+                                              ac.C_RATING, global_mean_rating)
+
+        course_rankings.append({
+            'name': course_entry['course']['name'],
+            'course_id': course_entry['course']['course_id'],
+            'raw_rating': round(raw_rating, 2) if raw_rating else None,
+            'weighted_rating': round(weighted_rating, 2) if weighted_rating else None,
+            'bayesian_rating': round(bayesian_rating, 2) if bayesian_rating else None,
+            'raw_difficulty': round(sum(scores)/len(scores), 2) if scores else None,
+            'weighted_difficulty': round(weighted_difficulty, 2) if weighted_difficulty else None,
+            'bayesian_difficulty': round(bayesian_difficulty, 2) if bayesian_difficulty else None,
+            'hard_pct': round(hard_pct, 1) if hard_pct else None,
+            'review_count': len(reviews),
+            'text_count': text_count
+        })
+    return course_rankings
+
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return result, time.perf_counter() - start
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--reviews", default=os.path.join(ROOT, "course_data", "cs_course_reviews.json"))
+    parser.add_argument("--copies", type=int, default=20)
+    args = parser.parse_args()
+
+    base = list(json_stream.iter_entries(args.reviews))
+    data = []
+    for copy in range(args.copies):
+        for entry in base:
+            data.append({**entry, 'course': {**entry['course'],
+                                             'course_id': entry['course']['course_id'] + copy * 1_000_000}})
+    n_reviews = sum(len(e.get('reviews', [])) for e in data)
+    print(f"{len(data)} courses, {n_reviews} reviews ({args.copies} x {os.path.basename(args.reviews)})\n")
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        vectorizer, model, _ = ac.load_or_train_model(*ac.collect_training_data(data))
+    training_texts, _ = ac.collect_training_data(data)
+    training_X = vectorizer.transform(training_texts)  # what training leaves behind
+    global_mean_rating = ac.get_global_mean_rating(data)
+
+    baseline, loop_seconds = timed(lambda: rank_courses_loop(data, vectorizer, model, global_mean_rating))
+    print(f"  {'per-course loop':<18} {loop_seconds:7.2f}s")
+    rankings, seconds = timed(lambda: ac.rank_courses(data, vectorizer, model, global_mean_rating))
+    print(f"  {'columnar':<18} {seconds:7.2f}s   ({loop_seconds / seconds:.1f}x, "
+          f"{'identical' if rankings == baseline else 'DIFFERENT'} rankings)")
+
+    reused, seconds = timed(lambda: ac.rank_courses(data, vectorizer, model, global_mean_rating,
+                                                    training_texts, training_X))
+    print(f"  {'  reusing train X':<18} {seconds:7.2f}s   ({loop_seconds / seconds:.1f}x, "
+          f"{'identical' if reused == baseline else 'DIFFERENT'} rankings)")
+
+    if rankings != baseline or reused != baseline:
+        sys.exit(1)
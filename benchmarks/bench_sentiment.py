@@ -0,0 +1,76 @@
+'''
+CPU throughput (reviews/sec) of the sentiment scoring in analyze.py:
+the old one-review-at-a-time loop vs the batched, length-bucketed version.
+
+    python benchmarks/bench_sentiment.py --batch-sizes 8,32,64 --threads 4
+    python benchmarks/bench_sentiment.py --threads 1 --processes 4
+
+--repeat duplicates clean_reviews.json to get a bigger, steadier sample.
+Also checks the batched scores match the one-at-a-time ones.
+'''
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import torch
+
+import analyze
+
+
+def score_one_at_a_time(texts, backend):
+    """What analyze_sentiment used to do"""
+    tokenizer, model = backend.tokenizer, backend.model
+    scores = []
+    for text in texts:
+        inputs = tokenizer(text, truncation=True, max_length=analyze.MAX_LENGTH, return_tensors="pt")
+        with torch.no_grad():
+            probs = torch.softmax(model(**inputs).logits, dim=1)[0]
+        scores.append((float(probs[1]), float(probs[0])))
+    return scores
+
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return result, time.perf_counter() - start
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--model", default=analyze.MODEL_NAME)
+    parser.add_argument("--reviews", default=os.path.join(os.path.dirname(analyze.__file__), "clean_reviews.json"))
+    parser.add_argument("--repeat", type=int, default=4)
+    parser.add_argument("--batch-sizes", default="8,32,64")
+    parser.add_argument("--threads", type=int, default=None)
+    parser.add_argument("--processes", type=int, default=0,
+                        help="also time analyze.score_texts_parallel with this many workers")
+    args = parser.parse_args()
+
+    if args.threads:
+        torch.set_num_threads(args.threads)
+
+    texts = [r["text"] for r in analyze.load_reviews(args.reviews) if r["text"]] * args.repeat
+    backend = analyze.load_model(args.model)
+
+    print(f"{len(texts)} reviews, {torch.get_num_threads()} threads\n")
+
+    baseline, seconds = timed(lambda: score_one_at_a_time(texts, backend))
+    print(f"  {'one at a time':<16} {len(texts) / seconds:8.1f} reviews/sec")
+
+    for batch_size in [int(b) for b in args.batch_sizes.split(",")]:
+        scores, seconds = timed(lambda: analyze.score_texts(texts, backend, batch_size))
+        drift = max(abs(a[0] - b[0]) for a, b in zip(scores, baseline))
+        print(f"  {f'batch {batch_size}':<16} {len(texts) / seconds:8.1f} reviews/sec"
+              f"   (max |Δ positive_score| vs one at a time: {drift:.1e})")
+
+    if args.processes:
+        batch_size = analyze.BATCH_SIZE
+        scores, seconds = timed(lambda: analyze.score_texts_parallel(
+            texts, backend, batch_size, workers=args.processes))
+        drift = max(abs(a[0] - b[0]) for a, b in zip(scores, baseline))
+        print(f"  {f'{args.processes} processes':<16} {len(texts) / seconds:8.1f} reviews/sec"
+              f"   (max |Δ positive_score| vs one at a time: {drift:.1e})")
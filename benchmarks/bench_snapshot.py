@@ -0,0 +1,125 @@
+'''
+File size and load time of the review data as JSON dumps, a review_store
+.sqlite store and review_snapshot.py snapshots (Arrow and Parquet).
+
+    python benchmarks/bench_snapshot.py --copies 20
+
+--copies repeats cs_reviews.json and course_data/cs_course_reviews.json
+(with IDs shifted so nothing collides) to look like a bigger crawl. Load
+times are best of --repeat, imports done beforehand:
+
+- "entries":  the usual [{professor|course, reviews, review_count}] for
+              both kinds, what analyze_courses.py/filter_2026.py get
+- "columns":  just the reviews table's rating/date/course columns, what
+              a columnar consumer would read (JSON still has to parse it all)
+'''
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import json_stream
+import review_snapshot
+import review_store
+
+SOURCES = [os.path.join(ROOT, "cs_reviews.json"), os.path.join(ROOT, "course_data", "cs_course_reviews.json")]
+
+
+def write_copies(source, path, copies):
+    with json_stream.EntryWriter(path) as writer:
+        for copy in range(copies):
+            shift = copy * 1_000_000
+            for item in json_stream.iter_entries(source):
+                kind = 'professor' if 'professor' in item else 'course'
+                item[kind][f"{kind}_id"] += shift
+                for review in item['reviews']:
+                    review['review_id'] += shift
+                    for header, key in (('professor_header', 'professor_id'), ('course_header', 'course_id')):
+                        if (review.get(header) or {}).get(key) is not None:
+                            review[header][key] += shift
+                writer.write(item)
+
+
+def size_mb(path):
+    if os.path.isdir(path):
+        return sum(os.path.getsize(os.path.join(path, f)) for f in os.listdir(path)) / 1024 / 1024
+    return os.path.getsize(path) / 1024 / 1024
+
+
+def best_ms(fn, repeat):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return min(times) * 1000
+
+
+def json_entries(dumps):
+    for path in dumps:
+        with open(path) as f:
+            json.load(f)
+
+
+def json_columns(dumps):
+    with open(dumps[0]) as f:
+        data = json.load(f)
+    return [(r['rating'], r['submission_date'], (r.get('course_header') or {}).get('course_id'))
+            for item in data for r in item['reviews']]
+
+
+def store_entries(path):
+    review_store.load_entries(path, 'professor')
+    review_store.load_entries(path, 'course')
+
+
+def snapshot_entries(path):
+    review_snapshot.load_entries(path, 'professor')
+    review_snapshot.load_entries(path, 'course')
+
+
+def snapshot_columns(path):
+    return review_snapshot.read_table(path, 'reviews', ['rating', 'submission_date', 'course_id'])
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--copies", type=int, default=20)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    import pyarrow.parquet  # noqa: F401  (keep the import out of the timings)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        dumps = [os.path.join(tmp, os.path.basename(s)) for s in SOURCES]
+        for source, dump in zip(SOURCES, dumps):
+            write_copies(source, dump, args.copies)
+        store = os.path.join(tmp, "reviews.sqlite")
+        db = review_store.connect(store)
+        for dump in dumps:
+            review_store.import_json(db, dump)
+        db.close()
+        arrow, parquet = os.path.join(tmp, "arrow"), os.path.join(tmp, "parquet")
+        review_snapshot.export(arrow, [store], 'arrow')
+        review_snapshot.export(parquet, [store], 'parquet')
+
+        print(f"{args.copies} x (cs_reviews.json + cs_course_reviews.json)\n")
+        print(f"  {'':<18} {'size':>9} {'entries':>11} {'columns':>11}")
+        rows = [
+            ('JSON dumps', sum(size_mb(d) for d in dumps),
+             best_ms(lambda: json_entries(dumps), args.repeat), best_ms(lambda: json_columns(dumps), args.repeat)),
+            ('SQLite store', size_mb(store), best_ms(lambda: store_entries(store), args.repeat), None),
+            ('Arrow snapshot', size_mb(arrow),
+             best_ms(lambda: snapshot_entries(arrow), args.repeat), best_ms(lambda: snapshot_columns(arrow), args.repeat)),
+            ('Parquet snapshot', size_mb(parquet),
+             best_ms(lambda: snapshot_entries(parquet), args.repeat), best_ms(lambda: snapshot_columns(parquet), args.repeat)),
+        ]
+        for name, size, entries_ms, columns_ms in rows:
+            columns = f"{columns_ms:8.1f} ms" if columns_ms is not None else f"{'-':>11}"
+            print(f"  {name:<18} {size:6.1f} MB {entries_ms:8.0f} ms {columns}")
@@ -0,0 +1,89 @@
+'''
+Peak RSS of walking a review dump with json.load vs json_stream.iter_entries,
+plus deduplicate.py and merge.py (which now stream) on the same file.
+
+To look like a bigger crawl it writes a synthetic dump with cs_reviews.json
+repeated --copies times (IDs shifted so nothing collides):
+
+    python benchmarks/bench_stream_memory.py --copies 50
+
+Each case runs in its own process so peak RSS isn't shared between them.
+'''
+
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import json_stream
+
+CASES = {
+    'json.load walk (before)': '''
+import json
+with open(path) as f:
+    data = json.load(f)
+total = sum(len(item['reviews']) for item in data)
+''',
+    'iter_entries walk': '''
+import json_stream
+total = sum(len(item['reviews']) for item in json_stream.iter_entries(path))
+''',
+    'deduplicate.find_duplicate_names': '''
+import contextlib, io
+sys.path.insert(0, os.path.join(root, 'data'))
+import deduplicate
+with contextlib.redirect_stdout(io.StringIO()):
+    deduplicate.find_duplicate_names(path)
+''',
+    'merge.merge_professors': '''
+import contextlib, io
+sys.path.insert(0, os.path.join(root, 'data'))
+import merge
+with contextlib.redirect_stdout(io.StringIO()):
+    merge.merge_professors(path, path + '.merged')
+''',
+}
+
+MEASURE = '''
+import os, resource, sys
+root, path = sys.argv[1], sys.argv[2]
+sys.path.insert(0, root)
+{case}
+print(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss)
+'''
+
+
+def write_synthetic_dump(path, copies):
+    source = os.path.join(ROOT, "cs_reviews.json")
+    with json_stream.EntryWriter(path) as writer:
+        for copy in range(copies):
+            for item in json_stream.iter_entries(source):
+                shift = copy * 1_000_000
+                item['professor']['professor_id'] += shift
+                for review in item['reviews']:
+                    review['review_id'] += shift
+                writer.write(item)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--copies", type=int, default=50)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "reviews.json")
+        write_synthetic_dump(path, args.copies)
+        size_mb = os.path.getsize(path) / 1024 / 1024
+
+        print(f"Synthetic dump: {args.copies} x cs_reviews.json = {size_mb:.0f} MB\n")
+        for name, case in CASES.items():
+            result = subprocess.run(
+                [sys.executable, "-c", MEASURE.format(case=case), ROOT, path],
+                capture_output=True, text=True, check=True
+            )
+            peak_mb = int(result.stdout.split()[-1]) / 1024  # ru_maxrss is KB on Linux
+            print(f"  {name:<36} peak RSS {peak_mb:8.1f} MB")
@@ -0,0 +1,63 @@
+'''
+Runs analyze.score_texts and analyze.score_texts_parallel (the "processes"
+path) end to end with a stub backend, so it needs no model download, torch
+or transformers, and checks both give the same scores in input order.
+
+    python benchmarks/check_scoring.py [--texts 500] [--workers 3]
+
+The stub tokenizes on whitespace and scores a text by its word count, so
+every text gets a distinct, easily checked score. Exits non-zero on any
+mismatch (or if the processes path crashes).
+'''
+
+import argparse
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import analyze
+
+
+class StubBackend:
+    name = "stub"
+
+    def tokenizer(self, texts, truncation=True, max_length=analyze.MAX_LENGTH):
+        return {"input_ids": [[len(word) for word in text.split()][:max_length] for text in texts]}
+
+    def set_threads(self, threads):
+        pass
+
+    def probabilities(self, input_ids):
+        return [[1 / (len(ids) + 1), 1 - 1 / (len(ids) + 1)] for ids in input_ids]
+
+
+def expected(texts):
+    return [(1 - 1 / (len(t.split()) + 1), 1 / (len(t.split()) + 1)) for t in texts]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--texts", type=int, default=500)
+    parser.add_argument("--workers", type=int, default=3)
+    parser.add_argument("--batch-size", type=int, default=8)
+    args = parser.parse_args()
+
+    texts = [" ".join(["word"] * (i * 7 % 53)) for i in range(args.texts)]
+    backend = StubBackend()
+
+    failed = []
+    for name, scores in (
+        ("score_texts", analyze.score_texts(texts, backend, args.batch_size, progress=False)),
+        ("score_texts_parallel", analyze.score_texts_parallel(texts, backend, args.batch_size,
+                                                              workers=args.workers)),
+    ):
+        ok = scores == expected(texts)
+        print(f"  {name:<22} {len(scores)} scores   {'ok' if ok else 'MISMATCH'}")
+        if not ok:
+            failed.append(name)
+
+    if failed:
+        print(f"\n❌ Wrong scores from {', '.join(failed)}")
+        sys.exit(1)
+    print(f"\n✅ Both scoring paths agree on {len(texts)} texts")
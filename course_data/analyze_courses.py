@@ -1,11 +1,44 @@
+'''
+Rank courses, professors and course/professor pairs by (time-weighted,
+Bayesian-smoothed) difficulty and rating.
+
+    python analyze_courses.py [reviews.json | reviews.sqlite]
+    python analyze_courses.py ../data/merged_cs_reviews.json --kind professor
+
+All three tables come out of one pass (ranking_engine.py). The one shown
+(--print, default the same as --kind) is saved to its RANKING_FILES name;
+--output-dir saves all three there instead, named after the source, so
+ranking another dump never overwrites course_rankings.json:
+
+    python analyze_courses.py ../all_reviews.json --kind professor --output-dir rankings
+    # -> rankings/all_reviews_course_rankings.json, rankings/all_reviews_professor_rankings.json, ...
+
+Difficulty comes from a TF-IDF + LogisticRegression model trained on labels
+from the HARD/EASY keyword lists. The fitted model is saved by
+difficulty_model.py and reused until the reviews, keywords or parameters
+change (--retrain forces a fit). sklearn is only imported when the model is
+trained, so importing a helper from here (bayesian_average, keyword_label,
+...) or running --help doesn't pay for it.
+'''
+
+import argparse
 import json
-from datetime import datetime
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.linear_model import LogisticRegression
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import review_store
+from ranking_query import top_k
+from ranking_engine import (
+    C_DIFFICULTY, C_RATING, GLOBAL_MEAN_DIFFICULTY, GROUPINGS, LABEL_TO_SCORE,
+    bayesian_average, get_global_mean_rating, get_review_text, rank_groups,
+)
 
-# Step 1: Load data
-with open("spring_2026_course_reviews.json", "r") as f:
-    data = json.load(f)
+import difficulty_model
+from keyword_matcher import KeywordMatcher
+
+DEFAULT_SOURCE = "spring_2026_course_reviews.json"
 
 # Step 2: Keyword labeling (removed 'hard' and 'challenging' - too ambiguous)
 HARD = [
@@ -23,253 +56,219 @@ EASY = [
     'beginner-friendly', 'gentle', 'accessible', 'easiest'
 ]
 
-def keyword_label(text):
-    text = text.lower()
-    hard = sum(1 for w in HARD if w in text)
-    easy = sum(1 for w in EASY if w in text)
+_matchers = {}
+
+def keyword_matcher(word_boundary=False):
+    """HARD/EASY compiled into one KeywordMatcher (built on first use)"""
+    if word_boundary not in _matchers:
+        _matchers[word_boundary] = KeywordMatcher({'hard': HARD, 'easy': EASY}, word_boundary)
+    return _matchers[word_boundary]
+
+def keyword_label(text, word_boundary=False):
+    """
+    Count how many HARD and EASY keywords appear in the text (as substrings,
+    or only as whole words with word_boundary=True)
+    """
+    counts = keyword_matcher(word_boundary).counts(text)
+    hard, easy = counts['hard'], counts['easy']
     if hard > easy:
         return 'hard'
     elif easy > hard:
         return 'easy'
     return 'medium'
 
-def get_review_text(review):
-    """Combine content and workload for full context"""
-    content = review.get('content', '') or ''
-    workload = review.get('workload', '') or ''
-    return (content + " " + workload).strip()
+# Step 3: Collect all review texts for training
+def collect_training_data(data, word_boundary=False):
+    all_texts = []
+    all_labels = []
+
+    for course in data:
+        for review in course.get('reviews', []):
+            full_text = get_review_text(review)
+            if full_text and len(full_text) > 20:
+                all_texts.append(full_text)
+                all_labels.append(keyword_label(full_text, word_boundary))
+
+    return all_texts, all_labels
+
+# Step 4: Train model
+TFIDF_PARAMS = {'ngram_range': (1, 2), 'max_features': 5000}
+LOGREG_PARAMS = {'max_iter': 1000}
+
+def train_model(all_texts, all_labels):
+    from sklearn.feature_extraction.text import TfidfVectorizer
+    from sklearn.linear_model import LogisticRegression
 
-def get_time_weight(date_str, decay_years=5):
+    vectorizer = TfidfVectorizer(**TFIDF_PARAMS)
+    X = vectorizer.fit_transform(all_texts)
+
+    model = LogisticRegression(**LOGREG_PARAMS)
+    model.fit(X, all_labels)
+    return vectorizer, model, X
+
+def load_or_train_model(all_texts, all_labels, retrain=False, word_boundary=False):
     """
-    More recent reviews get higher weight.
-    Reviews from today = 1.0
-    Reviews from decay_years ago = 0.3
+    (vectorizer, model, X) saved for these texts if there is one, else train
+    and save it. X is the TF-IDF matrix of all_texts, so it can be reused
+    instead of transforming the same texts again.
     """
-    if not date_str:
-        return 0.5
-    
-    try:
-        review_date = datetime.fromisoformat(date_str.replace('Z', '+00:00'))
-        days_ago = (datetime.now() - review_date.replace(tzinfo=None)).days
-        years_ago = days_ago / 365
-        
-        if years_ago <= 0:
-            return 1.0
-        elif years_ago >= decay_years:
-            return 0.3
-        else:
-            return 1.0 - (years_ago / decay_years) * 0.7
-    except:
-        return 0.5
-
-# Step 3: Collect all review texts for training
-all_texts = []
-all_labels = []
+    key = difficulty_model.fingerprint(all_texts, {
+        'tfidf': TFIDF_PARAMS, 'logreg': LOGREG_PARAMS, 'hard': HARD, 'easy': EASY,
+        'word_boundary': word_boundary,
+    })
+    if not retrain:
+        # the unpickle imports these anyway, keep that out of the timing
+        import sklearn.feature_extraction.text
+        import sklearn.linear_model
 
-for course in data:
-    for review in course.get('reviews', []):
-        full_text = get_review_text(review)
-        if full_text and len(full_text) > 20:
-            all_texts.append(full_text)
-            all_labels.append(keyword_label(full_text))
+        start = time.perf_counter()
+        saved = difficulty_model.load(key)
+        if saved:
+            print(f"Loaded saved difficulty model {key[:16]} ({(time.perf_counter() - start) * 1000:.0f} ms)\n")
+            return saved
 
-print(f"Training on {len(all_texts)} review texts (content + workload)")
-print(f"Distribution: {all_labels.count('hard')} hard, {all_labels.count('medium')} medium, {all_labels.count('easy')} easy\n")
+    start = time.perf_counter()
+    vectorizer, model, X = train_model(all_texts, all_labels)
+    path = difficulty_model.save(key, vectorizer, model, X)
+    print(f"Trained difficulty model in {time.perf_counter() - start:.2f}s, saved to {path}\n")
+    return vectorizer, model, X
 
-# Step 4: Train model
-vectorizer = TfidfVectorizer(ngram_range=(1, 2), max_features=5000)
-X = vectorizer.fit_transform(all_texts)
-
-model = LogisticRegression(max_iter=1000)
-model.fit(X, all_labels)
-
-# Step 5: Helper functions
-def get_weighted_difficulty_score(reviews):
-    """Get difficulty score weighted by review recency"""
-    if not reviews:
-        return None, None, []
-    
-    texts = []
-    weights = []
-    
-    for review in reviews:
-        full_text = get_review_text(review)
-        if full_text and len(full_text) > 20:
-            texts.append(full_text)
-            weights.append(get_time_weight(review.get('submission_date')))
-    
-    if not texts:
-        return None, None, []
-    
-    # Get predictions
-    X = vectorizer.transform(texts)
-    predictions = model.predict(X)
-    
-    # Convert to scores
-    label_to_score = {'easy': 0, 'medium': 1, 'hard': 2}
-    scores = [label_to_score[p] for p in predictions]
-    
-    # Weighted average
-    weighted_sum = sum(s * w for s, w in zip(scores, weights))
-    total_weight = sum(weights)
-    weighted_avg = weighted_sum / total_weight if total_weight > 0 else None
-    
-    # Hard percentage (also weighted)
-    hard_weighted = sum(w for s, w in zip(scores, weights) if s == 2)
-    hard_pct = (hard_weighted / total_weight * 100) if total_weight > 0 else None
-    
-    return weighted_avg, hard_pct, scores
-
-def get_weighted_rating(reviews):
-    """Get rating weighted by review recency"""
-    ratings = []
-    weights = []
-    
-    for review in reviews:
-        r = review.get('rating')
-        if r:
-            ratings.append(r)
-            weights.append(get_time_weight(review.get('submission_date')))
-    
-    if not ratings:
-        return None, None
-    
-    # Weighted average
-    weighted_sum = sum(r * w for r, w in zip(ratings, weights))
-    total_weight = sum(weights)
-    weighted_avg = weighted_sum / total_weight if total_weight > 0 else None
-    
-    # Regular average for comparison
-    raw_avg = sum(ratings) / len(ratings)
-    
-    return weighted_avg, raw_avg
-
-def bayesian_average(value, n, C, m):
-    """Bayesian average - accounts for sample size"""
-    if value is None:
-        return None
-    return (n * value + C * m) / (n + C)
-
-# Step 6: Calculate global means
-all_ratings = []
-for prof in data:
-    for review in prof.get('reviews', []):
-        r = review.get('rating')
-        if r:
-            all_ratings.append(r)
-
-global_mean_rating = sum(all_ratings) / len(all_ratings)
-global_mean_difficulty = 1.0  # Medium
-
-# Tuning parameters
-C_RATING = 20
-C_DIFFICULTY = 10
+# Step 5: Rank (see ranking_engine.py)
 MIN_REVIEWS_RATING = 10
 MIN_REVIEWS_DIFFICULTY = 7
 
-print(f"Global mean rating: {global_mean_rating:.2f}")
-print(f"Global mean difficulty: {global_mean_difficulty:.2f}")
-print(f"C_RATING={C_RATING}, C_DIFFICULTY={C_DIFFICULTY}")
-print(f"MIN_REVIEWS_RATING={MIN_REVIEWS_RATING}, MIN_REVIEWS_DIFFICULTY={MIN_REVIEWS_DIFFICULTY}\n")
-
-# Step 7: Rank all professors (with time weighting)
-course_rankings = []
-
-for course_entry in data:
-    course = course_entry['course']
-    reviews = course_entry.get('reviews', [])
-    
-    # Count reviews with text
-    text_count = len([r for r in reviews if len(get_review_text(r)) > 20])
-    
-    # Get weighted difficulty
-    weighted_difficulty, hard_pct, scores = get_weighted_difficulty_score(reviews)
-    bayesian_difficulty = bayesian_average(
-        weighted_difficulty,
-        text_count,
-        C_DIFFICULTY, 
-        global_mean_difficulty
-    )
-    
-    # Get weighted rating
-    weighted_rating, raw_rating = get_weighted_rating(reviews)
-    bayesian_rating = bayesian_average(
-        weighted_rating,
-        len(reviews),
-        C_RATING,
-        global_mean_rating
-    )
-    
-    course_rankings.append({
-        'name': course['name'],
-        'course_id': course['course_id'],
-        'raw_rating': round(raw_rating, 2) if raw_rating else None,
-        'weighted_rating': round(weighted_rating, 2) if weighted_rating else None,
-        'bayesian_rating': round(bayesian_rating, 2) if bayesian_rating else None,
-        'raw_difficulty': round(sum(scores)/len(scores), 2) if scores else None,
-        'weighted_difficulty': round(weighted_difficulty, 2) if weighted_difficulty else None,
-        'bayesian_difficulty': round(bayesian_difficulty, 2) if bayesian_difficulty else None,
-        'hard_pct': round(hard_pct, 1) if hard_pct else None,
-        'review_count': len(reviews),
-        'text_count': text_count
-    })
+RANKING_FILES = {
+    'course': "course_rankings.json",
+    'professor': "professor_rankings.json",
+    'course_professor': "course_professor_rankings.json",
+}
+LABELS = {'course': "CLASSES", 'professor': "PROFESSORS", 'course_professor': "CLASS/PROFESSOR PAIRS"}
+
+def rank_courses(data, vectorizer, model, global_mean_rating, known_texts=None, known_X=None):
+    """Just the course table of rank_groups"""
+    return rank_groups(data, vectorizer, model, global_mean_rating, ('course',),
+                       known_texts, known_X)['course']
+
+def reliable_courses(course_rankings):
+    # Filter for reliable difficulty data (lower threshold)
+    reliable_difficulty = [c for c in course_rankings 
+                           if c['bayesian_difficulty'] is not None 
+                           and c['text_count'] >= MIN_REVIEWS_DIFFICULTY]
+
+    # Filter for reliable rating data (higher threshold)
+    reliable_rating = [c for c in course_rankings 
+                       if c['bayesian_rating'] is not None
+                       and c['review_count'] >= MIN_REVIEWS_RATING]
+
+    return reliable_difficulty, reliable_rating
+
+# Step 6: Print rankings
+def print_rankings(reliable_difficulty, reliable_rating, label=LABELS['course']):
+    print("=" * 110)
+    print(f"🔥 HARDEST {label} (min {MIN_REVIEWS_DIFFICULTY} reviews, time-weighted)")
+    print("=" * 110)
+    hardest = top_k(reliable_difficulty, 'bayesian_difficulty', 15)
+    for i, p in enumerate(hardest, 1):
+        hard_pct = p['hard_pct'] if p['hard_pct'] is not None else 0
+        raw_diff = p['raw_difficulty'] if p['raw_difficulty'] is not None else 0
+        weighted_diff = p['weighted_difficulty'] if p['weighted_difficulty'] is not None else 0
+        print(f"{i:2}. {p['name']:<25} Bayesian: {p['bayesian_difficulty']:.2f}  |  Weighted: {weighted_diff:.2f}  |  Raw: {raw_diff:.2f}  |  {hard_pct:.0f}% hard  |  {p['text_count']} reviews")
+
+    print("\n" + "=" * 110)
+    print(f"😌 EASIEST {label} (min {MIN_REVIEWS_DIFFICULTY} reviews, time-weighted)")
+    print("=" * 110)
+    easiest = top_k(reliable_difficulty, 'bayesian_difficulty', 15, 'asc')
+    for i, p in enumerate(easiest, 1):
+        hard_pct = p['hard_pct'] if p['hard_pct'] is not None else 0
+        raw_diff = p['raw_difficulty'] if p['raw_difficulty'] is not None else 0
+        weighted_diff = p['weighted_difficulty'] if p['weighted_difficulty'] is not None else 0
+        print(f"{i:2}. {p['name']:<25} Bayesian: {p['bayesian_difficulty']:.2f}  |  Weighted: {weighted_diff:.2f}  |  Raw: {raw_diff:.2f}  |  {hard_pct:.0f}% hard  |  {p['text_count']} reviews")
+
+    print("\n" + "=" * 110)
+    print(f"⭐ BEST RATED {label} (min {MIN_REVIEWS_RATING} reviews, Bayesian, time-weighted)")
+    print("=" * 110)
+    best_rated = top_k(reliable_rating, 'bayesian_rating', 15)
+    for i, p in enumerate(best_rated, 1):
+        diff = f"{p['bayesian_difficulty']:.2f}" if p['bayesian_difficulty'] is not None else "N/A"
+        raw = p['raw_rating'] if p['raw_rating'] is not None else 0
+        weighted = p['weighted_rating'] if p['weighted_rating'] is not None else 0
+        print(f"{i:2}. {p['name']:<25} Bayesian: {p['bayesian_rating']:.2f}  |  Weighted: {weighted:.2f}  |  Raw: {raw:.2f}  |  Difficulty: {diff}  |  {p['review_count']} reviews")
+
+    print("\n" + "=" * 110)
+    print(f"👎 WORST RATED {label} (min {MIN_REVIEWS_RATING} reviews, Bayesian, time-weighted)")
+    print("=" * 110)
+    worst_rated = top_k(reliable_rating, 'bayesian_rating', 15, 'asc')
+    for i, p in enumerate(worst_rated, 1):
+        diff = f"{p['bayesian_difficulty']:.2f}" if p['bayesian_difficulty'] is not None else "N/A"
+        raw = p['raw_rating'] if p['raw_rating'] is not None else 0
+        weighted = p['weighted_rating'] if p['weighted_rating'] is not None else 0
+        print(f"{i:2}. {p['name']:<25} Bayesian: {p['bayesian_rating']:.2f}  |  Weighted: {weighted:.2f}  |  Raw: {raw:.2f}  |  Difficulty: {diff}  |  {p['review_count']} reviews")
+
+# Step 7: Save rankings
+def save_rankings(course_rankings, path=RANKING_FILES['course']):
+    with open(path, "w") as f:
+        json.dump(course_rankings, f, indent=4)
+
+
+def output_paths(source, output_dir, groupings):
+    """{grouping: path} for every table, prefixed with the source's name"""
+    stem = os.path.splitext(os.path.basename(os.path.normpath(source)))[0]
+    return {g: os.path.join(output_dir, f"{stem}_{RANKING_FILES[g]}") for g in groupings}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Rank courses and professors by difficulty and rating")
+    parser.add_argument("source", nargs="?", default=DEFAULT_SOURCE,
+                        help="a JSON dump, a review_store .sqlite file or a review_snapshot dir")
+    parser.add_argument("--kind", choices=["course", "professor"], default="course",
+                        help="whether the source lists courses or professors")
+    parser.add_argument("--print", dest="show", choices=GROUPINGS, default=None,
+                        help="which ranking table to print (default: same as --kind)")
+    parser.add_argument("--word-boundary", action="store_true",
+                        help="only count HARD/EASY keywords that appear as whole words")
+    parser.add_argument("--retrain", action="store_true",
+                        help="fit the difficulty model even if a saved one matches")
+    parser.add_argument("--output-dir", default=None,
+                        help="save all three tables here, named after the source "
+                             "(default: only the printed table, to its RANKING_FILES name)")
+    args = parser.parse_args(argv)
+    show = args.show or args.kind
+
+    # JSON dumps are streamed entry by entry on every pass instead of loaded whole
+    data = review_store.stream_entries(args.source, args.kind)
+
+    all_texts, all_labels = collect_training_data(data, args.word_boundary)
+    print(f"Training on {len(all_texts)} review texts (content + workload)")
+    print(f"Distribution: {all_labels.count('hard')} hard, {all_labels.count('medium')} medium, {all_labels.count('easy')} easy\n")
+    vectorizer, model, X = load_or_train_model(all_texts, all_labels, args.retrain, args.word_boundary)
+
+    global_mean_rating = get_global_mean_rating(data)
+    print(f"Global mean rating: {global_mean_rating:.2f}")
+    print(f"Global mean difficulty: {GLOBAL_MEAN_DIFFICULTY:.2f}")
+    print(f"C_RATING={C_RATING}, C_DIFFICULTY={C_DIFFICULTY}")
+    print(f"MIN_REVIEWS_RATING={MIN_REVIEWS_RATING}, MIN_REVIEWS_DIFFICULTY={MIN_REVIEWS_DIFFICULTY}\n")
+
+    start = time.perf_counter()
+    tables = rank_groups(data, vectorizer, model, global_mean_rating, GROUPINGS, all_texts, X)
+    sizes = ", ".join(f"{len(tables[g])} {g.replace('_', '/')}" for g in GROUPINGS)
+    print(f"Ranked {sizes} groups in {time.perf_counter() - start:.2f}s\n")
+
+    reliable_difficulty, reliable_rating = reliable_courses(tables[show])
+    print_rankings(reliable_difficulty, reliable_rating, LABELS[show])
+    if args.output_dir:
+        os.makedirs(args.output_dir, exist_ok=True)
+        paths = output_paths(args.source, args.output_dir, GROUPINGS)
+    else:
+        paths = {show: RANKING_FILES[show]}
+    for grouping, path in paths.items():
+        save_rankings(tables[grouping], path)
+
+    print(f"\n✅ Saved {len(tables[show])} {show.replace('_', '/')} rankings to {paths[show]}")
+    print(f"   With reliable difficulty data (>={MIN_REVIEWS_DIFFICULTY} reviews): {len(reliable_difficulty)}")
+    print(f"   With reliable rating data (>={MIN_REVIEWS_RATING} reviews): {len(reliable_rating)}")
+    others = [path for grouping, path in paths.items() if grouping != show]
+    if others:
+        print(f"   Also saved {', '.join(others)}")
 
-# Step 8: Print rankings
-
-# Filter for reliable difficulty data (lower threshold)
-reliable_difficulty = [c for c in course_rankings 
-                       if c['bayesian_difficulty'] is not None 
-                       and c['text_count'] >= MIN_REVIEWS_DIFFICULTY]
-
-# Filter for reliable rating data (higher threshold)
-reliable_rating = [c for c in course_rankings 
-                   if c['bayesian_rating'] is not None
-                   and c['review_count'] >= MIN_REVIEWS_RATING]
-
-print("=" * 110)
-print(f"🔥 HARDEST CLASSES (min {MIN_REVIEWS_DIFFICULTY} reviews, time-weighted)")
-print("=" * 110)
-hardest = sorted(reliable_difficulty, key=lambda x: x['bayesian_difficulty'], reverse=True)[:15]
-for i, p in enumerate(hardest, 1):
-    hard_pct = p['hard_pct'] if p['hard_pct'] is not None else 0
-    raw_diff = p['raw_difficulty'] if p['raw_difficulty'] is not None else 0
-    weighted_diff = p['weighted_difficulty'] if p['weighted_difficulty'] is not None else 0
-    print(f"{i:2}. {p['name']:<25} Bayesian: {p['bayesian_difficulty']:.2f}  |  Weighted: {weighted_diff:.2f}  |  Raw: {raw_diff:.2f}  |  {hard_pct:.0f}% hard  |  {p['text_count']} reviews")
-
-print("\n" + "=" * 110)
-print(f"😌 EASIEST CLASSES (min {MIN_REVIEWS_DIFFICULTY} reviews, time-weighted)")
-print("=" * 110)
-easiest = sorted(reliable_difficulty, key=lambda x: x['bayesian_difficulty'])[:15]
-for i, p in enumerate(easiest, 1):
-    hard_pct = p['hard_pct'] if p['hard_pct'] is not None else 0
-    raw_diff = p['raw_difficulty'] if p['raw_difficulty'] is not None else 0
-    weighted_diff = p['weighted_difficulty'] if p['weighted_difficulty'] is not None else 0
-    print(f"{i:2}. {p['name']:<25} Bayesian: {p['bayesian_difficulty']:.2f}  |  Weighted: {weighted_diff:.2f}  |  Raw: {raw_diff:.2f}  |  {hard_pct:.0f}% hard  |  {p['text_count']} reviews")
-
-print("\n" + "=" * 110)
-print(f"⭐ BEST RATED CLASSES (min {MIN_REVIEWS_RATING} reviews, Bayesian, time-weighted)")
-print("=" * 110)
-best_rated = sorted(reliable_rating, key=lambda x: x['bayesian_rating'], reverse=True)[:15]
-for i, p in enumerate(best_rated, 1):
-    diff = f"{p['bayesian_difficulty']:.2f}" if p['bayesian_difficulty'] is not None else "N/A"
-    raw = p['raw_rating'] if p['raw_rating'] is not None else 0
-    weighted = p['weighted_rating'] if p['weighted_rating'] is not None else 0
-    print(f"{i:2}. {p['name']:<25} Bayesian: {p['bayesian_rating']:.2f}  |  Weighted: {weighted:.2f}  |  Raw: {raw:.2f}  |  Difficulty: {diff}  |  {p['review_count']} reviews")
-
-print("\n" + "=" * 110)
-print(f"👎 WORST RATED CLASSES (min {MIN_REVIEWS_RATING} reviews, Bayesian, time-weighted)")
-print("=" * 110)
-worst_rated = sorted(reliable_rating, key=lambda x: x['bayesian_rating'])[:15]
-for i, p in enumerate(worst_rated, 1):
-    diff = f"{p['bayesian_difficulty']:.2f}" if p['bayesian_difficulty'] is not None else "N/A"
-    raw = p['raw_rating'] if p['raw_rating'] is not None else 0
-    weighted = p['weighted_rating'] if p['weighted_rating'] is not None else 0
-    print(f"{i:2}. {p['name']:<25} Bayesian: {p['bayesian_rating']:.2f}  |  Weighted: {weighted:.2f}  |  Raw: {raw:.2f}  |  Difficulty: {diff}  |  {p['review_count']} reviews")
-
-# Step 9: Save rankings
-with open("course_rankings.json", "w") as f:
-    json.dump(course_rankings, f, indent=4)
-
-print(f"\n✅ Saved {len(course_rankings)} course rankings to course_rankings.json")
-print(f"   Courses with reliable difficulty data (>={MIN_REVIEWS_DIFFICULTY} reviews): {len(reliable_difficulty)}")
-print(f"   Courses with reliable rating data (>={MIN_REVIEWS_RATING} reviews): {len(reliable_rating)}")
\ No newline at end of file
+if __name__ == "__main__":
+    main()
@@ -15,10 +15,14 @@ Add missing courses to cs_course_reviews.json by their CULPA course IDs
 Add missing courses to cs_course_reviews.json by their CULPA course IDs
 '''
 
-import requests
 import json
+import os
+import sys
 import time
 
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import culpa_client
+
 # Courses with CULPA IDs (found manually)
 MISSING_COURSES = [
     (8756, "COMS E6184", "Anonymity & Privacy"),
@@ -36,10 +40,10 @@ def scrape_course_reviews(course_id, expected_code, expected_name):
     seen_ids = set()
     course_info = None
     
-    url = f"https://culpa.info/api/review/course/{course_id}"
+    url = f"{culpa_client.BASE_URL}/review/course/{course_id}"
     params = {'page': 1, 'sort_key': 'null', 'professor_filter': 'null'}
     
-    response = requests.get(url, params=params)
+    response = culpa_client.get(url, params=params)
     
     if response.status_code != 200:
         return None, []
@@ -73,7 +77,7 @@ def scrape_course_reviews(course_id, expected_code, expected_name):
         
         page += 1
         time.sleep(0.3)
-        response = requests.get(url, params={'page': page, 'sort_key': 'null', 'professor_filter': 'null'})
+        response = culpa_client.get(url, params={'page': page, 'sort_key': 'null', 'professor_filter': 'null'})
         
         if response.status_code != 200:
             break
@@ -134,6 +138,7 @@ def add_missing_courses():
     print(f"   Total courses: {len(all_courses)}")
     print(f"   Added: {added}")
     print(f"   Skipped (duplicates): {skipped}")
+    culpa_client.print_stats()
     print(f"{'='*60}")
 
 if __name__ == "__main__":
@@ -0,0 +1,87 @@
+'''
+Index over the CULPA course entries for matching them against SIS courses.
+
+filter_2026.py used to rescan every CULPA entry (re-running the course-code
+regex on each) for every SIS course, and re-normalize the same names inside
+its topic x candidate loops. CourseIndex does that work once per dataset:
+
+  - by_code:  4-digit course number -> candidate entries, in dataset order
+  - names:    normalized name of every entry
+
+after which matching one SIS course is a dict lookup plus string checks
+over its (usually one or two) candidates. Nothing in here is specific to a
+term, so the same index serves Spring 2026, Fall, or any other SIS listing.
+Matching by name across course numbers is course_matcher.py's job.
+'''
+
+import re
+
+_CODE = re.compile(r'(\d{4})')
+_NON_ALNUM = re.compile(r'[^a-z0-9]')
+
+
+def normalize_course_code(code):
+    """Extract just the 4-digit course number"""
+    if not code:
+        return ''
+    match = _CODE.search(code)
+    return match.group(1) if match else ''
+
+
+def normalize_name(name):
+    """Normalize course name for matching"""
+    if not name:
+        return ''
+    return _NON_ALNUM.sub('', name.lower())
+
+
+class CourseIndex:
+    def __init__(self, entries):
+        self.entries = list(entries)
+        self.by_code = {}
+        self.names = []
+        for position, entry in enumerate(self.entries):
+            course = entry.get('course', {})
+            code = normalize_course_code(course.get('course_code', ''))
+            self.by_code.setdefault(code, []).append(position)
+            name = normalize_name(course.get('name', ''))
+            self.names.append(name)
+
+    def __len__(self):
+        return len(self.entries)
+
+    def candidates(self, codes):
+        """Positions of entries with any of these course numbers, in dataset order"""
+        if len(codes) == 1:
+            return self.by_code.get(codes[0], [])
+        return sorted(p for code in set(codes) for p in self.by_code.get(code, []))
+
+    def match(self, codes, name='', topics=()):
+        """
+        Best entry for a SIS course with these course numbers, or None:
+        the only candidate, else an exact name match, else a topic contained
+        in (or containing) a candidate name, else a partial name match, else
+        the candidate with the most reviews.
+        """
+        positions = self.candidates(codes)
+        if not positions:
+            return None
+        if len(positions) == 1:
+            return self.entries[positions[0]]
+
+        name = normalize_name(name)
+        for p in positions:
+            if self.names[p] == name:
+                return self.entries[p]
+
+        for topic in topics:
+            topic = normalize_name(topic)
+            for p in positions:
+                if topic in self.names[p] or self.names[p] in topic:
+                    return self.entries[p]
+
+        for p in positions:
+            if name in self.names[p] or self.names[p] in name:
+                return self.entries[p]
+
+        return max((self.entries[p] for p in positions), key=lambda x: len(x.get('reviews', [])))
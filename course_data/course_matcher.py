@@ -0,0 +1,173 @@
+'''
+Fuzzy matching of SIS courses to CULPA course entries, with confidences.
+
+filter_2026.py only matches on the 4-digit course number (then breaks ties
+on names), so anything renumbered or listed differently needs an entry in
+MANUAL_CODE_MAPPINGS or append_missing.MISSING_COURSES. CourseMatcher
+instead scores every plausible CULPA entry and ranks them:
+
+  blocking    candidates are the entries with the same course number plus
+              the ones sharing the most name tokens with the SIS name/topics
+              (tokens are 4-letter word prefixes, so SIS abbreviations like
+              "SYSTS" or "COMPUT" still line up; very common ones are
+              ignored). Never the whole dataset.
+  scoring     name similarity is rapidfuzz token_set_ratio averaged with
+              token_sort_ratio (set alone scores "Java" 100 against "Data
+              Structures in Java"), best over the SIS name, each topic and
+              name + topic (one rapidfuzz cdist call per SIS course).
+              confidence = 0.55 * name similarity
+              + 0.35 * same course number + 0.10 * same subject (COMS, CSEE...)
+
+    matcher = CourseMatcher(entries)
+    matcher.rank("COMS W4232", "Advanced Algorithms")   # [Match(...), ...]
+
+    python course_matcher.py [--courses spring_2026_cs_courses_simple.json] [-k 3]
+'''
+
+import argparse
+import json
+import os
+import re
+import sys
+import time
+from collections import Counter
+from typing import NamedTuple
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import review_store
+
+from course_index import normalize_course_code
+
+NAME_WEIGHT = 0.55
+NUMBER_WEIGHT = 0.35
+SUBJECT_WEIGHT = 0.10
+
+MAX_CANDIDATES = 50     # name-blocked candidates scored per SIS course
+COMMON_TOKEN_SHARE = 0.05  # tokens in more than this share of names (and more than
+                           # MAX_CANDIDATES of them) don't block
+TOKEN_LENGTH = 4
+
+_SUBJECT = re.compile(r'^\s*([A-Za-z]{4})')
+_WORD = re.compile(r'[a-z0-9]+')
+STOPWORDS = {'a', 'an', 'and', 'for', 'in', 'of', 'on', 'the', 'to', 'with', 'i', 'ii', 'iii'}
+
+
+class Match(NamedTuple):
+    entry: dict
+    confidence: float
+    name_score: float
+    same_number: bool
+    same_subject: bool
+
+
+def subject(code):
+    """COMS/CSEE/... prefix of a course code, or ''"""
+    match = _SUBJECT.match(code or '')
+    return match.group(1).upper() if match else ''
+
+
+def name_tokens(text):
+    return {w[:TOKEN_LENGTH] for w in _WORD.findall((text or '').lower()) if w not in STOPWORDS}
+
+
+class CourseMatcher:
+    def __init__(self, entries, max_candidates=MAX_CANDIDATES):
+        self.entries = list(entries)
+        self.max_candidates = max_candidates
+        self.by_number = {}
+        self.subjects = []
+        self.names = []
+        postings = {}
+        for position, entry in enumerate(self.entries):
+            course = entry.get('course', {})
+            code = course.get('course_code') or ''
+            self.by_number.setdefault(normalize_course_code(code), []).append(position)
+            self.subjects.append(subject(code))
+            self.names.append(course.get('name') or '')
+            for token in name_tokens(self.names[-1]):
+                postings.setdefault(token, []).append(position)
+
+        from rapidfuzz.utils import default_process
+        self.processed = [default_process(name) for name in self.names]
+
+        limit = max(max_candidates, COMMON_TOKEN_SHARE * len(self.entries))
+        self.postings = {t: p for t, p in postings.items() if len(p) <= limit}
+
+    def candidates(self, number, queries):
+        """Positions worth scoring: same course number + best name-token overlaps"""
+        shared = Counter()
+        for token in set().union(*(name_tokens(q) for q in queries)):
+            shared.update(self.postings.get(token, ()))
+        blocked = [p for p, _ in shared.most_common(self.max_candidates)]
+        return list(dict.fromkeys(self.by_number.get(number, []) + blocked)) if number else blocked
+
+    def rank(self, course_code, name, topics=(), k=5):
+        """Up to k Matches for one SIS course, most confident first"""
+        from rapidfuzz import fuzz, process
+        from rapidfuzz.utils import default_process
+
+        number = normalize_course_code(course_code)
+        sis_subject = subject(course_code)
+        queries = [q for q in [name, *topics, *(f"{name} {t}" for t in topics)] if q]
+        positions = self.candidates(number, queries)
+        if not queries or not positions:
+            return []
+
+        # every query against every candidate in one go, best query per candidate
+        processed = [default_process(q) for q in queries]
+        names = [self.processed[p] for p in positions]
+        name_scores = ((process.cdist(processed, names, scorer=fuzz.token_set_ratio)
+                        + process.cdist(processed, names, scorer=fuzz.token_sort_ratio)) / 200).max(axis=0)
+
+        same_numbers = set(self.by_number.get(number, ())) if number else set()
+        matches = []
+        for p, name_score in zip(positions, name_scores.tolist()):
+            same_number = p in same_numbers
+            same_subject = bool(sis_subject) and self.subjects[p] == sis_subject
+            confidence = (NAME_WEIGHT * name_score + NUMBER_WEIGHT * same_number
+                          + SUBJECT_WEIGHT * same_subject)
+            matches.append(Match(self.entries[p], round(confidence, 3), round(name_score, 3),
+                                 same_number, same_subject))
+
+        matches.sort(key=lambda m: m.confidence, reverse=True)
+        return matches[:k]
+
+    def best(self, course_code, name, topics=(), min_confidence=0.0):
+        """The most confident Match if it reaches min_confidence, else None"""
+        ranked = self.rank(course_code, name, topics, k=1)
+        if ranked and ranked[0].confidence >= min_confidence:
+            return ranked[0]
+        return None
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Rank CULPA matches for every course in a SIS listing")
+    parser.add_argument("--courses", default="spring_2026_cs_courses_simple.json")
+    parser.add_argument("--reviews", default="cs_course_reviews.json",
+                        help="a JSON dump, a review_store .sqlite file or a review_snapshot dir")
+    parser.add_argument("-k", type=int, default=3)
+    args = parser.parse_args()
+
+    with open(args.courses, "r") as f:
+        term = json.load(f)
+    import rapidfuzz.process  # noqa: F401  (keep the import out of the timings)
+
+    start = time.perf_counter()
+    matcher = CourseMatcher(review_store.load_entries(args.reviews, 'course'))
+    built = time.perf_counter() - start
+
+    start = time.perf_counter()
+    results = [(c, matcher.rank(c['course_code'], c.get('name', ''), c.get('topics', []), args.k))
+               for c in term]
+    elapsed = time.perf_counter() - start
+
+    for sis_course, matches in results:
+        print(f"{sis_course['course_code']}: {sis_course.get('name', '')}")
+        for m in matches:
+            course = m.entry['course']
+            print(f"    {m.confidence:.2f}  {course.get('course_code') or '?':<11} {course.get('name')}"
+                  f"  (id {course['course_id']}, name {m.name_score:.2f}"
+                  f"{', same number' if m.same_number else ''})")
+
+    print(f"\n✅ Matched {len(term)} SIS courses against {len(matcher.entries)} CULPA courses "
+          f"in {elapsed * 1000:.1f} ms (index built in {built * 1000:.1f} ms)")
@@ -0,0 +1,97 @@
+'''
+On-disk cache for the difficulty model trained in analyze_courses.py.
+
+Fitting the TF-IDF vectorizer + LogisticRegression takes seconds and gives
+the same model every time the reviews haven't changed. So the fitted pair,
+plus the TF-IDF matrix of the training texts (the ranking reuses it instead
+of vectorizing the same texts again), is pickled to MODEL_DIR/difficulty-<fingerprint>.pkl, where the fingerprint is a
+sha256 over everything the fit depends on:
+
+  - ARTIFACT_VERSION (bump it when the artifact layout changes)
+  - the installed scikit-learn version (pickles aren't portable across it)
+  - the training parameters and the HARD/EASY keyword lists
+  - every training text, in order
+
+A run whose fingerprint matches an existing artifact just unpickles it;
+anything else retrains and saves a new one next to it. So switching between
+sources (the course dump, the professor dump, --word-boundary, ...) doesn't
+retrain every time: the MAX_ARTIFACTS most recently used artifacts are
+kept (loading one bumps its mtime) and older ones are deleted.
+'''
+
+import glob
+import hashlib
+import json
+import os
+import pickle
+from importlib import metadata
+
+ARTIFACT_VERSION = 2
+MODEL_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "models")
+MAX_ARTIFACTS = 8
+
+
+def fingerprint(texts, params):
+    """Hex digest identifying one training run. `params` must be JSON-serializable"""
+    h = hashlib.sha256()
+    header = {
+        'artifact_version': ARTIFACT_VERSION,
+        'sklearn': metadata.version("scikit-learn"),
+        'params': params,
+    }
+    h.update(json.dumps(header, sort_keys=True).encode("utf-8"))
+    for text in texts:
+        encoded = text.encode("utf-8")
+        h.update(len(encoded).to_bytes(8, "little"))  # so text boundaries count too
+        h.update(encoded)
+    return h.hexdigest()
+
+
+def artifact_path(key, model_dir=MODEL_DIR):
+    return os.path.join(model_dir, f"difficulty-{key[:16]}.pkl")
+
+
+def load(key, model_dir=MODEL_DIR):
+    """(vectorizer, model, training matrix) saved under this fingerprint, or None"""
+    path = artifact_path(key, model_dir)
+    try:
+        with open(path, "rb") as f:
+            artifact = pickle.load(f)
+    except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ImportError):
+        return None
+    if artifact.get('fingerprint') != key:
+        return None
+    try:
+        os.utime(path)  # most recently used, so pruning keeps it
+    except OSError:
+        pass
+    return artifact['vectorizer'], artifact['model'], artifact['matrix']
+
+
+def save(key, vectorizer, model, matrix, model_dir=MODEL_DIR):
+    """Write the artifact atomically, then prune down to MAX_ARTIFACTS"""
+    os.makedirs(model_dir, exist_ok=True)
+    path = artifact_path(key, model_dir)
+    tmp = path + ".tmp"
+    with open(tmp, "wb") as f:
+        pickle.dump({
+            'fingerprint': key,
+            'artifact_version': ARTIFACT_VERSION,
+            'vectorizer': vectorizer,
+            'model': model,
+            'matrix': matrix,
+        }, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp, path)
+    prune(model_dir)
+    return path
+
+
+def prune(model_dir=MODEL_DIR, keep=MAX_ARTIFACTS):
+    """Delete all but the `keep` most recently used artifacts"""
+    artifacts = glob.glob(os.path.join(model_dir, "difficulty-*.pkl"))
+    artifacts.sort(key=os.path.getmtime, reverse=True)
+    for old in artifacts[keep:]:
+        try:
+            os.remove(old)
+        except OSError:
+            pass  # another run got to it first
@@ -1,117 +1,89 @@
 '''
 Filter course reviews to only include courses offered in Spring 2026
+(or any other term: --courses takes that term's SIS listing)
+
+With --fuzzy MIN_CONFIDENCE, courses the exact matching can't find get the
+best course_matcher.py match instead, if it's at least that confident.
 '''
 
+import argparse
 import json
-import re
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import review_store
+
+from course_index import CourseIndex, normalize_course_code
 
 # Manual mappings for known mismatches (Spring 2026 code -> CULPA code)
 MANUAL_CODE_MAPPINGS = {
     '4232': '4995',  # Advanced Algorithms: W4232 in SIS, 4995 in CULPA
 }
 
-def normalize_course_code(code):
-    """Extract just the 4-digit course number"""
-    if not code:
-        return ''
-    match = re.search(r'(\d{4})', code)
-    return match.group(1) if match else ''
-
-def normalize_name(name):
-    """Normalize course name for matching"""
-    if not name:
-        return ''
-    return re.sub(r'[^a-z0-9]', '', name.lower())
-
-def filter_spring_2026_reviews():
-    # Load Spring 2026 courses
-    with open("spring_2026_cs_courses_simple.json", "r") as f:
-        spring_2026 = json.load(f)
-    
-    # Load all course reviews
-    with open("cs_course_reviews.json", "r") as f:
-        all_reviews = json.load(f)
-    
-    print(f"Spring 2026 courses: {len(spring_2026)}")
-    print(f"Total courses in CULPA dataset: {len(all_reviews)}")
-    
+def filter_term_reviews(term_courses, reviews_source="cs_course_reviews.json",
+                        output="spring_2026_course_reviews.json", index=None,
+                        fuzzy=None):
+    """
+    Keep the CULPA entries for the courses in a SIS listing (term_courses, e.g.
+    spring_2026_cs_courses_simple.json). reviews_source can be a JSON dump or a
+    review_store .sqlite file; pass a prebuilt CourseIndex to reuse it across terms.
+    fuzzy is a minimum confidence for falling back to CourseMatcher (None = off).
+    """
+    with open(term_courses, "r") as f:
+        term = json.load(f)
+
+    if index is None:
+        index = CourseIndex(review_store.load_entries(reviews_source, 'course'))
+
+    print(f"Term courses ({os.path.basename(term_courses)}): {len(term)}")
+    print(f"Total courses in CULPA dataset: {len(index)}")
+
+    matcher = None
+    if fuzzy is not None:
+        from course_matcher import CourseMatcher
+        matcher = CourseMatcher(index.entries)
+
     filtered_reviews = []
     matched = []
+    fuzzy_matched = []
     not_found = []
-    
-    for spring_course in spring_2026:
-        spring_code = normalize_course_code(spring_course['course_code'])
-        spring_name = spring_course.get('name', '')
-        spring_topics = spring_course.get('topics', [])
-        
-        if not spring_code:
+
+    for term_course in term:
+        code = normalize_course_code(term_course['course_code'])
+        if not code:
             continue
-        
+
         # Check if there's a manual mapping
-        search_codes = [spring_code]
-        if spring_code in MANUAL_CODE_MAPPINGS:
-            search_codes.append(MANUAL_CODE_MAPPINGS[spring_code])
-        
-        # Find all CULPA courses with matching course number(s)
-        candidates = []
-        for course_entry in all_reviews:
-            culpa_course = course_entry.get('course', {})
-            culpa_code = normalize_course_code(culpa_course.get('course_code', ''))
-            
-            if culpa_code in search_codes:
-                candidates.append(course_entry)
-        
-        # No matches found
-        if not candidates:
-            not_found.append(spring_course)
-            continue
-        
-        # Single match — use it
-        if len(candidates) == 1:
-            filtered_reviews.append(candidates[0])
-            matched.append((spring_course, candidates[0]))
+        search_codes = [code]
+        if code in MANUAL_CODE_MAPPINGS:
+            search_codes.append(MANUAL_CODE_MAPPINGS[code])
+
+        best_match = index.match(search_codes, term_course.get('name', ''),
+                                 term_course.get('topics', []))
+        if best_match is None and matcher is not None:
+            fuzzy_match = matcher.best(term_course['course_code'], term_course.get('name', ''),
+                                       term_course.get('topics', []), min_confidence=fuzzy)
+            if fuzzy_match is not None and fuzzy_match.entry not in filtered_reviews:
+                best_match = fuzzy_match.entry
+                fuzzy_matched.append((term_course, fuzzy_match))
+        if best_match is None:
+            not_found.append(term_course)
             continue
-        
-        # Multiple matches — try to match on name
-        best_match = None
-        
-        # First try exact name match
-        for candidate in candidates:
-            culpa_name = candidate.get('course', {}).get('name', '')
-            if normalize_name(culpa_name) == normalize_name(spring_name):
-                best_match = candidate
-                break
-        
-        # Try matching on topics (for W4995/E6998)
-        if not best_match and spring_topics:
-            for topic in spring_topics:
-                for candidate in candidates:
-                    culpa_name = candidate.get('course', {}).get('name', '')
-                    if normalize_name(topic) in normalize_name(culpa_name) or \
-                       normalize_name(culpa_name) in normalize_name(topic):
-                        best_match = candidate
-                        break
-                if best_match:
-                    break
-        
-        # Try partial name match
-        if not best_match:
-            for candidate in candidates:
-                culpa_name = candidate.get('course', {}).get('name', '')
-                if normalize_name(spring_name) in normalize_name(culpa_name) or \
-                   normalize_name(culpa_name) in normalize_name(spring_name):
-                    best_match = candidate
-                    break
-        
-        # Still no match — take the one with most reviews
-        if not best_match:
-            best_match = max(candidates, key=lambda x: len(x.get('reviews', [])))
-        
+
         filtered_reviews.append(best_match)
-        matched.append((spring_course, best_match))
-    
+        matched.append((term_course, best_match))
+
     print(f"\nMatched: {len(matched)}")
     print(f"Not found: {len(not_found)}")
+
+    if fuzzy_matched:
+        print(f"\n🔎 FUZZY MATCHES ({len(fuzzy_matched)}):")
+        for course, match in fuzzy_matched:
+            culpa = match.entry['course']
+            print(f"  - {course.get('course_code')}: {course.get('name')}")
+            print(f"      -> {culpa.get('course_code')}: {culpa.get('name')} "
+                  f"(confidence {match.confidence:.2f})")
     
     if not_found:
         print(f"\n❌ NOT IN CULPA DATASET ({len(not_found)}):")
@@ -123,19 +95,33 @@ def filter_spring_2026_reviews():
             print(f"      Instructor(s): {instructors}")
     
     # Save filtered reviews
-    with open("spring_2026_course_reviews.json", "w") as f:
+    with open(output, "w") as f:
         json.dump(filtered_reviews, f, indent=4)
     
     total_reviews = sum(len(c.get('reviews', [])) for c in filtered_reviews)
     
     print(f"\n{'='*60}")
-    print(f"✅ Saved spring_2026_course_reviews.json")
+    print(f"✅ Saved {output}")
     print(f"   Courses: {len(filtered_reviews)}")
     print(f"   Total reviews: {total_reviews}")
     print(f"{'='*60}")
     
     return filtered_reviews
 
+def filter_spring_2026_reviews(reviews_source="cs_course_reviews.json"):
+    """reviews_source can be a JSON dump, a review_store .sqlite file or a snapshot"""
+    return filter_term_reviews("spring_2026_cs_courses_simple.json", reviews_source,
+                               "spring_2026_course_reviews.json")
+
 
 if __name__ == "__main__":
-    filter_spring_2026_reviews()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Keep the reviews of courses offered in a term")
+    parser.add_argument("reviews_source", nargs="?", default="cs_course_reviews.json",
+                        help="a JSON dump, a review_store .sqlite file or a review_snapshot dir")
+    parser.add_argument("--courses", default="spring_2026_cs_courses_simple.json",
+                        help="the term's SIS course listing")
+    parser.add_argument("--output", default="spring_2026_course_reviews.json")
+    parser.add_argument("--fuzzy", type=float, metavar="MIN_CONFIDENCE",
+                        help="fuzzy-match courses the exact matching misses (e.g. 0.65)")
+    args = parser.parse_args()
+    filter_term_reviews(args.courses, args.reviews_source, args.output, fuzzy=args.fuzzy)
\ No newline at end of file
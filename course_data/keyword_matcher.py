@@ -0,0 +1,104 @@
+'''
+Count keyword hits from several keyword lists in one scan of the text.
+
+keyword_label() in analyze_courses.py used to run `w in text` for each of
+the ~45 HARD/EASY keywords, i.e. 45 scans of every review. KeywordMatcher
+builds an Aho-Corasick automaton over all the keywords once (pyahocorasick,
+`pip install pyahocorasick`) and finds every occurrence of every keyword,
+overlapping ones included, in a single pass. So the set of keywords found is
+exactly what the `w in text` loop finds.
+
+With word_boundary=True keywords only count as whole words ("hell" no
+longer matches "shell"), same as a \bkeyword\b regex.
+
+Without pyahocorasick it falls back to plain `w in text` (CPython's substring
+search beats a pure-Python or `re` multi-pattern scan at review sizes), and
+for word boundaries to one combined \b(...)\b regex.
+'''
+
+import re
+
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
+_WORD_CHAR = re.compile(r'\w')
+
+
+class KeywordMatcher:
+    def __init__(self, groups, word_boundary=False):
+        """`groups` maps a name to its keyword list, e.g. {'hard': HARD, 'easy': EASY}"""
+        self.word_boundary = word_boundary
+        self.groups = list(groups)
+        # keyword -> {group: how many times it's listed there}
+        self.weights = {}
+        for name, keywords in groups.items():
+            for keyword in keywords:
+                counts = self.weights.setdefault(keyword.lower(), {})
+                counts[name] = counts.get(name, 0) + 1
+        self.keywords = sorted(self.weights, key=len, reverse=True)
+
+        self.automaton = None
+        if ahocorasick is not None:
+            self.automaton = ahocorasick.Automaton()
+            for keyword in self.keywords:
+                self.automaton.add_word(keyword, keyword)
+            self.automaton.make_automaton()
+        elif word_boundary:
+            alternation = '|'.join(re.escape(k) for k in self.keywords)
+            self.pattern = re.compile(rf'\b(?:{alternation})\b')
+            self.single = {k: re.compile(rf'\b{re.escape(k)}\b') for k in self.keywords}
+            # keywords that could overlap a match (and so be skipped by finditer)
+            self.overlapping = {
+                k: [other for other in self.keywords if other != k and _can_overlap(k, other)]
+                for k in self.keywords
+            }
+
+    @property
+    def implementation(self):
+        if self.automaton is not None:
+            return "aho-corasick"
+        return "regex" if self.word_boundary else "substring loop"
+
+    def matches(self, text):
+        """Set of keywords found in `text` (case-insensitive)"""
+        text = text.lower()
+        if self.automaton is not None:
+            if not self.word_boundary:
+                return {keyword for _, keyword in self.automaton.iter(text)}
+            return {keyword for end, keyword in self.automaton.iter(text)
+                    if _is_whole_word(text, end - len(keyword) + 1, end + 1)}
+
+        if not self.word_boundary:
+            return {keyword for keyword in self.keywords if keyword in text}
+        found = {m.group() for m in self.pattern.finditer(text)}
+        for keyword in list(found):
+            for other in self.overlapping[keyword]:
+                if other not in found and self.single[other].search(text):
+                    found.add(other)
+        return found
+
+    def counts(self, text):
+        """{group: number of that group's keywords found in `text`}"""
+        totals = dict.fromkeys(self.groups, 0)
+        for keyword in self.matches(text):
+            for name, count in self.weights[keyword].items():
+                totals[name] += count
+        return totals
+
+
+def _is_whole_word(text, start, end):
+    """Same test as \\b on both sides of text[start:end]"""
+    word_start = bool(_WORD_CHAR.match(text[start]))
+    word_end = bool(_WORD_CHAR.match(text[end - 1]))
+    before = start > 0 and bool(_WORD_CHAR.match(text[start - 1]))
+    after = end < len(text) and bool(_WORD_CHAR.match(text[end]))
+    return before != word_start and after != word_end
+
+
+def _can_overlap(a, b):
+    """True if an occurrence of b can share characters with one of a"""
+    if b in a or a in b:
+        return True
+    return any(a.endswith(b[:i]) or b.endswith(a[:i]) for i in range(1, min(len(a), len(b))))
@@ -6,17 +6,25 @@ API endpoints:
 - https://culpa.info/api/review/course/{course_id} - reviews for a specific course
 '''
 
-import requests
+import argparse
 import json
+import os
+import sys
 import time
 
-BASE_URL = "https://culpa.info/api"
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import culpa_client
+from crawl_journal import CrawlJournal
+from incremental import take_until_mark
+from review_index import ReviewIndex
+
+BASE_URL = culpa_client.BASE_URL
 CS_DEPARTMENT_ID = 7  # COMS department ID
 
 def get_cs_courses():
     """Get all courses in the CS department"""
     print("Fetching CS department courses...")
-    response = requests.get(f"{BASE_URL}/departments/{CS_DEPARTMENT_ID}/courses")
+    response = culpa_client.get(f"{BASE_URL}/departments/{CS_DEPARTMENT_ID}/courses")
     
     if response.status_code != 200:
         print(f"Error fetching courses: {response.status_code}")
@@ -26,14 +34,16 @@ def get_cs_courses():
     print(f"Found {len(courses)} CS courses")
     return courses
 
-def scrape_course_reviews(course_id):
-    """Scrape all reviews for a single course"""
-    all_reviews = []
-    seen_ids = set()
-    page = 1
+def scrape_course_reviews(course_id, journal=None, mark=None):
+    """
+    Scrape all reviews for a single course (checkpointing pages to `journal` if given).
+    With a high-water `mark` (see incremental.py) stop at the first known review.
+    """
+    page, all_reviews = journal.resume_point(course_id) if journal else (1, [])
+    seen_ids = {review.get('review_id') for review in all_reviews}
     
     while True:
-        response = requests.get(
+        response = culpa_client.get(
             f"{BASE_URL}/review/course/{course_id}",
             params={'page': page, 'sort_key': 'null', 'professor_filter': 'null'}
         )
@@ -47,20 +57,41 @@ def scrape_course_reviews(course_id):
         if not reviews:
             break
         
+        reviews, caught_up = take_until_mark(reviews, mark)
+        
         # Add unique reviews
+        new_reviews = []
         for review in reviews:
             review_id = review.get('review_id')
             if review_id and review_id not in seen_ids:
-                all_reviews.append(review)
+                new_reviews.append(review)
                 seen_ids.add(review_id)
+        all_reviews.extend(new_reviews)
+        
+        if journal:
+            journal.record_page(course_id, page, new_reviews)
+        
+        if caught_up:
+            break
         
         page += 1
         time.sleep(0.3)
     
+    if journal:
+        journal.record_done(course_id)
+    
     return all_reviews
 
-def scrape_cs_course_reviews():
-    """Scrape reviews for all CS courses"""
+def scrape_cs_course_reviews(resume=False, incremental=False, known=()):
+    """
+    Scrape reviews for all CS courses. Every page is checkpointed to
+    cs_course_reviews_journal.jsonl; with resume=True finished courses are
+    skipped and the rest continue where they stopped. With incremental=True
+    only reviews newer than what cs_course_reviews.json already has are
+    fetched, and merged into it. `known` are other dumps (e.g. ../cs_reviews.json)
+    whose reviews get filled in under their courses; only cs_course_reviews.json's
+    own listings decide where paging stops (see review_index.py).
+    """
     # Get CS courses
     courses = get_cs_courses()
     
@@ -70,6 +101,13 @@ def scrape_cs_course_reviews():
     
     print(f"\nStarting to scrape reviews for {len(courses)} CS courses...\n")
     
+    index, marks = None, {}
+    if incremental:
+        index = ReviewIndex.from_dumps("cs_course_reviews.json", *known)
+        marks = index.high_water_marks('course')
+        print(f"Incremental mode: {len(marks)} courses already have reviews stored\n")
+    
+    journal = CrawlJournal("cs_course_reviews_journal.jsonl", resume=resume)
     all_data = []
     total_reviews = 0
     
@@ -80,7 +118,12 @@ def scrape_cs_course_reviews():
         
         print(f"[{i}/{len(courses)}] {course_code} - {course_name} - ID: {course_id}")
         
-        reviews = scrape_course_reviews(course_id)
+        if journal.is_done(course_id):
+            reviews = journal.resume_point(course_id)[1]
+            print(f"  ⏭️  Already scraped")
+        else:
+            reviews = scrape_course_reviews(course_id, journal, mark=marks.get(course_id))
+            time.sleep(0.5)  # Be nice to the server
         
         if reviews:
             print(f"  ✓ Found {len(reviews)} reviews")
@@ -92,14 +135,14 @@ def scrape_cs_course_reviews():
             total_reviews += len(reviews)
         else:
             print(f"  ✗ No reviews")
-        
-        # Save progress every 10 courses
-        if i % 10 == 0:
-            with open("cs_course_reviews_progress.json", "w") as f:
-                json.dump(all_data, f, indent=4)
-            print(f"  💾 Progress saved ({i}/{len(courses)}, {total_reviews} reviews so far)\n")
-        
-        time.sleep(0.5)  # Be nice to the server
+    
+    journal.close()
+    
+    if incremental:
+        new_reviews = index.add_entries(all_data)
+        all_data = index.entries('course')
+        total_reviews = sum(item['review_count'] for item in all_data)
+        print(f"  ➕ {new_reviews} new reviews merged")
     
     # Final save
     with open("cs_course_reviews.json", "w") as f:
@@ -110,7 +153,17 @@ def scrape_cs_course_reviews():
     print(f"   Courses with reviews: {len(all_data)}")
     print(f"   Total reviews scraped: {total_reviews}")
     print(f"   Saved to: cs_course_reviews.json")
+    culpa_client.print_stats()
     print(f"{'='*60}")
 
 if __name__ == "__main__":
-    scrape_cs_course_reviews()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Scrape CULPA reviews for every CS course")
+    parser.add_argument("--resume", action="store_true",
+                        help="continue from cs_course_reviews_journal.jsonl instead of starting over")
+    parser.add_argument("--incremental", action="store_true",
+                        help="only fetch reviews newer than the ones already in cs_course_reviews.json")
+    parser.add_argument("--known", nargs="*", default=[],
+                        help="with --incremental, other dumps whose reviews are already known "
+                             "(e.g. ../cs_reviews.json)")
+    args = parser.parse_args()
+    scrape_cs_course_reviews(resume=args.resume, incremental=args.incremental, known=args.known)
\ No newline at end of file
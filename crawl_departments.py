@@ -0,0 +1,240 @@
+'''
+University-wide crawl: every department listed by /api/departments/all,
+instead of just COMS (CS_DEPARTMENT_ID = 7 in scrape_professors.py and
+course_data/scrape_courses.py).
+
+Each department's professors and courses are crawled with async_crawler,
+with every department sharing:
+- one bounded pool: at most --concurrency professors/courses in flight
+  overall, and at most --department-workers departments open at once (each
+  keeps its results in memory until its shards are written)
+- one token bucket per host (--rate requests/sec per host), so crawling the
+  whole university doesn't hit culpa.info any harder than one department did
+
+Every department is written to its own shards as soon as it's done, same
+shape as cs_reviews.json / cs_course_reviews.json:
+
+    department_shards/7_COMS_professors.json
+    department_shards/7_COMS_courses.json
+
+Shards are written to a temp file and renamed, so with --resume the
+departments that already have both shards are skipped. While a shard is
+being crawled every page is checkpointed to a CrawlJournal next to it
+(7_COMS_professors_journal.jsonl, deleted once the shard is written), so
+--resume also picks up a half-crawled department where it stopped. A
+department that fails (its professor/course list isn't a 200, or its pages
+still 5xx after culpa_client's retries) is reported, the others carry on,
+and the run exits non-zero. --merge combines the shards into one
+professor-keyed and one course-keyed dump through review_index.ReviewIndex:
+a professor listed in several departments ends up once, with each review
+once.
+
+    python crawl_departments.py [--departments 7 12] [--concurrency 16] [--rate 5] [--resume]
+    python crawl_departments.py --merge [--output all_reviews.json] [--course-output all_course_reviews.json]
+'''
+
+import argparse
+import asyncio
+import os
+import re
+import sys
+import time
+
+import async_crawler
+import culpa_client
+import json_stream
+from crawl_journal import CrawlJournal
+import review_store
+from review_index import ReviewIndex
+
+BASE_URL = culpa_client.BASE_URL
+DEFAULT_SHARD_DIR = "department_shards"
+DEFAULT_CONCURRENCY = 16
+DEFAULT_DEPARTMENT_WORKERS = 4
+
+LABELS = {
+    'professor': lambda p: f"{p.get('first_name', '')} {p.get('last_name', '')} ({p.get('uni', '')})",
+    'course': lambda c: f"{c.get('course_code', '')} - {c.get('name', '')}",
+}
+
+
+def get_departments(base_url=BASE_URL):
+    """Every department: [{'department_id', 'name', 'code'}, ...]"""
+    print("Fetching departments...")
+    response = culpa_client.get(f"{base_url}/departments/all")
+
+    if response.status_code != 200:
+        print(f"Error fetching departments: {response.status_code}")
+        return []
+
+    departments = response.json()
+    print(f"Found {len(departments)} departments")
+    return departments
+
+
+def shard_path(shard_dir, department, kind):
+    code = re.sub(r'[^A-Za-z0-9]+', '_', str(department.get('code') or 'dept'))
+    return os.path.join(shard_dir, f"{department['department_id']}_{code}_{kind}s.json")
+
+
+def journal_path(path):
+    return path[:-len(".json")] + "_journal.jsonl"
+
+
+def write_shard(path, entries):
+    """EntryWriter renames the shard into place once complete, so a half-written one never looks done"""
+    with json_stream.EntryWriter(path) as writer:
+        for entry in entries:
+            writer.write(entry)
+
+
+async def crawl_department(department, base_url, shard_dir, session, limiter, semaphore, resume=False):
+    """Crawl one department's professors and courses into its two shards"""
+    dept_id = department['department_id']
+    code = department.get('code') or department.get('name') or dept_id
+    totals = {}
+
+    for kind in ('professor', 'course'):
+        path = shard_path(shard_dir, department, kind)
+        if resume and os.path.exists(path):
+            print(f"⏭️  {code}: {kind}s already scraped")
+            continue
+
+        status, entities = await async_crawler.fetch_json(
+            session, limiter, f"{base_url}/departments/{dept_id}/{kind}s")
+        if status != 200:
+            # not "no professors/courses": the department fails and --resume retries it
+            raise RuntimeError(f"{code} {kind}s: HTTP {status}")
+
+        print(f"\n{code}: {len(entities)} {kind}s")
+        journal = CrawlJournal(journal_path(path), resume=resume)
+        try:
+            entries = await async_crawler.crawl_entities(
+                entities, kind, f"{kind}_id",
+                label=lambda e, kind=kind: f"{code} {LABELS[kind](e)}",
+                base_url=base_url, journal=journal,
+                session=session, bucket=limiter, semaphore=semaphore
+            )
+        finally:
+            journal.close()
+        write_shard(path, entries)
+        os.remove(journal_path(path))
+        totals[kind] = sum(entry['review_count'] for entry in entries)
+
+    return totals
+
+
+async def crawl_all(departments, base_url, shard_dir, concurrency, rate, department_workers, resume):
+    limiter = async_crawler.HostBuckets(rate)
+    semaphore = asyncio.Semaphore(concurrency)
+    department_slots = asyncio.Semaphore(department_workers)
+
+    async with async_crawler.client_session(concurrency) as session:
+
+        async def worker(department):
+            """The department's totals, or the exception it failed with"""
+            async with department_slots:
+                try:
+                    return await crawl_department(department, base_url, shard_dir,
+                                                  session, limiter, semaphore, resume)
+                except Exception as e:
+                    code = department.get('code') or department['department_id']
+                    print(f"❌ {code} failed: {type(e).__name__}: {e}")
+                    return e
+
+        return await asyncio.gather(*(worker(d) for d in departments))
+
+
+def crawl_departments(department_ids=None, base_url=BASE_URL, shard_dir=DEFAULT_SHARD_DIR,
+                      concurrency=DEFAULT_CONCURRENCY, rate=async_crawler.DEFAULT_RATE,
+                      department_workers=DEFAULT_DEPARTMENT_WORKERS, resume=False):
+    """
+    Crawl every department (or just department_ids) into per-department shards.
+    Returns the departments that failed.
+    """
+    departments = get_departments(base_url)
+    if department_ids:
+        wanted = set(department_ids)
+        departments = [d for d in departments if d['department_id'] in wanted]
+    if not departments:
+        print("No departments found!")
+        return []
+
+    os.makedirs(shard_dir, exist_ok=True)
+    print(f"\nCrawling {len(departments)} departments ({department_workers} at a time, "
+          f"{concurrency} professors/courses in flight, max {rate} requests/sec per host)...\n")
+
+    start = time.perf_counter()
+    results = asyncio.run(crawl_all(departments, base_url, shard_dir, concurrency, rate,
+                                    department_workers, resume))
+    elapsed = time.perf_counter() - start
+    failed = [d for d, r in zip(departments, results) if isinstance(r, Exception)]
+    totals = [r for r in results if not isinstance(r, Exception)]
+
+    print(f"\n{'='*60}")
+    print(f"✅ Complete!" if not failed else f"⚠️  Finished with {len(failed)} failed departments")
+    print(f"   Departments: {len(totals)} of {len(departments)}")
+    print(f"   Reviews scraped: {sum(t.get('professor', 0) for t in totals)} by professor, "
+          f"{sum(t.get('course', 0) for t in totals)} by course")
+    print(f"   Shards in: {shard_dir}/ ({elapsed:.1f}s)")
+    if failed:
+        print(f"   Failed: {', '.join(str(d.get('code') or d['department_id']) for d in failed)} "
+              f"(rerun with --resume to continue them)")
+    culpa_client.print_stats()
+    print(f"{'='*60}")
+    return failed
+
+
+def shard_paths(shard_dir, kind):
+    """A kind's shards, in department ID order"""
+    suffix = f"_{kind}s.json"
+    names = [n for n in os.listdir(shard_dir) if n.endswith(suffix)]
+    names.sort(key=lambda n: int(n.split('_', 1)[0]))
+    return [os.path.join(shard_dir, n) for n in names]
+
+
+def merge_shards(shard_dir=DEFAULT_SHARD_DIR, output="all_reviews.json",
+                 course_output="all_course_reviews.json"):
+    """Combine every department's shards into one professor- and one course-keyed dump"""
+    index = ReviewIndex()
+    for kind in ('professor', 'course'):
+        for path in shard_paths(shard_dir, kind):
+            index.add_entries(review_store.stream_entries(path, kind))
+
+    for kind, path in (('professor', output), ('course', course_output)):
+        with json_stream.EntryWriter(path) as writer:
+            for entry in index.entries(kind):
+                writer.write(entry)
+        print(f"Saved {len(index.entities[kind])} {kind}s to {path}")
+
+    print(f"\n✅ Merged {len(index)} unique reviews from {shard_dir}/")
+    return index
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Crawl CULPA reviews for every department")
+    parser.add_argument("--departments", type=int, nargs="*",
+                        help="only these department IDs (default: all of them)")
+    parser.add_argument("--shard-dir", default=DEFAULT_SHARD_DIR)
+    parser.add_argument("--concurrency", type=int, default=DEFAULT_CONCURRENCY,
+                        help="professors/courses crawled at the same time, across all departments")
+    parser.add_argument("--department-workers", type=int, default=DEFAULT_DEPARTMENT_WORKERS,
+                        help="departments crawled at the same time")
+    parser.add_argument("--rate", type=float, default=async_crawler.DEFAULT_RATE,
+                        help="max requests per second to each host")
+    parser.add_argument("--resume", action="store_true",
+                        help="skip departments whose shards are already written")
+    parser.add_argument("--merge", action="store_true",
+                        help="merge the shards in --shard-dir instead of crawling")
+    parser.add_argument("--output", default="all_reviews.json")
+    parser.add_argument("--course-output", default="all_course_reviews.json")
+    args = parser.parse_args()
+
+    if args.merge:
+        merge_shards(args.shard_dir, args.output, args.course_output)
+    else:
+        failed = crawl_departments(args.departments, shard_dir=args.shard_dir,
+                                   concurrency=args.concurrency, rate=args.rate,
+                                   department_workers=args.department_workers, resume=args.resume)
+        if failed:
+            sys.exit(1)
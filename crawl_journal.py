@@ -0,0 +1,81 @@
+'''
+Append-only checkpoint journal for the crawls, so a crash doesn't mean
+starting over.
+
+The old scrapers re-dumped the whole all_data list (indent=4) to
+*_progress.json every 10 professors. That rewrites everything scraped so far
+each time (O(n^2) bytes over a crawl) and nothing ever read it back.
+
+Instead every finished page is appended as one JSON line:
+    {"id": 3509, "page": 2, "reviews": [...]}
+and when an entity (professor or course) has no more pages:
+    {"id": 3509, "done": true}
+
+Replaying the file gives, per entity ID, the reviews so far and the last
+completed page. With --resume the scrapers skip entities that are done and
+pick up the others at the next page. A half-written last line (crash in the
+middle of a write) is just ignored.
+'''
+
+import json
+import os
+
+
+class CrawlJournal:
+    def __init__(self, path, resume=False):
+        self.path = path
+        self.state = {}  # entity id -> {'page', 'reviews', 'done'}
+
+        if resume and os.path.exists(path):
+            self._replay()
+            done = sum(1 for s in self.state.values() if s['done'])
+            print(f"Resuming from {path}: {done} finished, "
+                  f"{len(self.state) - done} partially scraped")
+
+        # Resuming appends to the journal, otherwise start a fresh one
+        self.file = open(path, "a" if resume else "w")
+        if self.file.tell() > 0 and not self._ends_with_newline():
+            self.file.write("\n")  # don't glue the next record onto a partial line
+
+    def _ends_with_newline(self):
+        with open(self.path, "rb") as f:
+            f.seek(-1, os.SEEK_END)
+            return f.read(1) == b"\n"
+
+    def _replay(self):
+        with open(self.path, "r") as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    continue  # partial write from a crash
+                entity = self.state.setdefault(record['id'], {'page': 0, 'reviews': [], 'done': False})
+                if record.get('done'):
+                    entity['done'] = True
+                else:
+                    entity['page'] = record['page']
+                    entity['reviews'].extend(record['reviews'])
+
+    def _append(self, record):
+        self.file.write(json.dumps(record) + "\n")
+        self.file.flush()
+
+    def record_page(self, entity_id, page, reviews):
+        """Checkpoint one completed page (only the reviews new on this page)"""
+        self._append({'id': entity_id, 'page': page, 'reviews': reviews})
+
+    def record_done(self, entity_id):
+        self._append({'id': entity_id, 'done': True})
+
+    def is_done(self, entity_id):
+        return self.state.get(entity_id, {}).get('done', False)
+
+    def resume_point(self, entity_id):
+        """(next page to fetch, reviews already scraped) for an entity"""
+        entity = self.state.get(entity_id)
+        if not entity:
+            return 1, []
+        return entity['page'] + 1, list(entity['reviews'])
+
+    def close(self):
+        self.file.close()
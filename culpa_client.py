@@ -0,0 +1,190 @@
+'''
+One shared HTTP client for all the CULPA scrapers.
+
+Before this every script called bare requests.get, which opens a brand new
+TLS connection for every single page. It also meant any non-200 response was
+treated as "no more pages", so one transient 502 in the middle of a
+professor's reviews silently cut their list short.
+
+Everything now goes through get() below:
+- a single keep-alive requests.Session with a pooled HTTPAdapter, so pages
+  for the same host reuse the same connections. requests/urllib3 don't do
+  true HTTP/1.1 pipelining, but with keep-alive + a blocking pool sized for
+  our concurrency each connection is reused back to back, which is where
+  most of the win is.
+- exponential backoff with jitter on 429 and 5xx (and on connection errors),
+  honoring the Retry-After header when the server sends one
+- if a page still fails after MAX_RETRIES we raise instead of pretending the
+  professor has no more reviews
+
+stats keeps counters for requests, retries and connection reuse so we can
+check the pooling is actually working (print_stats()).
+
+Responses also go through the on-disk cache in http_cache.py (conditional
+requests, TTL, LRU size bound, cache-only mode). It's configured with
+CULPA_CACHE* environment variables, see http_cache.from_env.
+'''
+
+import os
+import random
+import time
+from email.utils import parsedate_to_datetime
+
+import requests
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+
+import http_cache
+
+BASE_URL = "https://culpa.info/api"
+
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+MAX_RETRIES = 5
+BACKOFF_BASE = 0.5  # seconds, doubled on every attempt
+BACKOFF_MAX = 30.0
+POOL_SIZE = 10
+TIMEOUT = 30
+CACHE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".culpa_cache.sqlite")
+
+stats = {
+    'requests': 0,
+    'retries': 0,
+    'new_connections': 0,
+    'reused_connections': 0,
+}
+
+_session = None
+_cache = False  # False = not set up yet, None = disabled
+
+
+def get_session():
+    """The shared keep-alive session (created on first use)"""
+    global _session
+    if _session is None:
+        _session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=POOL_SIZE, pool_maxsize=POOL_SIZE, pool_block=True)
+        _session.mount("https://", adapter)
+        _session.mount("http://", adapter)
+        _session.headers.update({'Connection': 'keep-alive'})
+    return _session
+
+
+def get_cache():
+    """The shared HTTPCache, or None if CULPA_CACHE=0"""
+    global _cache
+    if _cache is False:
+        _cache = http_cache.from_env(CACHE_PATH)
+    return _cache
+
+
+def cached_response(url, entry, status=200):
+    """Turn a cache entry into a requests.Response the scrapers can use as usual"""
+    response = requests.Response()
+    response.url = url
+    response.status_code = status
+    response._content = entry['body'] if entry else b''
+    response.headers = CaseInsensitiveDict(entry['headers'] if entry else {})
+    response.encoding = 'utf-8'
+    response.from_cache = True
+    return response
+
+
+def retry_after_seconds(value):
+    """Parse a Retry-After header (either seconds or an HTTP date)"""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def backoff_delay(attempt, retry_after=None):
+    """How long to wait before retry number `attempt` (starting at 0)"""
+    if retry_after is not None:
+        return min(retry_after, BACKOFF_MAX)
+    # "full jitter": random point between 0 and the exponential cap
+    return random.uniform(0, min(BACKOFF_MAX, BACKOFF_BASE * (2 ** attempt)))
+
+
+def _pooled_connections(session, url):
+    """Number of connections the adapter's pools for this URL have opened so far"""
+    pools = session.get_adapter(url).poolmanager.pools
+    return sum(pools[key].num_connections for key in pools.keys())
+
+
+def get(url, params=None, max_retries=MAX_RETRIES, **kwargs):
+    """
+    GET through the shared session, retrying 429/5xx and connection errors.
+
+    Returns the response for anything that isn't retryable (200, 404, ...).
+    Raises requests.HTTPError / ConnectionError if retries run out.
+    Fresh cached pages are returned without a request, stale ones are
+    revalidated with a conditional GET. In cache-only mode a page that isn't
+    cached raises http_cache.CacheMiss.
+    """
+    session = get_session()
+    kwargs.setdefault('timeout', TIMEOUT)
+
+    cache = get_cache()
+    if cache:
+        key = cache.key(url, params)
+        entry = cache.lookup(key)
+        if entry and (cache.offline or cache.is_fresh(entry)):
+            cache.stats['hits'] += 1
+            return cached_response(url, entry)
+        if cache.offline:
+            cache.stats['misses'] += 1
+            raise http_cache.CacheMiss(url, params)
+        kwargs['headers'] = {**kwargs.get('headers', {}), **cache.conditional_headers(entry)}
+
+    for attempt in range(max_retries + 1):
+        opened_before = _pooled_connections(session, url)
+        try:
+            response = session.get(url, params=params, **kwargs)
+        except (requests.ConnectionError, requests.Timeout):
+            if attempt == max_retries:
+                raise
+            stats['retries'] += 1
+            time.sleep(backoff_delay(attempt))
+            continue
+
+        stats['requests'] += 1
+        if _pooled_connections(session, url) > opened_before:
+            stats['new_connections'] += 1
+        else:
+            stats['reused_connections'] += 1
+
+        if response.status_code not in RETRY_STATUSES:
+            if cache and response.status_code == 304 and entry:
+                cache.stats['revalidated'] += 1
+                cache.touch(key)
+                return cached_response(url, entry)
+            if cache and response.status_code == 200:
+                cache.stats['misses'] += 1
+                cache.store(key, url, response.content, response.headers)
+            return response
+
+        if attempt == max_retries:
+            response.raise_for_status()
+
+        stats['retries'] += 1
+        delay = backoff_delay(attempt, retry_after_seconds(response.headers.get('Retry-After')))
+        print(f"  ⚠️  {response.status_code} from {url}, retrying in {delay:.1f}s")
+        time.sleep(delay)
+
+
+def print_stats():
+    print(f"   HTTP requests: {stats['requests']} "
+          f"(new connections: {stats['new_connections']}, reused: {stats['reused_connections']}, "
+          f"retries: {stats['retries']})")
+    cache = get_cache()
+    if cache:
+        entries, size = cache.size()
+        print(f"   Cache: {cache.stats['hits']} hits, {cache.stats['revalidated']} revalidated (304), "
+              f"{cache.stats['misses']} misses, {entries} entries / {size / 1024 / 1024:.1f} MB"
+              f"{' (cache-only)' if cache.offline else ''}")
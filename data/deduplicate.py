@@ -8,22 +8,50 @@ checked my cs_reviews.json to check what courses the two professor IDs taught. I
 they were similar/the same, I assume they are the same professor and aggregate it the 
 reviews in the new clean_cs_reviews.json file as under the same professor (just choose
 one of the prof IDs)
+
+find_duplicate_professors() does that check automatically, so it still works
+once the crawl covers every department:
+
+  blocking    professors are only compared within a block: same normalized
+              last name + first initial, or same uni. Never all pairs.
+  scoring     confidence = 0.7 * name similarity + 0.3 * Jaccard overlap of
+              their course sets (each course is a bit in an int, so overlap
+              is two popcounts). Same uni -> 1.0, different unis -> 0.
+  merge map   pairs at or above --min-confidence are grouped, and each group
+              merges into its professor with the most reviews. --merge-map
+              writes {old_id: primary_id} with the confidences for merge.py.
+
+    python deduplicate.py cs_reviews.json --merge-map merge_map.json
 '''
 
+import argparse
 import json
+import os
+import re
+import sys
+import unicodedata
 from collections import defaultdict
+from difflib import SequenceMatcher
+from itertools import combinations
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import review_store
+
+NAME_WEIGHT = 0.7
+COURSE_WEIGHT = 0.3
+MIN_CONFIDENCE = 0.75
+REVIEW_CONFIDENCE = 0.5  # pairs between this and MIN_CONFIDENCE are printed for a human
+
+_NON_ALPHA = re.compile(r'[^a-z ]')
+_COURSE = re.compile(r'([A-Za-z]{4})?\s*[A-Za-z]?(\d{4})')
 
 def find_duplicate_names(filename="cs_reviews.json"):
     """Find and print professors with the same first and last name, showing courses"""
     
-    # Load data
-    with open(filename, "r") as f:
-        data = json.load(f)
-    
-    # Group by full name
+    # Group by full name (streaming the file, one professor at a time)
     name_to_profs = defaultdict(list)
     
-    for item in data:
+    for item in review_store.stream_entries(filename, 'professor'):
         prof = item['professor']
         full_name = f"{prof['first_name']} {prof['last_name']}"
         
@@ -71,5 +99,165 @@ def find_duplicate_names(filename="cs_reviews.json"):
     else:
         print("No duplicate names found!")
 
+def normalize_person(name):
+    """Lowercase ASCII letters and single spaces: 'José  O'Neil' -> 'jose o neil'"""
+    name = unicodedata.normalize('NFKD', name or '').encode('ascii', 'ignore').decode()
+    return ' '.join(_NON_ALPHA.sub(' ', name.lower()).split())
+
+
+def course_key(code):
+    """'COMS W4111' and 'COMS 4111' are the same course"""
+    match = _COURSE.search(code or '')
+    if not match:
+        return None
+    return f"{(match.group(1) or '').upper()} {match.group(2)}".strip()
+
+
+def professor_profiles(entries):
+    """The few fields matching needs, one dict per professor entry"""
+    profiles = []
+    for item in entries:
+        prof = item['professor']
+        courses = set()
+        for review in item.get('reviews', []):
+            key = course_key((review.get('course_header') or {}).get('course_code'))
+            if key:
+                courses.add(key)
+        profiles.append({
+            'id': prof['professor_id'],
+            'first': normalize_person(prof.get('first_name')),
+            'last': normalize_person(prof.get('last_name')),
+            'uni': (prof.get('uni') or '').lower(),
+            'review_count': item.get('review_count') or 0,
+            'courses': courses,
+        })
+    return profiles
+
+
+def blocks(profiles):
+    """Lists of profile positions that share a blocking key"""
+    by_key = defaultdict(list)
+    for position, p in enumerate(profiles):
+        if p['last']:
+            by_key[('name', p['last'].replace(' ', ''), p['first'][:1])].append(position)
+        if p['uni']:
+            by_key[('uni', p['uni'])].append(position)
+    return [positions for positions in by_key.values() if len(positions) > 1]
+
+
+def course_bitsets(profiles):
+    """Each professor's course set as an int with one bit per course"""
+    bit = {}
+    bitsets = []
+    for p in profiles:
+        bits = 0
+        for key in p['courses']:
+            bits |= 1 << bit.setdefault(key, len(bit))
+        bitsets.append(bits)
+    return bitsets
+
+
+def jaccard(a, b):
+    union = (a | b).bit_count()
+    return (a & b).bit_count() / union if union else 0.0
+
+
+def score_pair(a, b, bits_a, bits_b):
+    """Confidence that two professor entries are the same person"""
+    if a['uni'] and b['uni']:
+        return 1.0 if a['uni'] == b['uni'] else 0.0
+    name = SequenceMatcher(None, f"{a['first']} {a['last']}", f"{b['first']} {b['last']}").ratio()
+    return round(NAME_WEIGHT * name + COURSE_WEIGHT * jaccard(bits_a, bits_b), 3)
+
+
+def score_candidates(profiles):
+    """[(confidence, i, j)] for every blocked pair of profile positions, best first"""
+    bitsets = course_bitsets(profiles)
+    pairs = set()
+    for positions in blocks(profiles):
+        pairs.update(combinations(sorted(positions), 2))
+    scored = [(score_pair(profiles[i], profiles[j], bitsets[i], bitsets[j]), i, j) for i, j in pairs]
+    scored.sort(key=lambda s: (-s[0], s[1], s[2]))
+    return scored
+
+
+def build_merge_map(profiles, scored, min_confidence=MIN_CONFIDENCE):
+    """
+    {old_id: (primary_id, confidence)} from the pairs at or above min_confidence.
+    Linked pairs form one group, merged into its professor with the most
+    reviews (lowest ID on ties); confidence is the weakest link on the way.
+    """
+    links = defaultdict(dict)
+    for confidence, i, j in scored:
+        if confidence >= min_confidence:
+            links[i][j] = links[j][i] = confidence
+
+    merge_map = {}
+    seen = set()
+    for start in sorted(links):
+        if start in seen:
+            continue
+        # walk the group, remembering the weakest link to each member
+        weakest = {start: 1.0}
+        stack = [start]
+        while stack:
+            i = stack.pop()
+            for j, confidence in links[i].items():
+                if j not in weakest:
+                    weakest[j] = min(weakest[i], confidence)
+                    stack.append(j)
+        seen.update(weakest)
+
+        primary = min(weakest, key=lambda i: (-profiles[i]['review_count'], profiles[i]['id']))
+        for i, confidence in weakest.items():
+            if i != primary:
+                merge_map[profiles[i]['id']] = (profiles[primary]['id'], confidence)
+    return merge_map
+
+
+def find_duplicate_professors(filename="cs_reviews.json", min_confidence=MIN_CONFIDENCE,
+                              merge_map_file=None):
+    """Score likely duplicate professors and build a merge map for merge.py"""
+    profiles = professor_profiles(review_store.stream_entries(filename, 'professor'))
+    scored = score_candidates(profiles)
+    merge_map = build_merge_map(profiles, scored, min_confidence)
+
+    def label(p):
+        return f"{p['id']} {p['first'].title()} {p['last'].title()} ({p['review_count']} reviews)"
+
+    print(f"Compared {len(scored)} blocked pairs among {len(profiles)} professors\n")
+    print(f"✅ MERGE (confidence >= {min_confidence}):")
+    for confidence, i, j in scored:
+        if confidence >= min_confidence:
+            print(f"  {confidence:.2f}  {label(profiles[i])}  <->  {label(profiles[j])}")
+    print(f"\n🤔 CHECK BY HAND ({REVIEW_CONFIDENCE} <= confidence < {min_confidence}):")
+    for confidence, i, j in scored:
+        if REVIEW_CONFIDENCE <= confidence < min_confidence:
+            print(f"  {confidence:.2f}  {label(profiles[i])}  <->  {label(profiles[j])}")
+
+    if merge_map_file:
+        with open(merge_map_file, "w") as f:
+            json.dump({
+                'min_confidence': min_confidence,
+                'merges': [{'professor_id': old_id, 'into': primary_id, 'confidence': confidence}
+                           for old_id, (primary_id, confidence) in sorted(merge_map.items())],
+            }, f, indent=4)
+        print(f"\nSaved {len(merge_map)} merges to {merge_map_file}")
+
+    return merge_map
+
+
 if __name__ == "__main__":
-    find_duplicate_names()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Find professors listed under more than one ID")
+    parser.add_argument("filename", nargs="?", default="cs_reviews.json",
+                        help="a JSON dump, a review_store .sqlite file or a review_snapshot dir")
+    parser.add_argument("--names", action="store_true",
+                        help="just list exact same-name professors with their courses")
+    parser.add_argument("--min-confidence", type=float, default=MIN_CONFIDENCE)
+    parser.add_argument("--merge-map", help="write the merge map here (JSON)")
+    args = parser.parse_args()
+
+    if args.names:
+        find_duplicate_names(args.filename)
+    else:
+        find_duplicate_professors(args.filename, args.min_confidence, args.merge_map)
\ No newline at end of file
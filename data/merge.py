@@ -2,8 +2,17 @@
 Merge duplicate professors based on manual decisions.
 
 After running deduplicate.py to identify duplicates and checking which courses
-they teach, update the merge_map below with your decisions, then run this script
-to create clean_cs_reviews.json
+they teach, update MERGE_MAP below with your decisions (or pass the file
+deduplicate.py --merge-map writes), then run this script to create
+merged_cs_reviews.json
+
+    python merge.py cs_reviews.json [merged_cs_reviews.json] [--merge-map merge_map.json]
+
+Merges go through a union-find, so chains resolve all the way: with
+A -> B and B -> C, A and B both end up under C. The input is streamed
+twice (a cheap pass to group entries, then one group at a time is read back
+and written), and each group's seen review IDs are a sorted array('I')
+rather than a set, so memory stays small however big the dump or the map.
 
 Original professor entries:  148
 After merging:               146
@@ -12,96 +21,183 @@ Total reviews:               1352
 Saved to:                    clean_cs_reviews.json
 '''
 
+import argparse
+import contextlib
 import json
+import os
+import sys
+from array import array
+from bisect import bisect_left
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import json_stream
+import review_store
+
+# ============= EDIT THIS MERGE MAP =============
+# Format: old_id -> primary_id (which ID to merge INTO)
+# Example: If Donald Ferguson has IDs 6653 and 13551, and you want to keep 6653:
+#          13551: 6653  means "merge 13551 into 6653"
+MERGE_MAP = {
+    # Add your merge decisions here
+    # old_id: primary_id,
+    6653 : 13551,
+    13070 : 13159
+}
+# ===============================================
+
+
+class UnionFind:
+    """Professor ID -> the ID its group merges into, following chains"""
+
+    def __init__(self, merge_map=()):
+        self.parent = {}
+        for old_id, primary_id in dict(merge_map).items():
+            self.union(old_id, primary_id)
+
+    def find(self, professor_id):
+        root = professor_id
+        while self.parent.get(root, root) != root:
+            root = self.parent[root]
+        # path compression: point everything on the way straight at the root
+        while professor_id != root:
+            self.parent[professor_id], professor_id = root, self.parent[professor_id]
+        return root
+
+    def union(self, old_id, primary_id):
+        """Merge old_id's group into primary_id's (primary_id's root stays the root)"""
+        old_root, primary_root = self.find(old_id), self.find(primary_id)
+        if old_root != primary_root:
+            self.parent[old_root] = primary_root
+
+
+class ReviewIdSet:
+    """Sorted array('I') of review IDs: 4 bytes each instead of a set entry"""
+
+    def __init__(self):
+        self.ids = array('I')
+
+    def add(self, review_id):
+        """Add review_id, False if it was already there"""
+        i = bisect_left(self.ids, review_id)
+        if i < len(self.ids) and self.ids[i] == review_id:
+            return False
+        self.ids.insert(i, review_id)
+        return True
 
-def merge_professors(input_file="cs_reviews.json", output_file="merged_cs_reviews.json"):
+    def __contains__(self, review_id):
+        i = bisect_left(self.ids, review_id)
+        return i < len(self.ids) and self.ids[i] == review_id
+
+    def __len__(self):
+        return len(self.ids)
+
+
+def load_merge_map(path):
+    """{old_id: primary_id} from deduplicate.py --merge-map output (or a plain JSON map)"""
+    with open(path, "r") as f:
+        data = json.load(f)
+    if 'merges' in data:
+        return {m['professor_id']: m['into'] for m in data['merges']}
+    return {int(old_id): primary_id for old_id, primary_id in data.items()}
+
+
+def merge_professors(input_file="cs_reviews.json", output_file="merged_cs_reviews.json",
+                     merge_map=None, sort_by_name=True):
     """
-    Merge duplicate professors based on manual merge decisions
+    Merge duplicate professors based on merge decisions (MERGE_MAP by default).
+    input_file can be a JSON dump, a review_store .sqlite file or a snapshot. With
+    sort_by_name=False groups are written in the order they first appear.
     """
-    
-    # ============= EDIT THIS MERGE MAP =============
-    # Format: old_id -> primary_id (which ID to merge INTO)
-    # Example: If Donald Ferguson has IDs 6653 and 13551, and you want to keep 6653:
-    #          13551: 6653  means "merge 13551 into 6653"
-    
-    merge_map = {
-        # Add your merge decisions here
-        # old_id: primary_id,
-        6653 : 13551,
-        13070 : 13159
-    }
-    # ===============================================
+    if merge_map is None:
+        merge_map = MERGE_MAP
     
     if not merge_map:
         print("⚠️  WARNING: merge_map is empty!")
-        print("   Add your merge decisions to the merge_map dictionary in merge.py")
+        print("   Add your merge decisions to MERGE_MAP in merge.py (or pass --merge-map)")
         return
     
-    # Load data
-    with open(input_file, "r") as f:
-        data = json.load(f)
+    groups_of = UnionFind(merge_map)
     
-    print(f"Loaded {len(data)} professor entries from {input_file}\n")
-    print(f"Applying {len(merge_map)} merges...\n")
+    # the dump stays open across both passes (pass 2 seeks back into it)
+    with contextlib.ExitStack() as files:
+        # Pass 1: stream the input and work out the merged groups. Only each
+        # entry's position in the file is kept, not its reviews.
+        if not review_store.is_dump(input_file):
+            entries = review_store.load_entries(input_file, 'professor')
+            scan = ((item, i) for i, item in enumerate(entries))
+            fetch = entries.__getitem__
+        else:
+            f = files.enter_context(open(input_file, "rb"))
+            scan = ((item, (offset, length)) for item, offset, length
+                    in json_stream.iter_entries(input_file, with_offsets=True))
+            fetch = lambda location: json_stream.read_entry_at(f, *location)
     
-    # Group data by professor ID (after mapping)
-    merged_data = {}
+        groups = {}  # root ID -> {'name': sort key of the first entry, 'locations': [...]}
+        entry_count = 0
     
-    for item in data:
-        prof = item['professor']
-        original_id = prof['professor_id']
+        for item, location in scan:
+            entry_count += 1
+            prof = item['professor']
+            target_id = groups_of.find(prof['professor_id'])
         
-        # Get the ID to use (mapped or original)
-        target_id = merge_map.get(original_id, original_id)
-        
-        # Initialize if first time seeing this target_id
-        if target_id not in merged_data:
-            merged_data[target_id] = {
-                'professor': prof.copy(),
-                'reviews': [],
-                'review_ids': set()
-            }
-            # Update professor_id to the primary one
-            merged_data[target_id]['professor']['professor_id'] = target_id
-        
-        # Add reviews (avoid duplicates by review_id)
-        for review in item['reviews']:
-            review_id = review.get('review_id')
-            if review_id and review_id not in merged_data[target_id]['review_ids']:
-                merged_data[target_id]['reviews'].append(review)
-                merged_data[target_id]['review_ids'].add(review_id)
+            if target_id not in groups:
+                groups[target_id] = {'name': (prof['last_name'], prof['first_name']), 'locations': []}
+            groups[target_id]['locations'].append(location)
     
-    # Convert to final format
-    clean_data = []
-    for target_id, merged_item in merged_data.items():
-        clean_data.append({
-            'professor': merged_item['professor'],
-            'review_count': len(merged_item['reviews']),
-            'reviews': merged_item['reviews']
-        })
+        print(f"Loaded {entry_count} professor entries from {input_file}\n")
+        print(f"Applying {len(merge_map)} merges...\n")
     
-    # Sort by last name, then first name
-    clean_data.sort(key=lambda x: (
-        x['professor']['last_name'],
-        x['professor']['first_name']
-    ))
+        order = list(groups)
+        if sort_by_name:
+            # Sort by last name, then first name
+            order.sort(key=lambda target_id: groups[target_id]['name'])
     
-    # Save to file
-    with open(output_file, "w") as f:
-        json.dump(clean_data, f, indent=4)
+        # Pass 2: read each group back and write it out, one professor at a time
+        total_reviews = 0
+        with json_stream.EntryWriter(output_file) as writer:
+            for target_id in order:
+                professor = None
+                reviews = []
+                review_ids = ReviewIdSet()
+            
+                # Add reviews (avoid duplicates by review_id)
+                for location in groups.pop(target_id)['locations']:
+                    item = fetch(location)
+                    if professor is None:
+                        # the first entry's details, under the primary ID
+                        professor = dict(item['professor'], professor_id=target_id)
+                    for review in item['reviews']:
+                        review_id = review.get('review_id')
+                        if review_id and review_ids.add(review_id):
+                            reviews.append(review)
+            
+                writer.write({
+                    'professor': professor,
+                    'review_count': len(reviews),
+                    'reviews': reviews
+                })
+                total_reviews += len(reviews)
     
     # Print summary
-    total_reviews = sum(item['review_count'] for item in clean_data)
-    
     print(f"{'='*70}")
     print(f"✅ MERGE COMPLETE")
     print(f"{'='*70}")
-    print(f"Original professor entries:  {len(data)}")
-    print(f"After merging:               {len(clean_data)}")
-    print(f"Professors merged:           {len(data) - len(clean_data)}")
+    print(f"Original professor entries:  {entry_count}")
+    print(f"After merging:               {len(order)}")
+    print(f"Professors merged:           {entry_count - len(order)}")
     print(f"Total reviews:               {total_reviews}")
     print(f"Saved to:                    {output_file}")
     print(f"{'='*70}\n")
 
 if __name__ == "__main__":
-    merge_professors()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Merge professors listed under more than one ID")
+    parser.add_argument("input_file", nargs="?", default="cs_reviews.json",
+                        help="a JSON dump, a review_store .sqlite file or a review_snapshot dir")
+    parser.add_argument("output_file", nargs="?", default="merged_cs_reviews.json")
+    parser.add_argument("--merge-map", help="JSON merge map, e.g. from deduplicate.py --merge-map")
+    parser.add_argument("--input-order", action="store_true",
+                        help="write groups in the order they first appear instead of by name")
+    args = parser.parse_args()
+    merge_professors(args.input_file, args.output_file,
+                     load_merge_map(args.merge_map) if args.merge_map else None,
+                     sort_by_name=not args.input_order)
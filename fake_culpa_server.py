@@ -0,0 +1,186 @@
+'''
+A tiny local stand-in for the CULPA API so crawls can be benchmarked offline.
+
+It serves the same endpoints the scrapers use, backed by the JSON dumps we
+already have:
+- /api/departments/all                  (--departments N fakes N copies of COMS)
+- /api/departments/{id}/professors      (from cs_reviews.json)
+- /api/departments/{id}/courses         (from course_data/cs_course_reviews.json)
+- /api/review/professor/{id}?page=N
+- /api/review/course/{id}?page=N
+
+Pages hold PAGE_SIZE reviews and a page past the end returns an empty
+"reviews" list, same as the real site. Every response waits `latency`
+seconds first to fake a network round trip, otherwise everything would look
+instant and the benchmark would be meaningless. Responses also carry an
+ETag and answer If-None-Match with a 304, so http_cache.py revalidation can
+be tried out.
+
+Run it directly:
+    python fake_culpa_server.py --port 8765 --latency 0.1
+then point a scraper's BASE_URL at http://127.0.0.1:8765/api, and run it
+with CULPA_CACHE=0 so the fake pages don't end up in .culpa_cache.sqlite
+next to the real ones.
+'''
+
+import argparse
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+PROFESSOR_FILE = os.path.join(HERE, "cs_reviews.json")
+COURSE_FILE = os.path.join(HERE, "course_data", "cs_course_reviews.json")
+PAGE_SIZE = 10
+
+
+def load_fixture(professor_file=PROFESSOR_FILE, course_file=COURSE_FILE):
+    """Index the review dumps by department, professor ID and course ID"""
+    fixture = {'departments': {}, 'professor_reviews': {}, 'course_reviews': {}}
+
+    def department(dept_id):
+        return fixture['departments'].setdefault(dept_id, {'professors': [], 'courses': []})
+
+    if os.path.exists(professor_file):
+        with open(professor_file, "r") as f:
+            for item in json.load(f):
+                prof = item['professor']
+                department(7)['professors'].append(prof)
+                fixture['professor_reviews'][prof['professor_id']] = item['reviews']
+
+    if os.path.exists(course_file):
+        with open(course_file, "r") as f:
+            for item in json.load(f):
+                course = item['course']
+                department(course.get('department_id', 7))['courses'].append(course)
+                fixture['course_reviews'][course['course_id']] = item['reviews']
+
+    return fixture
+
+
+def replicate_departments(fixture, copies):
+    """
+    Add copies - 1 more departments shaped like the real ones, to fake a
+    university-wide crawl. Every ID (department, professor, course, review)
+    is shifted by copy * 1,000,000 so nothing collides across copies.
+    """
+    def shifted_review(review, shift):
+        review = dict(review, review_id=review['review_id'] + shift)
+        for header, key in (('professor_header', 'professor_id'), ('course_header', 'course_id')):
+            if (review.get(header) or {}).get(key) is not None:
+                review[header] = dict(review[header], **{key: review[header][key] + shift})
+        return review
+
+    original = dict(fixture['departments'])
+    for copy in range(1, copies):
+        shift = copy * 1_000_000
+        for dept_id, dept in original.items():
+            new = fixture['departments'].setdefault(dept_id + shift, {'professors': [], 'courses': []})
+            for prof in dept['professors']:
+                new['professors'].append(dict(prof, professor_id=prof['professor_id'] + shift))
+                fixture['professor_reviews'][prof['professor_id'] + shift] = [
+                    shifted_review(r, shift) for r in fixture['professor_reviews'][prof['professor_id']]]
+            for course in dept['courses']:
+                new['courses'].append(dict(course, course_id=course['course_id'] + shift,
+                                           department_id=dept_id + shift))
+                fixture['course_reviews'][course['course_id'] + shift] = [
+                    shifted_review(r, shift) for r in fixture['course_reviews'][course['course_id']]]
+    return fixture
+
+
+def make_handler(fixture, latency):
+    routes = [
+        (re.compile(r'^/api/departments/all$'), lambda m, q: [
+            {'department_id': d, 'name': f"Department {d}", 'code': 'COMS' if d == 7 else f"D{d}"}
+            for d in sorted(fixture['departments'])
+        ]),
+        (re.compile(r'^/api/departments/(\d+)/professors$'), lambda m, q:
+            fixture['departments'].get(int(m.group(1)), {}).get('professors', [])),
+        (re.compile(r'^/api/departments/(\d+)/courses$'), lambda m, q:
+            fixture['departments'].get(int(m.group(1)), {}).get('courses', [])),
+        (re.compile(r'^/api/review/professor/(\d+)$'), lambda m, q:
+            review_page(fixture['professor_reviews'].get(int(m.group(1)), []), q)),
+        (re.compile(r'^/api/review/course/(\d+)$'), lambda m, q:
+            review_page(fixture['course_reviews'].get(int(m.group(1)), []), q)),
+    ]
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"  # keep-alive, like the real server
+
+        def do_GET(self):
+            time.sleep(latency)
+            url = urlparse(self.path)
+            query = parse_qs(url.query)
+            for pattern, view in routes:
+                match = pattern.match(url.path)
+                if match:
+                    self.send_json(200, view(match, query))
+                    return
+            self.send_json(404, {'error': 'not found'})
+
+        def send_json(self, status, payload):
+            body = json.dumps(payload).encode()
+            etag = '"' + hashlib.sha1(body).hexdigest() + '"'
+            if status == 200 and self.headers.get('If-None-Match') == etag:
+                self.send_response(304)
+                self.send_header("ETag", etag)
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+                return
+            self.send_response(status)
+            self.send_header("ETag", etag)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass  # keep benchmark output readable
+
+    return Handler
+
+
+def review_page(reviews, query):
+    """Slice one page out of an entity's reviews, shaped like the CULPA response"""
+    page = int(query.get('page', ['1'])[0])
+    start = (page - 1) * PAGE_SIZE
+    return {
+        'number_of_reviews': len(reviews),
+        'reviews': reviews[start:start + PAGE_SIZE],
+        'reviews_spotlight': {},
+    }
+
+
+def start_server(port=0, latency=0.05, fixture=None):
+    """Start the fake server in a background thread. Returns (server, base_url)"""
+    if fixture is None:
+        fixture = load_fixture()
+    server = ThreadingHTTPServer(("127.0.0.1", port), make_handler(fixture, latency))
+    server.daemon_threads = True
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}/api"
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Serve a fake CULPA API from the local JSON dumps")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", type=float, default=0.05, help="seconds added to every response")
+    parser.add_argument("--departments", type=int, default=1,
+                        help="serve this many copies of the CS department (see replicate_departments)")
+    args = parser.parse_args()
+
+    server, base_url = start_server(args.port, args.latency,
+                                    replicate_departments(load_fixture(), args.departments))
+    print(f"Fake CULPA API running at {base_url} (Ctrl+C to stop)")
+    print("Run scrapers against it with CULPA_CACHE=0, so its pages stay out of the HTTP cache")
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        server.shutdown()
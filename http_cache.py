@@ -0,0 +1,156 @@
+'''
+On-disk HTTP response cache for the CULPA API.
+
+Re-running get_cs_professors, get_cs_courses or any of the review page loops
+went back to the network every time even when nothing had changed. This
+keeps every 200 response in a small SQLite file, keyed by URL + query
+params, together with its validators (ETag / Last-Modified):
+
+- a cached response younger than `ttl` seconds is used as is
+- otherwise the request is sent with If-None-Match / If-Modified-Since, and
+  a 304 means we reuse the stored body (only headers went over the wire)
+- the cache is bounded to `max_bytes` of bodies; the least recently used
+  entries are evicted first
+- `offline=True` is a cache-only mode: nothing touches the network and a
+  miss raises CacheMiss. (It used to come back as a 504, like HTTP's
+  only-if-cached, but the page loops read any non-200 as "no more pages"
+  and quietly cut the entity short.) Handy for development, or reproducing
+  a crawl without network at all.
+
+culpa_client.py and async_crawler.py both go through this when it's enabled.
+'''
+
+import hashlib
+import json
+import os
+import sqlite3
+import time
+from urllib.parse import urlencode
+
+
+class CacheMiss(LookupError):
+    """A page that isn't cached, asked for in cache-only (offline) mode"""
+
+    def __init__(self, url, params=None):
+        super().__init__(f"not cached (CULPA_CACHE_ONLY=1): {url}" + (f" {params}" if params else ""))
+        self.url = url
+        self.params = params
+
+
+class HTTPCache:
+    def __init__(self, path, ttl=0, max_bytes=500 * 1024 * 1024, offline=False):
+        self.path = path
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.offline = offline
+        self.stats = {'hits': 0, 'revalidated': 0, 'misses': 0}
+
+        self.db = sqlite3.connect(path)
+        self.db.execute('''
+            CREATE TABLE IF NOT EXISTS responses (
+                key TEXT PRIMARY KEY,
+                url TEXT,
+                body BLOB,
+                headers TEXT,
+                etag TEXT,
+                last_modified TEXT,
+                stored_at REAL,
+                last_used REAL,
+                size INTEGER
+            )
+        ''')
+        self.db.execute("CREATE INDEX IF NOT EXISTS idx_last_used ON responses(last_used)")
+        self.db.commit()
+        self.evict()  # in case max_bytes went down since last run
+
+    @staticmethod
+    def key(url, params=None):
+        """Cache key for a URL + query params (param order doesn't matter)"""
+        query = urlencode(sorted((params or {}).items()))
+        return hashlib.sha256(f"{url}?{query}".encode()).hexdigest()
+
+    def lookup(self, key):
+        """Stored entry for a key (and mark it recently used), or None"""
+        row = self.db.execute(
+            "SELECT body, headers, etag, last_modified, stored_at FROM responses WHERE key = ?",
+            (key,)
+        ).fetchone()
+        if row is None:
+            return None
+        self.db.execute("UPDATE responses SET last_used = ? WHERE key = ?", (time.time(), key))
+        self.db.commit()
+        body, headers, etag, last_modified, stored_at = row
+        return {
+            'body': body,
+            'headers': json.loads(headers),
+            'etag': etag,
+            'last_modified': last_modified,
+            'stored_at': stored_at,
+        }
+
+    def is_fresh(self, entry):
+        return time.time() - entry['stored_at'] < self.ttl
+
+    def conditional_headers(self, entry):
+        """Headers that let the server answer 304 if the page hasn't changed"""
+        headers = {}
+        if entry and entry['etag']:
+            headers['If-None-Match'] = entry['etag']
+        if entry and entry['last_modified']:
+            headers['If-Modified-Since'] = entry['last_modified']
+        return headers
+
+    def store(self, key, url, body, headers):
+        """Save a 200 response body with its validators, then evict if over budget"""
+        now = time.time()
+        headers = {k.lower(): v for k, v in headers.items()}
+        self.db.execute(
+            "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (key, url, body, json.dumps({'content-type': headers.get('content-type', '')}),
+             headers.get('etag'), headers.get('last-modified'), now, now, len(body))
+        )
+        self.db.commit()
+        self.evict()
+
+    def touch(self, key):
+        """A 304 came back, so the stored copy is fresh again"""
+        self.db.execute("UPDATE responses SET stored_at = ? WHERE key = ?", (time.time(), key))
+        self.db.commit()
+
+    def evict(self):
+        """Drop least recently used entries until the bodies fit in max_bytes"""
+        total = self.db.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        rows = self.db.execute("SELECT key, size FROM responses ORDER BY last_used").fetchall()
+        doomed = []
+        for key, size in rows:
+            if total <= self.max_bytes:
+                break
+            doomed.append((key,))
+            total -= size
+        self.db.executemany("DELETE FROM responses WHERE key = ?", doomed)
+        self.db.commit()
+
+    def size(self):
+        """(number of entries, total body bytes)"""
+        return self.db.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses").fetchone()
+
+    def close(self):
+        self.db.close()
+
+
+def from_env(default_path):
+    """
+    Build the cache from environment variables, or None if disabled:
+    CULPA_CACHE=0 turns it off, CULPA_CACHE_PATH, CULPA_CACHE_TTL (seconds),
+    CULPA_CACHE_MAX_MB and CULPA_CACHE_ONLY=1 for offline mode.
+    """
+    if os.environ.get('CULPA_CACHE', '1') == '0':
+        return None
+    return HTTPCache(
+        os.environ.get('CULPA_CACHE_PATH', default_path),
+        ttl=float(os.environ.get('CULPA_CACHE_TTL', 0)),
+        max_bytes=int(float(os.environ.get('CULPA_CACHE_MAX_MB', 500)) * 1024 * 1024),
+        offline=os.environ.get('CULPA_CACHE_ONLY', '0') == '1',
+    )
@@ -0,0 +1,155 @@
+'''
+Streaming reader/writer for the review dumps.
+
+All our dumps are one big JSON array of {professor|course, reviews,
+review_count} entries, and every script json.load-ed the whole thing even
+though it only walks it once, entry by entry. That's fine at 3 MB but not
+once the crawl covers every department.
+
+iter_entries() reads the file in chunks and hands back one entry at a time
+(like ijson, but only for the top-level array, which is all we need), so
+memory stays around one entry + one chunk. It can also report each entry's
+byte offset/length, so a script can make a cheap first pass and then seek
+back to just the entries it needs (read_entry_at).
+
+EntryWriter writes entries one at a time and produces exactly the same bytes
+as json.dump(entries, f, indent=4). It writes to path + ".tmp" and only
+renames it over `path` once the with-block finishes; if it raises, the temp
+file is deleted and whatever was at `path` before is left alone, so a
+crash halfway never leaves a truncated dump that still parses.
+'''
+
+import json
+import os
+
+CHUNK_SIZE = 64 * 1024
+
+_decoder = json.JSONDecoder()
+_WHITESPACE = ' \t\n\r'
+
+
+def iter_entries(path, with_offsets=False, chunk_size=CHUNK_SIZE):
+    """
+    Yield the elements of a top-level JSON array one by one.
+    With with_offsets=True yields (entry, byte offset, byte length) instead.
+    """
+    with open(path, "rb") as f:
+        buffer = ""
+        buffer_offset = 0  # byte offset of buffer[0] in the file
+        pos = 0
+        eof = False
+        started = False
+
+        def fill():
+            nonlocal buffer, eof
+            chunk = f.read(chunk_size)
+            if not chunk:
+                eof = True
+                return
+            # don't split a multi-byte UTF-8 character across chunks
+            while True:
+                try:
+                    buffer += chunk.decode("utf-8")
+                    return
+                except UnicodeDecodeError:
+                    more = f.read(1)
+                    if not more:
+                        raise
+                    chunk += more
+
+        while True:
+            # skip whitespace, the opening '[' and the ',' between entries
+            while True:
+                while pos < len(buffer) and buffer[pos] in _WHITESPACE:
+                    pos += 1
+                if pos == len(buffer):
+                    if eof:
+                        return
+                    fill()
+                    continue
+                char = buffer[pos]
+                if not started:
+                    if char != '[':
+                        raise ValueError(f"{path} is not a JSON array")
+                    started = True
+                    pos += 1
+                elif char == ',':
+                    pos += 1
+                elif char == ']':
+                    return
+                else:
+                    break
+
+            # decode one entry, reading more until it's complete
+            while True:
+                try:
+                    entry, end = _decoder.raw_decode(buffer, pos)
+                    if end < len(buffer) or eof:
+                        break
+                except json.JSONDecodeError:
+                    if eof:
+                        raise
+                fill()
+
+            if with_offsets:
+                start_byte = buffer_offset + len(buffer[:pos].encode("utf-8"))
+                length = len(buffer[pos:end].encode("utf-8"))
+                yield entry, start_byte, length
+            else:
+                yield entry
+
+            # drop what we've consumed so the buffer stays small
+            buffer_offset += len(buffer[:end].encode("utf-8"))
+            buffer = buffer[end:]
+            pos = 0
+
+
+def read_entry_at(f, offset, length):
+    """Read back one entry found by iter_entries(with_offsets=True)"""
+    f.seek(offset)
+    return json.loads(f.read(length))
+
+
+class EntryStream:
+    """Re-iterable view of a dump: every `for` loop streams the file again"""
+
+    def __init__(self, path):
+        self.path = path
+
+    def __iter__(self):
+        return iter_entries(self.path)
+
+
+class EntryWriter:
+    """
+    Write a JSON array one entry at a time, byte-for-byte the same as
+    json.dump(entries, f, indent=4). `path` only appears (or is replaced)
+    if the with-block completes.
+
+        with EntryWriter("out.json") as writer:
+            for entry in entries:
+                writer.write(entry)
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.tmp_path = path + ".tmp"
+        self.count = 0
+
+    def __enter__(self):
+        self.file = open(self.tmp_path, "w")
+        return self
+
+    def write(self, entry):
+        text = json.dumps(entry, indent=4).replace("\n", "\n    ")
+        self.file.write(("[\n    " if self.count == 0 else ",\n    ") + text)
+        self.count += 1
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is not None:
+            self.file.close()
+            os.remove(self.tmp_path)
+            return
+        self.file.write("\n]" if self.count else "[]")
+        self.file.close()
+        os.replace(self.tmp_path, self.path)
@@ -0,0 +1,316 @@
+'''
+Time-weighted, Bayesian-smoothed rating and difficulty rankings for any
+grouping of reviews: by course, by professor, or by (course, professor) pair.
+
+analyze_courses.py used to do this for courses only. Here one pass over a
+dump (course- or professor-keyed, see review_store.stream_entries) builds
+flat per-review columns (rating, date, text) plus, for every grouping,
+which group each review belongs to. Weights are computed and
+difficulty is predicted once per review, and every ranking table is then
+just a set of np.bincount reductions over its group column.
+
+Groups for the dump's own kind come from its listing (in listing order,
+entries with no reviews included); the others come from each review's
+course_header/professor_header, in order of first appearance.
+
+    tables = rank_groups(data, vectorizer, model, global_mean_rating)
+    tables['course'], tables['professor'], tables['course_professor']
+
+numpy/scipy are imported inside the functions that need them so importing
+a helper from here stays cheap.
+'''
+
+from datetime import datetime
+
+GROUPINGS = ('course', 'professor', 'course_professor')
+
+LABEL_TO_SCORE = {'easy': 0, 'medium': 1, 'hard': 2}
+
+GLOBAL_MEAN_DIFFICULTY = 1.0  # Medium
+
+# Tuning parameters
+C_RATING = 20
+C_DIFFICULTY = 10
+
+
+def get_review_text(review):
+    """Combine content and workload for full context"""
+    content = review.get('content', '') or ''
+    workload = review.get('workload', '') or ''
+    return (content + " " + workload).strip()
+
+
+def get_global_mean_rating(data):
+    all_ratings = []
+    for entry in data:
+        for review in entry.get('reviews', []):
+            r = review.get('rating')
+            if r:
+                all_ratings.append(r)
+
+    return sum(all_ratings) / len(all_ratings)
+
+
+def bayesian_average(value, n, C, m):
+    """Bayesian average - accounts for sample size (works on arrays too)"""
+    if value is None:
+        return None
+    return (n * value + C * m) / (n + C)
+
+
+def parse_dates(date_strs):
+    """
+    datetime64[us] array of submission_dates, NaT where one is missing or
+    unparseable. Timezones are dropped, keeping the wall-clock time.
+    """
+    import numpy as np
+
+    cleaned = [d.replace('Z', '') if d else 'NaT' for d in date_strs]
+    if not any('+' in d[10:] or '-' in d[10:] for d in cleaned):
+        try:
+            return np.array(cleaned, dtype='datetime64[us]')
+        except ValueError:
+            pass
+
+    # offsets or odd formats: parse one by one like datetime.fromisoformat does
+    parsed = []
+    for d in date_strs:
+        try:
+            parsed.append(datetime.fromisoformat(d.replace('Z', '+00:00')).replace(tzinfo=None))
+        except (AttributeError, TypeError, ValueError):
+            parsed.append(None)
+    return np.array([np.datetime64(d, 'us') if d else np.datetime64('NaT') for d in parsed])
+
+
+def get_time_weights(dates, decay_years=5, now=None):
+    """
+    More recent reviews get higher weight (dates from parse_dates).
+    Reviews from today = 1.0
+    Reviews from decay_years ago = 0.3
+    Missing/unparseable dates = 0.5
+    """
+    import numpy as np
+
+    now = np.datetime64(now or datetime.now(), 'us')
+    with np.errstate(invalid='ignore'):  # NaT dates, replaced below
+        days_ago = (now - dates) // np.timedelta64(1, 'D')  # whole days, like timedelta.days
+    years_ago = days_ago / 365
+
+    weights = np.where(years_ago <= 0, 1.0,
+              np.where(years_ago >= decay_years, 0.3,
+                       1.0 - (years_ago / decay_years) * 0.7))
+    return np.where(np.isnat(dates), 0.5, weights)
+
+
+def transform_texts(texts, vectorizer, known_texts=None, known_X=None):
+    """
+    TF-IDF matrix of texts, with one transform call. Rows for texts in
+    known_texts (the training texts) are taken from their matrix known_X
+    instead of being vectorized again.
+    """
+    if known_X is None:
+        return vectorizer.transform(texts)
+    if texts == known_texts:
+        return known_X
+
+    from scipy.sparse import vstack
+
+    known_rows = {text: i for i, text in enumerate(known_texts)}
+    rows = [known_rows.get(text) for text in texts]
+    new_texts = [text for text, row in zip(texts, rows) if row is None]
+    if not new_texts:
+        return known_X[rows]
+
+    # new texts go after the known ones, then put every row back in order
+    order, next_new = [], len(known_texts)
+    for row in rows:
+        if row is None:
+            row, next_new = next_new, next_new + 1
+        order.append(row)
+    return vstack([known_X, vectorizer.transform(new_texts)], format='csr')[order]
+
+
+def predict_difficulty(X, model):
+    """0/1/2 (easy/medium/hard) difficulty score for every row of X"""
+    import numpy as np
+
+    predictions = model.predict(X)
+    class_scores = np.array([LABEL_TO_SCORE[c] for c in model.classes_])
+    return class_scores[np.searchsorted(model.classes_, predictions)]
+
+
+def grouped_sum(group_index, values, n_groups):
+    """Per-group sums (added up in review order, same as a Python sum per group)"""
+    import numpy as np
+
+    return np.bincount(group_index, weights=values, minlength=n_groups)
+
+
+def _professor_name(prof):
+    return f"{prof.get('first_name') or ''} {prof.get('last_name') or ''}".strip()
+
+
+class _Groups:
+    """Group numbers handed out in order of first appearance, plus each group's fields"""
+
+    def __init__(self):
+        self.numbers = {}
+        self.fields = []
+
+    def number(self, key, fields):
+        if key not in self.numbers:
+            self.numbers[key] = len(self.fields)
+            self.fields.append(fields)
+        return self.numbers[key]
+
+
+def review_columns(data):
+    """
+    One pass over the entries. Returns ({grouping: list of group fields},
+    columns), where columns has one array per review field plus a group
+    number column per grouping (-1 when a review has no such group).
+    """
+    import numpy as np
+
+    groups = {grouping: _Groups() for grouping in GROUPINGS}
+    group_columns = {grouping: [] for grouping in GROUPINGS}
+    ratings, dates, texts = [], [], []
+
+    for entry in data:
+        listed_course = listed_prof = None
+        if 'course' in entry:
+            listed_course = entry['course']
+            groups['course'].number(listed_course['course_id'], {
+                'name': listed_course['name'], 'course_id': listed_course['course_id']})
+        else:
+            listed_prof = entry['professor']
+            groups['professor'].number(listed_prof['professor_id'], {
+                'name': _professor_name(listed_prof), 'professor_id': listed_prof['professor_id']})
+
+        for review in entry.get('reviews', []):
+            if listed_course is not None:
+                course_id, course_name = listed_course['course_id'], listed_course['name']
+            else:
+                header = review.get('course_header') or {}
+                course_id, course_name = header.get('course_id'), header.get('course_name')
+            if listed_prof is not None:
+                prof_id, prof_name = listed_prof['professor_id'], _professor_name(listed_prof)
+            else:
+                header = review.get('professor_header') or {}
+                prof_id, prof_name = header.get('professor_id'), _professor_name(header)
+
+            course = prof = pair = -1
+            if course_id is not None:
+                course = groups['course'].number(course_id, {'name': course_name, 'course_id': course_id})
+            if prof_id is not None:
+                prof = groups['professor'].number(prof_id, {'name': prof_name, 'professor_id': prof_id})
+            if course_id is not None and prof_id is not None:
+                pair = groups['course_professor'].number((course_id, prof_id), {
+                    'name': f"{course_name} ({prof_name})",
+                    'course_id': course_id, 'professor_id': prof_id})
+            group_columns['course'].append(course)
+            group_columns['professor'].append(prof)
+            group_columns['course_professor'].append(pair)
+
+            ratings.append(review.get('rating') or 0)
+            dates.append(review.get('submission_date'))
+            texts.append(get_review_text(review))
+
+    columns = {grouping: np.array(values, dtype=np.intp) for grouping, values in group_columns.items()}
+    columns.update({
+        'rating': np.array(ratings, dtype=np.float64),
+        'date': parse_dates(dates),
+        'text': texts,
+        'has_text': np.array([len(t) > 20 for t in texts], dtype=bool),
+    })
+    return {grouping: g.fields for grouping, g in groups.items()}, columns
+
+
+def _rank_table(group, fields, weights, has_text, scores, ratings, global_mean_rating):
+    """
+    Ranking rows for one grouping. `group` is the group number of every
+    review (-1 = not in this table), `scores` the difficulty of every review
+    (only read where has_text).
+    """
+    import numpy as np
+
+    n = len(fields)
+    in_table = group >= 0
+    review_count = np.bincount(group[in_table], minlength=n)
+
+    # Weighted difficulty, over reviews with enough text
+    texted = in_table & has_text
+    text_index = group[texted]
+    text_weights = weights[texted]
+    text_scores = scores[texted]
+    text_count = np.bincount(text_index, minlength=n)
+    difficulty_weight = grouped_sum(text_index, text_weights, n)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        raw_difficulty = grouped_sum(text_index, text_scores, n) / text_count
+        weighted_difficulty = grouped_sum(text_index, text_scores * text_weights, n) / difficulty_weight
+        hard_pct = grouped_sum(text_index, np.where(text_scores == 2, text_weights, 0.0), n) / difficulty_weight * 100
+    bayesian_difficulty = bayesian_average(weighted_difficulty, text_count,
+                                           C_DIFFICULTY, GLOBAL_MEAN_DIFFICULTY)
+
+    # Weighted rating, over reviews with a rating
+    rated = in_table & (ratings != 0)
+    rated_index = group[rated]
+    rated_ratings = ratings[rated]
+    rated_count = np.bincount(rated_index, minlength=n)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        raw_rating = grouped_sum(rated_index, rated_ratings, n) / rated_count
+        weighted_rating = (grouped_sum(rated_index, rated_ratings * weights[rated], n)
+                           / grouped_sum(rated_index, weights[rated], n))
+    bayesian_rating = bayesian_average(weighted_rating, review_count, C_RATING, global_mean_rating)
+
+    def rounded(values, present, digits=2, keep_zero=False):
+        # the old per-course code dropped 0.0 for everything but raw_difficulty
+        return [round(v, digits) if ok and (v or keep_zero) else None
+                for v, ok in zip(values.tolist(), present.tolist())]
+
+    has_difficulty = text_count > 0
+    has_rating = rated_count > 0
+    metrics = {
+        'raw_rating': rounded(raw_rating, has_rating),
+        'weighted_rating': rounded(weighted_rating, has_rating),
+        'bayesian_rating': rounded(bayesian_rating, has_rating),
+        'raw_difficulty': rounded(raw_difficulty, has_difficulty, keep_zero=True),
+        'weighted_difficulty': rounded(weighted_difficulty, has_difficulty),
+        'bayesian_difficulty': rounded(bayesian_difficulty, has_difficulty),
+        'hard_pct': rounded(hard_pct, has_difficulty, 1),
+    }
+
+    rows = []
+    for i, row_fields in enumerate(fields):
+        row = dict(row_fields)
+        for metric, values in metrics.items():
+            row[metric] = values[i]
+        row['review_count'] = int(review_count[i])
+        row['text_count'] = int(text_count[i])
+        rows.append(row)
+    return rows
+
+
+def rank_groups(data, vectorizer, model, global_mean_rating, groupings=GROUPINGS,
+                known_texts=None, known_X=None):
+    """
+    {grouping: ranking rows} for each of `groupings`, from one pass over data.
+    All eligible texts are vectorized and predicted in one batch (reusing
+    known_X rows for known_texts, see transform_texts).
+    """
+    import numpy as np
+
+    fields, columns = review_columns(data)
+    weights = get_time_weights(columns['date'])
+
+    has_text = columns['has_text']
+    scores = np.zeros(len(has_text), dtype=int)
+    texts = [t for t, keep in zip(columns['text'], has_text) if keep]
+    if texts:
+        scores[has_text] = predict_difficulty(transform_texts(texts, vectorizer, known_texts, known_X), model)
+
+    return {
+        grouping: _rank_table(columns[grouping], fields[grouping], weights, has_text,
+                              scores, columns['rating'], global_mean_rating)
+        for grouping in groupings
+    }
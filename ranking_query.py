@@ -0,0 +1,118 @@
+'''
+"Top N by X" queries over a ranking table (course_rankings.json,
+professor_rankings.json, ... from analyze_courses.py).
+
+    top_k(rows, 'bayesian_rating', k=10, min_reviews=10)
+    top_k(rows, 'bayesian_difficulty', k=5, direction='asc')
+
+top_k is a one-off heap selection (heapq.nlargest/nsmallest, O(n log k)),
+returning exactly what sorted(...)[:k] would, ties in table order.
+RankingIndex sorts each metric once, the first time it's asked for, and then
+answers every query by walking that order, so a server answering many
+queries against the same table never sorts again.
+
+min_reviews is checked against the count that metric is based on:
+text_count for the difficulty metrics, review_count for the rating ones.
+Rows without a value for the metric are skipped.
+
+    python ranking_query.py course_data/course_rankings.json bayesian_rating --top 10 --min-reviews 10
+'''
+
+import argparse
+import heapq
+import json
+import time
+from itertools import islice
+
+# metric -> the count min_reviews applies to
+METRICS = {
+    'bayesian_rating': 'review_count',
+    'weighted_rating': 'review_count',
+    'raw_rating': 'review_count',
+    'bayesian_difficulty': 'text_count',
+    'weighted_difficulty': 'text_count',
+    'raw_difficulty': 'text_count',
+    'hard_pct': 'text_count',
+    'review_count': 'review_count',
+    'text_count': 'text_count',
+}
+DIRECTIONS = ('desc', 'asc')
+
+
+def _eligible(rows, metric, min_reviews):
+    count = METRICS[metric]
+    return (r for r in rows if r[metric] is not None and r[count] >= min_reviews)
+
+
+def top_k(rows, metric, k=15, direction='desc', min_reviews=0):
+    """The k best rows by metric (highest first for 'desc', lowest first for 'asc')"""
+    if direction not in DIRECTIONS:
+        raise ValueError(f"direction must be one of {DIRECTIONS}, not {direction!r}")
+    select = heapq.nlargest if direction == 'desc' else heapq.nsmallest
+    return select(k, _eligible(rows, metric, min_reviews), key=lambda r: r[metric])
+
+
+class RankingIndex:
+    """A ranking table plus one presorted order per metric, built on first use"""
+
+    def __init__(self, rows):
+        self.rows = rows
+        self.orders = {}
+
+    @classmethod
+    def load(cls, path):
+        with open(path, "r") as f:
+            return cls(json.load(f))
+
+    def order(self, metric):
+        """Rows with a value for metric, highest first (ties in table order)"""
+        if metric not in self.orders:
+            self.orders[metric] = sorted((r for r in self.rows if r[metric] is not None),
+                                         key=lambda r: r[metric], reverse=True)
+        return self.orders[metric]
+
+    def top(self, metric, k=15, direction='desc', min_reviews=0):
+        """Same result as top_k(self.rows, ...)"""
+        if direction not in DIRECTIONS:
+            raise ValueError(f"direction must be one of {DIRECTIONS}, not {direction!r}")
+        order = self._ascending(metric) if direction == 'asc' else self.order(metric)
+        count = METRICS[metric]
+        return list(islice((r for r in order if r[count] >= min_reviews), k))
+
+    def _ascending(self, metric):
+        key = (metric, 'asc')
+        if key not in self.orders:
+            self.orders[key] = _reversed_stable(self.order(metric), metric)
+        return self.orders[key]
+
+
+def _reversed_stable(order, metric):
+    """Lowest first with ties still in table order (plain reversed() would flip them)"""
+    result, i = [], len(order)
+    while i > 0:
+        j = i
+        while j > 0 and order[j - 1][metric] == order[i - 1][metric]:
+            j -= 1
+        result.extend(order[j:i])
+        i = j
+    return result
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Top N rows of a ranking table by one metric")
+    parser.add_argument("rankings", help="a *_rankings.json file from analyze_courses.py")
+    parser.add_argument("metric", choices=sorted(METRICS))
+    parser.add_argument("--top", type=int, default=15)
+    parser.add_argument("--asc", action="store_true", help="lowest first")
+    parser.add_argument("--min-reviews", type=int, default=0)
+    args = parser.parse_args()
+
+    index = RankingIndex.load(args.rankings)
+    start = time.perf_counter()
+    rows = index.top(args.metric, args.top, 'asc' if args.asc else 'desc', args.min_reviews)
+    elapsed_ms = (time.perf_counter() - start) * 1000
+
+    count = METRICS[args.metric]
+    for i, row in enumerate(rows, 1):
+        print(f"{i:2}. {row['name']:<40} {args.metric}: {row[args.metric]}  |  {row[count]} {count.split('_')[0]}s")
+    print(f"\n{len(rows)} of {len(index.rows)} rows in {elapsed_ms:.3f} ms")
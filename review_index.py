@@ -0,0 +1,172 @@
+'''
+One in-memory index over the reviews from both crawls.
+
+Every review shows up twice: under its professor in cs_reviews.json and
+under its course in course_data/cs_course_reviews.json. ReviewIndex
+dedupes them by review_id (each review body is stored once) and keeps the
+relationships as ID sets, so every lookup is a dict access:
+
+    index = ReviewIndex.from_dumps("cs_reviews.json", "course_data/cs_course_reviews.json")
+    index.review(review_id)
+    index.professor_reviews(professor_id)
+    index.course_reviews(course_id)
+    index.pair_reviews(professor_id, course_id)
+
+A review belongs to the entity whose page it was listed on, and to the
+other kind's entity named in its course_header/professor_header. So a
+professor's reviews include the ones only the course crawl found, and the
+other way around.
+
+For crawling, high_water_marks() gives incremental.py-style marks built only
+from what each entity's own listing had. A review the other crawl found
+(say, a non-COMS course's review under a COMS professor) can sit above
+reviews this listing never had, so it must not end the page loop; it just
+gets filled in from the index afterwards. entries() rebuilds the usual dump shape for the listed
+entities, reviews newest first (ties keep the order they were listed in,
+so one dump in gives the same dump back).
+'''
+
+import sys
+
+import review_store
+
+KINDS = ('professor', 'course')
+
+
+def _other(kind):
+    return 'course' if kind == 'professor' else 'professor'
+
+
+class ReviewIndex:
+    def __init__(self):
+        self.reviews = {}                                 # review_id -> review
+        self.entities = {kind: {} for kind in KINDS}      # listed entities, in listing order
+        self.links = {kind: {} for kind in KINDS}         # entity id -> {review_id: None}
+        self.listed = {kind: {} for kind in KINDS}        # same, only what its own page listed
+        self.pairs = {}                                   # (professor_id, course_id) -> {review_id: None}
+
+    @classmethod
+    def from_dumps(cls, *paths):
+        """Index any mix of professor- and course-keyed dumps (.json or .sqlite)"""
+        index = cls()
+        for path in paths:
+            for kind in _kinds_of(path):
+                index.add_entries(review_store.stream_entries(path, kind))
+        return index
+
+    def add_entries(self, entries):
+        """Add professor- or course-keyed entries. Returns how many reviews were new"""
+        added = 0
+        for entry in entries:
+            kind = 'professor' if 'professor' in entry else 'course'
+            entity = entry[kind]
+            entity_id = entity[f"{kind}_id"]
+            self.entities[kind][entity_id] = entity
+            known = self.links[kind].pop(entity_id, {})
+            self.links[kind][entity_id] = {}
+            listed = self.listed[kind].setdefault(entity_id, {})
+            for review in entry.get('reviews', []):
+                added += self.add_review(review, **{kind: entity_id})
+                if review.get('review_id'):
+                    listed[review['review_id']] = None
+            # this listing is the newest word on the order, older known reviews go after
+            self.links[kind][entity_id].update(known)
+        return added
+
+    def add_review(self, review, professor=None, course=None):
+        """
+        Add one review, listed under `professor` or `course` (an ID). The other
+        side comes from its header. Returns True if the review_id was new.
+        """
+        review_id = review.get('review_id')
+        if not review_id:
+            return False
+        new = review_id not in self.reviews
+        if new:
+            self.reviews[review_id] = review
+
+        if professor is None:
+            professor = (review.get('professor_header') or {}).get('professor_id')
+        if course is None:
+            course = (review.get('course_header') or {}).get('course_id')
+        if professor is not None:
+            self.links['professor'].setdefault(professor, {})[review_id] = None
+        if course is not None:
+            self.links['course'].setdefault(course, {})[review_id] = None
+        if professor is not None and course is not None:
+            self.pairs.setdefault((professor, course), {})[review_id] = None
+        return new
+
+    def __len__(self):
+        return len(self.reviews)
+
+    def __contains__(self, review_id):
+        return review_id in self.reviews
+
+    def review(self, review_id):
+        return self.reviews.get(review_id)
+
+    def _ordered(self, review_ids):
+        """Newest first; same-date reviews keep the order they were added in"""
+        return sorted((self.reviews[i] for i in review_ids),
+                      key=lambda r: r.get('submission_date') or '', reverse=True)
+
+    def professor_reviews(self, professor_id):
+        return self._ordered(self.links['professor'].get(professor_id, ()))
+
+    def course_reviews(self, course_id):
+        return self._ordered(self.links['course'].get(course_id, ()))
+
+    def pair_reviews(self, professor_id, course_id):
+        return self._ordered(self.pairs.get((professor_id, course_id), ()))
+
+    def review_ids(self, kind, entity_id):
+        """The set-like view of review IDs known for one professor or course"""
+        return self.links[kind].get(entity_id, {}).keys()
+
+    def high_water_marks(self, kind):
+        """
+        {entity id: {'review_ids', 'submission_date'}} from each entity's own
+        listing, so a page only stops at a review that page already had
+        """
+        marks = {}
+        for entity_id, review_ids in self.listed[kind].items():
+            if not review_ids:
+                continue
+            dates = [self.reviews[i].get('submission_date') for i in review_ids]
+            dates = [d for d in dates if d]
+            marks[entity_id] = {
+                'review_ids': set(review_ids),
+                'submission_date': max(dates) if dates else None,
+            }
+        return marks
+
+    def entries(self, kind):
+        """Dump-shaped entries for every listed entity of `kind`, in listing order"""
+        result = []
+        for entity_id, entity in self.entities[kind].items():
+            reviews = self._ordered(self.links[kind][entity_id])
+            result.append({kind: entity, 'reviews': reviews, 'review_count': len(reviews)})
+        return result
+
+
+def _kinds_of(path):
+    """A .sqlite store has both kinds, a JSON dump the kind of its first entry"""
+    if review_store.is_store(path):
+        return KINDS
+    for entry in review_store.stream_entries(path, 'professor'):
+        return ['professor' if 'professor' in entry else 'course']
+    return []
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        print("Usage: python review_index.py <dump> [<dump> ...]")
+        sys.exit(1)
+
+    index = ReviewIndex.from_dumps(*sys.argv[1:])
+    listed = sum(len(e['reviews']) for path in sys.argv[1:] for kind in _kinds_of(path)
+                 for e in review_store.stream_entries(path, kind))
+    print(f"✅ {len(index)} unique reviews ({listed} listed across {len(sys.argv) - 1} dumps)")
+    print(f"   {len(index.links['professor'])} professors, {len(index.links['course'])} courses, "
+          f"{len(index.pairs)} professor/course pairs")
@@ -0,0 +1,240 @@
+'''
+Columnar snapshots of the review data (Arrow IPC or Parquet).
+
+The JSON dumps are indent=4 and every review repeats its whole
+professor_header/course_header, so cs_reviews.json is mostly whitespace and
+keys, and json.load has to parse all of it. A snapshot is a directory with
+the same five tables as review_store.py:
+
+    professors.arrow  courses.arrow  reviews.arrow
+    review_professors.arrow  review_courses.arrow
+
+Codes, names, unis, statuses and submission dates are dictionary-encoded, so
+each distinct value is stored once. Link tables are written sorted by
+(entity, position) and entity tables by listed_order, so loading never sorts.
+
+- "arrow":   uncompressed Arrow IPC files, read through a memory map, so
+             opening a snapshot is close to free and pages are only read
+             in as columns get used
+- "parquet": zstd-compressed Parquet, smallest on disk, read with
+             memory_map=True
+
+Make one from dumps or a .sqlite store, then use it anywhere review_store
+takes a path (analyze_courses.py, filter_2026.py, ...):
+
+    python review_snapshot.py export cs_reviews.snapshot cs_reviews.json course_data/cs_course_reviews.json
+    python review_snapshot.py import cs_reviews.snapshot reviews.sqlite
+
+load_entries() rebuilds the same entries review_store.load_entries() gives
+for a .sqlite store of the same data. benchmarks/bench_snapshot.py compares
+sizes and load times with the JSON dumps.
+'''
+
+import argparse
+import os
+
+import review_store
+
+FORMATS = {'arrow': '.arrow', 'parquet': '.parquet'}
+
+# column -> type; "dict" columns are dictionary-encoded strings
+TABLES = {
+    'professors': {
+        'professor_id': 'int', 'first_name': 'dict', 'last_name': 'dict', 'uni': 'dict',
+        'nugget': 'int', 'status': 'dict', 'listed_order': 'int',
+    },
+    'courses': {
+        'course_id': 'int', 'course_code': 'dict', 'name': 'dict', 'department_id': 'int',
+        'status': 'dict', 'listed_order': 'int',
+    },
+    'reviews': {
+        'review_id': 'int', 'submission_date': 'dict', 'rating': 'int', 'content': 'str',
+        'workload': 'str', 'agree_count': 'int', 'disagree_count': 'int', 'funny_count': 'int',
+        'professor_id': 'int', 'course_id': 'int',
+        'header_first_name': 'dict', 'header_last_name': 'dict', 'header_nugget': 'int',
+        'header_uni': 'dict', 'header_course_code': 'dict', 'header_course_name': 'dict',
+    },
+    'review_professors': {'review_id': 'int', 'professor_id': 'int', 'position': 'int'},
+    'review_courses': {'review_id': 'int', 'course_id': 'int', 'position': 'int'},
+}
+
+ORDER_BY = {
+    'professors': 'listed_order IS NULL, listed_order, professor_id',
+    'courses': 'listed_order IS NULL, listed_order, course_id',
+    'reviews': 'review_id',
+    'review_professors': 'professor_id, position',
+    'review_courses': 'course_id, position',
+}
+
+
+def is_snapshot(path):
+    return os.path.isdir(path) and any(
+        os.path.exists(os.path.join(path, 'reviews' + ext)) for ext in FORMATS.values())
+
+
+def _table_path(path, name):
+    for ext in FORMATS.values():
+        table_path = os.path.join(path, name + ext)
+        if os.path.exists(table_path):
+            return table_path
+    raise FileNotFoundError(f"{path} has no {name} table")
+
+
+def _arrow_table(rows, columns):
+    import pyarrow as pa
+
+    types = {'int': pa.int64(), 'str': pa.string(), 'dict': pa.string()}
+    arrays = []
+    for i, (column, kind) in enumerate(columns.items()):
+        array = pa.array([row[i] for row in rows], type=types[kind])
+        arrays.append(array.dictionary_encode() if kind == 'dict' else array)
+    return pa.Table.from_arrays(arrays, names=list(columns))
+
+
+def export_store(db, path, fmt='arrow'):
+    """Write every table of an open review_store db to a snapshot directory"""
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    os.makedirs(path, exist_ok=True)
+    for name, columns in TABLES.items():
+        rows = db.execute(f"SELECT {', '.join(columns)} FROM {name} ORDER BY {ORDER_BY[name]}").fetchall()
+        table = _arrow_table(rows, columns)
+        for ext in FORMATS.values():  # don't leave a table from the other format behind
+            if os.path.exists(os.path.join(path, name + ext)):
+                os.remove(os.path.join(path, name + ext))
+
+        table_path = os.path.join(path, name + FORMATS[fmt])
+        if fmt == 'parquet':
+            pq.write_table(table, table_path, compression='zstd')
+        else:
+            with pa.OSFile(table_path, 'wb') as sink:
+                with pa.ipc.new_file(sink, table.schema) as writer:
+                    writer.write_table(table)
+
+
+def export(path, sources, fmt='arrow'):
+    """Snapshot any mix of JSON dumps and .sqlite stores into `path`"""
+    if len(sources) == 1 and review_store.is_store(sources[0]):
+        db = review_store.connect(sources[0])
+    else:
+        db = review_store.connect(":memory:")
+        for source in sources:
+            if review_store.is_store(source):
+                for kind in ('professor', 'course'):
+                    review_store.import_entries(db, review_store.load_entries(source, kind))
+            else:
+                review_store.import_json(db, source)
+    try:
+        export_store(db, path, fmt)
+    finally:
+        db.close()
+
+
+def read_table(path, name, columns=None):
+    """One table as a pyarrow Table (memory-mapped for Arrow, memory_map=True for Parquet)"""
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    table_path = _table_path(path, name)
+    if table_path.endswith(FORMATS['parquet']):
+        return pq.read_table(table_path, columns=columns, memory_map=True)
+    table = pa.ipc.open_file(pa.memory_map(table_path, 'r')).read_all()
+    return table.select(columns) if columns else table
+
+
+def _pylist(column):
+    """
+    column.to_pylist(), but dictionary columns are decoded through their
+    indices, which is much faster than pyarrow converting every value
+    """
+    import pyarrow as pa
+
+    if not pa.types.is_dictionary(column.type):
+        return column.to_pylist()
+    values = []
+    for chunk in column.chunks:
+        dictionary = chunk.dictionary.to_pylist()
+        values.extend(dictionary[i] if i is not None else None for i in chunk.indices.to_pylist())
+    return values
+
+
+def _columns(table):
+    return {name: _pylist(table.column(name)) for name in table.column_names}
+
+
+def load_entries(path, kind):
+    """Same entries review_store.load_entries gives for a .sqlite store of this data"""
+    key = f"{kind}_id"
+    entities = _columns(read_table(path, f'{kind}s'))
+    reviews = _columns(read_table(path, 'reviews'))
+    links = _columns(read_table(path, f'review_{kind}s', ['review_id', key]))
+
+    review_at = {rid: i for i, rid in enumerate(reviews['review_id'])}
+    (dates, ratings, contents, workloads, agrees, disagrees, funnies, professor_ids,
+     course_ids) = (reviews[c] for c in review_store.REVIEW_COLUMNS[1:] + ['professor_id', 'course_id'])
+    (first_names, last_names, nuggets, unis, course_codes,
+     course_names) = (reviews[c] for c in review_store.HEADER_COLUMNS)
+
+    # headers as stored with each review (same dicts as review_store._review_dict)
+    grouped = {}
+    for review_id, entity_id in zip(links['review_id'], links[key]):
+        i = review_at[review_id]
+        grouped.setdefault(entity_id, []).append({
+            'agree_count': agrees[i],
+            'content': contents[i],
+            'course_header': {'course_code': course_codes[i], 'course_id': course_ids[i],
+                              'course_name': course_names[i]},
+            'disagree_count': disagrees[i],
+            'funny_count': funnies[i],
+            'professor_header': {'first_name': first_names[i], 'last_name': last_names[i],
+                                 'nugget': nuggets[i], 'professor_id': professor_ids[i],
+                                 'uni': unis[i]},
+            'rating': ratings[i],
+            'review_id': review_id,
+            'submission_date': dates[i],
+            'workload': workloads[i],
+        })
+
+    entity_columns = review_store.ENTITY_COLUMNS[kind]
+    entries = []
+    for i, listed_order in enumerate(entities['listed_order']):
+        if listed_order is None:
+            break  # listed entities come first, in listed_order
+        entity_reviews = grouped.get(entities[key][i], [])
+        entries.append({
+            kind: {c: entities[c][i] for c in entity_columns},
+            'reviews': entity_reviews,
+            'review_count': len(entity_reviews),
+        })
+    return entries
+
+
+def import_snapshot(path, db):
+    """Load a snapshot into a review_store db. Returns number of reviews seen"""
+    return sum(review_store.import_entries(db, load_entries(path, kind))
+               for kind in ('professor', 'course'))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Export/import columnar review snapshots")
+    commands = parser.add_subparsers(dest="command", required=True)
+    export_parser = commands.add_parser("export", help="write a snapshot from dumps or a store")
+    export_parser.add_argument("snapshot")
+    export_parser.add_argument("sources", nargs="+", help="JSON dumps and/or .sqlite stores")
+    export_parser.add_argument("--format", choices=FORMATS, default="arrow")
+    import_parser = commands.add_parser("import", help="load a snapshot into a .sqlite store")
+    import_parser.add_argument("snapshot")
+    import_parser.add_argument("store")
+    args = parser.parse_args()
+
+    if args.command == "export":
+        export(args.snapshot, args.sources, args.format)
+        size = sum(os.path.getsize(os.path.join(args.snapshot, f)) for f in os.listdir(args.snapshot))
+        print(f"✅ Wrote {args.format} snapshot {args.snapshot} ({size / 1024 / 1024:.1f} MB) "
+              f"from {', '.join(args.sources)}")
+    else:
+        db = review_store.connect(args.store)
+        count = import_snapshot(args.snapshot, db)
+        db.close()
+        print(f"✅ Imported {count} reviews from {args.snapshot} into {args.store}")
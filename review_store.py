@@ -0,0 +1,357 @@
+'''
+Normalized SQLite store for the scraped reviews.
+
+The same reviews currently live in full in at least six JSON dumps
+(cs_reviews.json, data/cs_reviews.json, data/merged_cs_reviews.json, the
+*_progress.json files, course_data/cs_course_reviews.json and
+spring_2026_course_reviews.json), and every script json.loads a whole file
+just to look at a few fields. Here each review is stored once:
+
+    professors(professor_id, first_name, last_name, uni, nugget, status)
+    courses(course_id, course_code, name, department_id, status)
+    reviews(review_id, submission_date, rating, content, workload,
+            agree_count, disagree_count, funny_count,
+            professor_id, course_id,          <- from professor_header/course_header
+            header_*)                         <- the rest of those headers, verbatim
+    review_professors(review_id, professor_id) <- review is listed under this professor
+    review_courses(review_id, course_id)       <- review is listed under this course
+
+The link tables record which professor/course page a review was listed
+under (and where on it). Usually that's the same as the header, except after
+merge.py folds duplicate professor IDs together. listed_order remembers the
+order professors/courses appeared in the dumps; it's NULL for ones we only
+know about from a review header.
+
+A review's headers are kept as CULPA sent them rather than rebuilt from the
+professors/courses rows: they don't always agree with the listing (some of
+McKeown's reviews say "Mckeown"), and loading a store should give back the
+same bytes as the dumps it came from.
+
+Import the existing dumps (any mix of professor- and course-keyed files):
+    python review_store.py reviews.sqlite cs_reviews.json course_data/cs_course_reviews.json
+
+load_entries() gives back the usual [{professor|course, reviews, review_count}]
+shape from either a .json dump or a .sqlite store (or a review_snapshot.py
+directory), so the analysis scripts can be pointed at any of them.
+stream_entries() is the same but reads JSON dumps one entry at a time
+(json_stream.py) instead of loading them whole.
+'''
+
+import json
+import sqlite3
+import sys
+
+import json_stream
+
+DEFAULT_DB = "reviews.sqlite"
+
+SCHEMA = '''
+CREATE TABLE IF NOT EXISTS professors (
+    professor_id INTEGER PRIMARY KEY,
+    first_name TEXT,
+    last_name TEXT,
+    uni TEXT,
+    nugget INTEGER,
+    status TEXT,
+    listed_order INTEGER
+);
+CREATE TABLE IF NOT EXISTS courses (
+    course_id INTEGER PRIMARY KEY,
+    course_code TEXT,
+    name TEXT,
+    department_id INTEGER,
+    status TEXT,
+    listed_order INTEGER
+);
+CREATE TABLE IF NOT EXISTS reviews (
+    review_id INTEGER PRIMARY KEY,
+    submission_date TEXT,
+    rating INTEGER,
+    content TEXT,
+    workload TEXT,
+    agree_count INTEGER,
+    disagree_count INTEGER,
+    funny_count INTEGER,
+    professor_id INTEGER REFERENCES professors(professor_id),
+    course_id INTEGER REFERENCES courses(course_id),
+    header_first_name TEXT,
+    header_last_name TEXT,
+    header_nugget INTEGER,
+    header_uni TEXT,
+    header_course_code TEXT,
+    header_course_name TEXT
+);
+CREATE TABLE IF NOT EXISTS review_professors (
+    review_id INTEGER REFERENCES reviews(review_id),
+    professor_id INTEGER REFERENCES professors(professor_id),
+    position INTEGER,
+    PRIMARY KEY (review_id, professor_id)
+);
+CREATE TABLE IF NOT EXISTS review_courses (
+    review_id INTEGER REFERENCES reviews(review_id),
+    course_id INTEGER REFERENCES courses(course_id),
+    position INTEGER,
+    PRIMARY KEY (review_id, course_id)
+);
+CREATE INDEX IF NOT EXISTS idx_reviews_date ON reviews(submission_date);
+CREATE INDEX IF NOT EXISTS idx_reviews_professor ON reviews(professor_id);
+CREATE INDEX IF NOT EXISTS idx_reviews_course ON reviews(course_id);
+CREATE INDEX IF NOT EXISTS idx_review_professors_professor ON review_professors(professor_id);
+CREATE INDEX IF NOT EXISTS idx_review_courses_course ON review_courses(course_id);
+CREATE INDEX IF NOT EXISTS idx_courses_code ON courses(course_code);
+'''
+
+REVIEW_COLUMNS = ['review_id', 'submission_date', 'rating', 'content', 'workload',
+                  'agree_count', 'disagree_count', 'funny_count']
+
+# reviews column -> (header, field) it holds
+HEADER_COLUMNS = {
+    'header_first_name': ('professor_header', 'first_name'),
+    'header_last_name': ('professor_header', 'last_name'),
+    'header_nugget': ('professor_header', 'nugget'),
+    'header_uni': ('professor_header', 'uni'),
+    'header_course_code': ('course_header', 'course_code'),
+    'header_course_name': ('course_header', 'course_name'),
+}
+
+ENTITY_COLUMNS = {
+    'professor': ['first_name', 'last_name', 'nugget', 'professor_id', 'status', 'uni'],
+    'course': ['course_code', 'course_id', 'department_id', 'name', 'status'],
+}
+
+
+def connect(path=DEFAULT_DB):
+    db = sqlite3.connect(path)
+    db.row_factory = sqlite3.Row
+    db.executescript(SCHEMA)
+    _add_header_columns(db)
+    return db
+
+
+def _add_header_columns(db):
+    """Stores made before the header_* columns get them, filled from the entity rows as before"""
+    existing = {row['name'] for row in db.execute("PRAGMA table_info(reviews)")}
+    missing = [c for c in HEADER_COLUMNS if c not in existing]
+    if not missing:
+        return
+    for column in missing:
+        db.execute(f"ALTER TABLE reviews ADD COLUMN {column} "
+                   f"{'INTEGER' if column == 'header_nugget' else 'TEXT'}")
+    db.execute('''
+        UPDATE reviews SET
+            header_first_name = (SELECT first_name FROM professors p WHERE p.professor_id = reviews.professor_id),
+            header_last_name = (SELECT last_name FROM professors p WHERE p.professor_id = reviews.professor_id),
+            header_nugget = (SELECT nugget FROM professors p WHERE p.professor_id = reviews.professor_id),
+            header_uni = (SELECT uni FROM professors p WHERE p.professor_id = reviews.professor_id),
+            header_course_code = (SELECT course_code FROM courses c WHERE c.course_id = reviews.course_id),
+            header_course_name = (SELECT name FROM courses c WHERE c.course_id = reviews.course_id)
+    ''')
+    db.commit()
+
+
+def _next_order(db, table):
+    return db.execute(f"SELECT COALESCE(MAX(listed_order), 0) + 1 FROM {table}").fetchone()[0]
+
+
+def _upsert(db, table, key, row, listed):
+    """Listing entries are authoritative, review headers only fill gaps"""
+    columns = list(row) + ['listed_order']
+    values = list(row.values()) + [_next_order(db, table) if listed else None]
+    if listed:
+        updates = ", ".join(f"{c} = excluded.{c}" for c in row if c != key)
+        conflict = (f"DO UPDATE SET {updates}, "
+                    f"listed_order = COALESCE({table}.listed_order, excluded.listed_order)")
+    else:
+        conflict = "DO NOTHING"
+    db.execute(
+        f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({', '.join('?' * len(columns))}) "
+        f"ON CONFLICT({key}) {conflict}",
+        values
+    )
+
+
+def _upsert_professor(db, prof, listed=False):
+    _upsert(db, 'professors', 'professor_id', {
+        'professor_id': prof['professor_id'],
+        'first_name': prof.get('first_name'),
+        'last_name': prof.get('last_name'),
+        'uni': prof.get('uni'),
+        'nugget': prof.get('nugget'),
+        'status': prof.get('status'),
+    }, listed)
+
+
+def _upsert_course(db, course, listed=False):
+    _upsert(db, 'courses', 'course_id', {
+        'course_id': course['course_id'],
+        'course_code': course.get('course_code'),
+        'name': course.get('name', course.get('course_name')),
+        'department_id': course.get('department_id'),
+        'status': course.get('status'),
+    }, listed)
+
+
+def import_entries(db, entries):
+    """Import professor- or course-keyed entries. Returns number of reviews seen"""
+    count = 0
+    for entry in entries:
+        if 'professor' in entry:
+            kind, entity_id = 'professor', entry['professor']['professor_id']
+            _upsert_professor(db, entry['professor'], listed=True)
+        else:
+            kind, entity_id = 'course', entry['course']['course_id']
+            _upsert_course(db, entry['course'], listed=True)
+
+        for position, review in enumerate(entry.get('reviews', [])):
+            prof = review.get('professor_header') or {}
+            course = review.get('course_header') or {}
+            if prof.get('professor_id') is not None:
+                _upsert_professor(db, prof)
+            if course.get('course_id') is not None:
+                _upsert_course(db, course)
+
+            headers = {'professor_header': prof, 'course_header': course}
+            db.execute(
+                "INSERT OR REPLACE INTO reviews VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                [review.get(c) for c in REVIEW_COLUMNS] + [prof.get('professor_id'), course.get('course_id')]
+                + [headers[header].get(field) for header, field in HEADER_COLUMNS.values()]
+            )
+            db.execute(
+                f"INSERT OR REPLACE INTO review_{kind}s VALUES (?, ?, ?)",
+                (review['review_id'], entity_id, position)
+            )
+            count += 1
+
+    db.commit()
+    return count
+
+
+def import_json(db, path):
+    with open(path, "r") as f:
+        return import_entries(db, json.load(f))
+
+
+def _review_dict(row):
+    """Rebuild a review in the same shape CULPA returns it"""
+    return {
+        'agree_count': row['agree_count'],
+        'content': row['content'],
+        'course_header': {
+            'course_code': row['header_course_code'],
+            'course_id': row['course_id'],
+            'course_name': row['header_course_name'],
+        },
+        'disagree_count': row['disagree_count'],
+        'funny_count': row['funny_count'],
+        'professor_header': {
+            'first_name': row['header_first_name'],
+            'last_name': row['header_last_name'],
+            'nugget': row['header_nugget'],
+            'professor_id': row['professor_id'],
+            'uni': row['header_uni'],
+        },
+        'rating': row['rating'],
+        'review_id': row['review_id'],
+        'submission_date': row['submission_date'],
+        'workload': row['workload'],
+    }
+
+
+REVIEW_SELECT = '''
+SELECT link.{key} AS entity_id, r.*
+FROM review_{kind}s link
+JOIN reviews r ON r.review_id = link.review_id
+{where}
+ORDER BY link.{key}, link.position
+'''
+
+
+def _load(db, kind, ids, entity_columns):
+    key = f"{kind}_id"
+    where, args = "", []
+    if ids is not None:
+        ids = list(ids)
+        where = f"WHERE {{alias}}.{key} IN ({','.join('?' * len(ids))})"
+        args = ids
+
+    reviews = {}
+    query = REVIEW_SELECT.format(key=key, kind=kind, where=where.format(alias='link'))
+    for row in db.execute(query, args):
+        reviews.setdefault(row['entity_id'], []).append(_review_dict(row))
+
+    entries = []
+    query = (f"SELECT * FROM {kind}s e WHERE e.listed_order IS NOT NULL "
+             f"{where.format(alias='e').replace('WHERE', 'AND')} ORDER BY e.listed_order")
+    for row in db.execute(query, args):
+        entity_reviews = reviews.get(row[key], [])
+        entries.append({
+            kind: {c: row[c] for c in entity_columns},
+            'reviews': entity_reviews,
+            'review_count': len(entity_reviews),
+        })
+    return entries
+
+
+def load_professor_entries(db, professor_ids=None):
+    """cs_reviews.json-shaped entries, optionally only for some professor IDs"""
+    return _load(db, 'professor', professor_ids, ENTITY_COLUMNS['professor'])
+
+
+def load_course_entries(db, course_ids=None):
+    """cs_course_reviews.json-shaped entries, optionally only for some course IDs"""
+    return _load(db, 'course', course_ids, ENTITY_COLUMNS['course'])
+
+
+def is_store(path):
+    return str(path).endswith(('.sqlite', '.db'))
+
+
+def is_dump(path):
+    """A plain JSON dump, as opposed to a .sqlite store or a review_snapshot directory"""
+    import review_snapshot
+    return not is_store(path) and not review_snapshot.is_snapshot(path)
+
+
+def load_entries(path, kind):
+    """
+    Entries of `kind` ('professor' or 'course') from a .json dump, a .sqlite
+    store or a review_snapshot.py directory
+    """
+    import review_snapshot
+    if review_snapshot.is_snapshot(path):
+        return review_snapshot.load_entries(path, kind)
+    if is_store(path):
+        db = connect(path)
+        try:
+            if kind == 'professor':
+                return load_professor_entries(db)
+            return load_course_entries(db)
+        finally:
+            db.close()
+
+    with open(path, "r") as f:
+        return json.load(f)
+
+
+def stream_entries(path, kind):
+    """Like load_entries, but JSON dumps are streamed (re-iterable, bounded memory)"""
+    if not is_dump(path):
+        return load_entries(path, kind)
+    return json_stream.EntryStream(path)
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 3:
+        print("Usage: python review_store.py <store.sqlite> <dump.json> [<dump.json> ...]")
+        sys.exit(1)
+
+    db = connect(sys.argv[1])
+    for path in sys.argv[2:]:
+        count = import_json(db, path)
+        print(f"Imported {count} reviews from {path}")
+
+    totals = {t: db.execute(f"SELECT COUNT(*) FROM {t}").fetchone()[0]
+              for t in ['professors', 'courses', 'reviews']}
+    print(f"\n✅ {sys.argv[1]}: {totals['reviews']} unique reviews, "
+          f"{totals['professors']} professors, {totals['courses']} courses")
+    db.close()
@@ -73,12 +73,13 @@ However, I kept the set to check for duplicates for robustness
 '''
 
 # This script will aggregate all the review objects for a given professor into a JSON file using the CULPA API
-import requests
 import json
 import time
 
+import culpa_client
+
 PROFESSOR_ID = "3509"
-BASE_URL = f"https://culpa.info/api/review/professor/{PROFESSOR_ID}"
+BASE_URL = f"{culpa_client.BASE_URL}/review/professor/{PROFESSOR_ID}"
 
 def scrape_culpa_api():
     all_reviews = []
@@ -88,7 +89,7 @@ def scrape_culpa_api():
     while True:
         print(f"Fetching page {page}...")
         
-        response = requests.get(BASE_URL, params={
+        response = culpa_client.get(BASE_URL, params={
             'page': page,
             'sort_key': 'null',
             'course_filter': 'null'
@@ -16,17 +16,21 @@ https://culpa.info/api/departments/7/professors
 each prof has first_name, last_name, nuggest (boolean), professor_id, status, and uni
 '''
 
-import requests
+import argparse
 import json
-import time
 
-BASE_URL = "https://culpa.info/api"
+import async_crawler
+import culpa_client
+from crawl_journal import CrawlJournal
+from review_index import ReviewIndex
+
+BASE_URL = culpa_client.BASE_URL
 CS_DEPARTMENT_ID = 7  # COMS department ID
 
 def get_cs_professors():
     """Get all professors in the CS department"""
     print("Fetching CS department professors...")
-    response = requests.get(f"{BASE_URL}/departments/{CS_DEPARTMENT_ID}/professors")
+    response = culpa_client.get(f"{BASE_URL}/departments/{CS_DEPARTMENT_ID}/professors")
     
     if response.status_code != 200:
         print(f"Error fetching professors: {response.status_code}")
@@ -36,41 +40,19 @@ def get_cs_professors():
     print(f"Found {len(professors)} CS professors")
     return professors
 
-def scrape_professor_reviews(professor_id):
-    """Scrape all reviews for a single professor"""
-    all_reviews = []
-    seen_ids = set()
-    page = 1
-    
-    while True:
-        response = requests.get(
-            f"{BASE_URL}/review/professor/{professor_id}",
-            params={'page': page, 'sort_key': 'null', 'course_filter': 'null'}
-        )
-        
-        if response.status_code != 200:
-            break
-        
-        data = response.json()
-        reviews = data.get('reviews', [])
-        
-        if not reviews:
-            break
-        
-        # Add unique reviews
-        for review in reviews:
-            review_id = review.get('review_id')
-            if review_id and review_id not in seen_ids:
-                all_reviews.append(review)
-                seen_ids.add(review_id)
-        
-        page += 1
-        time.sleep(0.3)
-    
-    return all_reviews
-
-def scrape_cs_reviews():
-    """Scrape reviews for all CS professors"""
+def scrape_cs_reviews(concurrency=async_crawler.DEFAULT_CONCURRENCY,
+                      rate=async_crawler.DEFAULT_RATE, resume=False, incremental=False,
+                      known=()):
+    """
+    Scrape reviews for all CS professors (concurrently, see async_crawler.py).
+    Every page is checkpointed to cs_reviews_journal.jsonl; with resume=True
+    finished professors are skipped and the rest continue where they stopped.
+    With incremental=True only reviews newer than what cs_reviews.json already
+    has are fetched, and merged into it. `known` are other dumps (e.g.
+    course_data/cs_course_reviews.json) whose reviews get filled in under their
+    professors; only cs_reviews.json's own listings decide where paging
+    stops (see review_index.py).
+    """
     # Get CS professors
     professors = get_cs_professors()
     
@@ -78,39 +60,37 @@ def scrape_cs_reviews():
         print("No professors found!")
         return
     
-    print(f"\nStarting to scrape reviews for {len(professors)} CS professors...\n")
+    print(f"\nStarting to scrape reviews for {len(professors)} CS professors "
+          f"({concurrency} at a time, max {rate} requests/sec)...\n")
+    
+    index, marks = None, None
+    if incremental:
+        index = ReviewIndex.from_dumps("cs_reviews.json", *known)
+        marks = index.high_water_marks('professor')
+        print(f"Incremental mode: {len(marks)} professors already have reviews stored\n")
+    
+    journal = CrawlJournal("cs_reviews_journal.jsonl", resume=resume)
     
-    all_data = []
-    total_reviews = 0
+    crawled = async_crawler.crawl(
+        professors,
+        kind='professor',
+        id_key='professor_id',
+        label=lambda p: f"{p.get('first_name', '')} {p.get('last_name', '')} ({p.get('uni', '')})",
+        base_url=BASE_URL,
+        concurrency=concurrency,
+        rate=rate,
+        journal=journal,
+        marks=marks
+    )
+    journal.close()
     
-    for i, prof in enumerate(professors, 1):
-        prof_id = prof.get('professor_id')
-        first_name = prof.get('first_name', '')
-        last_name = prof.get('last_name', '')
-        uni = prof.get('uni', '')
-        
-        print(f"[{i}/{len(professors)}] {first_name} {last_name} ({uni}) - ID: {prof_id}")
-        
-        reviews = scrape_professor_reviews(prof_id)
-        
-        if reviews:
-            print(f"  ✓ Found {len(reviews)} reviews")
-            all_data.append({
-                'professor': prof,
-                'reviews': reviews,
-                'review_count': len(reviews)
-            })
-            total_reviews += len(reviews)
-        else:
-            print(f"  ✗ No reviews")
-        
-        # Save progress every 10 professors
-        if i % 10 == 0:
-            with open("cs_reviews_progress.json", "w") as f:
-                json.dump(all_data, f, indent=4)
-            print(f"  💾 Progress saved ({i}/{len(professors)}, {total_reviews} reviews so far)\n")
-        
-        time.sleep(0.5)  # Be nice to the server
+    if incremental:
+        new_reviews = index.add_entries(crawled)
+        all_data = index.entries('professor')
+        print(f"  ➕ {new_reviews} new reviews merged")
+    else:
+        all_data = crawled
+    total_reviews = sum(item['review_count'] for item in all_data)
     
     # Final save
     with open("cs_reviews.json", "w") as f:
@@ -121,7 +101,22 @@ def scrape_cs_reviews():
     print(f"   Professors with reviews: {len(all_data)}")
     print(f"   Total reviews scraped: {total_reviews}")
     print(f"   Saved to: cs_reviews.json")
+    culpa_client.print_stats()
     print(f"{'='*60}")
 
 if __name__ == "__main__":
-    scrape_cs_reviews()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Scrape CULPA reviews for every CS professor")
+    parser.add_argument("--concurrency", type=int, default=async_crawler.DEFAULT_CONCURRENCY,
+                        help="professors crawled at the same time")
+    parser.add_argument("--rate", type=float, default=async_crawler.DEFAULT_RATE,
+                        help="max requests per second across all professors")
+    parser.add_argument("--resume", action="store_true",
+                        help="continue from cs_reviews_journal.jsonl instead of starting over")
+    parser.add_argument("--incremental", action="store_true",
+                        help="only fetch reviews newer than the ones already in cs_reviews.json")
+    parser.add_argument("--known", nargs="*", default=[],
+                        help="with --incremental, other dumps whose reviews are already known "
+                             "(e.g. course_data/cs_course_reviews.json)")
+    args = parser.parse_args()
+    scrape_cs_reviews(concurrency=args.concurrency, rate=args.rate,
+                      resume=args.resume, incremental=args.incremental, known=args.known)
\ No newline at end of file
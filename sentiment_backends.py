@@ -0,0 +1,132 @@
+'''
+Inference backends for the sentiment model in analyze.py.
+
+- "pytorch":      the original fp32 AutoModelForSequenceClassification
+- "pytorch-int8": same model with torch dynamic int8 quantization of the
+                  Linear layers (weights stored int8, activations quantized
+                  on the fly). Smaller and usually faster on CPU.
+- "onnx":         the model exported once to ONNX and run with ONNX Runtime.
+                  The export is cached under ONNX_DIR, after that torch isn't
+                  needed to score anything.
+
+Every backend takes token IDs from the same tokenizer and returns
+[negative, positive] probabilities per text, so analyze.py builds the same
+positive_score/negative_score either way. The quantized/ONNX ones drift a
+little from fp32; benchmarks/bench_backends.py measures how much, along
+with latency and throughput.
+'''
+
+import os
+
+ONNX_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "onnx_models")
+
+
+class TorchBackend:
+    name = "pytorch"
+
+    def __init__(self, model_name):
+        import torch
+        from transformers import AutoModelForSequenceClassification, AutoTokenizer
+
+        self.torch = torch
+        self.model_name = model_name
+        self.tokenizer = AutoTokenizer.from_pretrained(model_name)
+        self.model = AutoModelForSequenceClassification.from_pretrained(model_name)
+        self.model.eval()
+
+    def set_threads(self, threads):
+        self.torch.set_num_threads(threads)
+
+    def probabilities(self, input_ids):
+        """[[negative, positive], ...] for a batch of token ID lists"""
+        inputs = self.tokenizer.pad({"input_ids": input_ids}, return_tensors="pt")
+        with self.torch.inference_mode():
+            return self.torch.softmax(self.model(**inputs).logits, dim=1).tolist()
+
+
+class QuantizedTorchBackend(TorchBackend):
+    name = "pytorch-int8"
+
+    def __init__(self, model_name):
+        super().__init__(model_name)
+        self.model = self.torch.ao.quantization.quantize_dynamic(
+            self.model, {self.torch.nn.Linear}, dtype=self.torch.qint8
+        )
+
+
+class OnnxBackend:
+    name = "onnx"
+
+    def __init__(self, model_name):
+        from transformers import AutoTokenizer
+
+        self.model_name = model_name
+        self.tokenizer = AutoTokenizer.from_pretrained(model_name)
+        self.path = os.path.join(ONNX_DIR, model_name.strip("/").replace("/", "--") + ".onnx")
+        self.threads = None
+        self._session = None  # created on first use, so forked workers make their own
+        if not os.path.exists(self.path):
+            self.export()
+
+    def export(self):
+        """One-time export of the PyTorch model with dynamic batch/sequence axes"""
+        import torch
+        from transformers import AutoModelForSequenceClassification
+
+        print(f"Exporting {self.model_name} to {self.path}...")
+        os.makedirs(ONNX_DIR, exist_ok=True)
+        model = AutoModelForSequenceClassification.from_pretrained(self.model_name)
+        model.eval()
+        dummy = self.tokenizer(["a short example"], return_tensors="pt")
+        torch.onnx.export(
+            model,
+            (dummy["input_ids"], dummy["attention_mask"]),
+            self.path,
+            input_names=["input_ids", "attention_mask"],
+            output_names=["logits"],
+            dynamic_axes={
+                "input_ids": {0: "batch", 1: "sequence"},
+                "attention_mask": {0: "batch", 1: "sequence"},
+                "logits": {0: "batch"},
+            },
+            dynamo=False,
+        )
+
+    def set_threads(self, threads):
+        self.threads = threads
+        self._session = None
+
+    @property
+    def session(self):
+        if self._session is None:
+            import onnxruntime
+
+            options = onnxruntime.SessionOptions()
+            if self.threads:
+                options.intra_op_num_threads = self.threads
+            self._session = onnxruntime.InferenceSession(
+                self.path, options, providers=["CPUExecutionProvider"]
+            )
+        return self._session
+
+    def probabilities(self, input_ids):
+        import numpy as np
+
+        inputs = self.tokenizer.pad({"input_ids": input_ids}, return_tensors="np")
+        logits = self.session.run(["logits"], {
+            "input_ids": inputs["input_ids"].astype(np.int64),
+            "attention_mask": inputs["attention_mask"].astype(np.int64),
+        })[0]
+        exp = np.exp(logits - logits.max(axis=1, keepdims=True))
+        return (exp / exp.sum(axis=1, keepdims=True)).tolist()
+
+
+BACKENDS = {
+    TorchBackend.name: TorchBackend,
+    QuantizedTorchBackend.name: QuantizedTorchBackend,
+    OnnxBackend.name: OnnxBackend,
+}
+
+
+def load_backend(name, model_name):
+    return BACKENDS[name](model_name)
@@ -0,0 +1,62 @@
+'''
+Persistent cache of sentiment scores, so analyze.py only runs the model on
+reviews it hasn't scored before.
+
+Reviews don't change once they're posted, so a score only depends on the
+model and the text. Entries are keyed by (model name, sha256 of the text
+with whitespace normalized the same way clean.py does it) and hold the
+positive/negative scores. Lookups are done in bulk for a whole run.
+'''
+
+import hashlib
+import sqlite3
+
+DEFAULT_PATH = "sentiment_cache.sqlite"
+LOOKUP_CHUNK = 500  # stay well under SQLite's bound-parameter limit
+
+
+def text_key(text):
+    """Hash of the normalized review text"""
+    normalized = " ".join(text.split())
+    return hashlib.sha256(normalized.encode("utf-8")).hexdigest()
+
+
+class SentimentCache:
+    def __init__(self, path=DEFAULT_PATH):
+        self.db = sqlite3.connect(path)
+        self.db.execute('''
+            CREATE TABLE IF NOT EXISTS scores (
+                model TEXT,
+                text_hash TEXT,
+                positive_score REAL,
+                negative_score REAL,
+                PRIMARY KEY (model, text_hash)
+            )
+        ''')
+        self.db.commit()
+
+    def get_many(self, model_name, keys):
+        """{text key: (positive_score, negative_score)} for the keys we have"""
+        keys = list(set(keys))
+        found = {}
+        for start in range(0, len(keys), LOOKUP_CHUNK):
+            chunk = keys[start:start + LOOKUP_CHUNK]
+            rows = self.db.execute(
+                f"SELECT text_hash, positive_score, negative_score FROM scores "
+                f"WHERE model = ? AND text_hash IN ({','.join('?' * len(chunk))})",
+                [model_name] + chunk
+            )
+            for text_hash, positive_score, negative_score in rows:
+                found[text_hash] = (positive_score, negative_score)
+        return found
+
+    def put_many(self, model_name, scores):
+        """Store {text key: (positive_score, negative_score)}"""
+        self.db.executemany(
+            "INSERT OR REPLACE INTO scores VALUES (?, ?, ?, ?)",
+            [(model_name, key, pos, neg) for key, (pos, neg) in scores.items()]
+        )
+        self.db.commit()
+
+    def close(self):
+        self.db.close()